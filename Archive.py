@@ -0,0 +1,454 @@
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from itertools import islice
+import pandas as pd
+import numpy as np
+import threading
+import argparse
+import hashlib
+import sqlite3
+import time
+import zlib
+import os
+import re
+
+import Fetcher
+import Scraper
+import Crawler
+from Export import SCHEMAS
+
+"""
+ARCHIVE
+"""
+
+class PageArchive:
+    """
+    SUMMARY
+    persistent archive of every page fetched, raw (as served, or as rendered), with its url, time fetched & status code.
+    bodies are stored zlib compressed in an sqlite database, & identical bodies are only stored once
+    USED by Fetcher.Fetcher & Fetcher.AsyncFetcher (see `archive` parameter)
+
+    PARAMETERS
+    path (str): path of sqlite database to store archive in (default="pcs_archive.sqlite")
+    """
+
+    def __init__(self,path="pcs_archive.sqlite"):
+        self.path=path
+
+        if (os.path.dirname(path)!=""): os.makedirs(os.path.dirname(path),exist_ok=True)
+
+        # archive is shared between threads, so access is serialised
+        self.lock=threading.Lock()
+        self.connection=sqlite3.connect(path,check_same_thread=False)
+        with self.connection:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS bodies (digest TEXT PRIMARY KEY, body BLOB)")
+            self.connection.execute("CREATE TABLE IF NOT EXISTS pages (id INTEGER PRIMARY KEY AUTOINCREMENT, url TEXT, fetched_at REAL, status INTEGER, rendered INTEGER, digest TEXT)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS pages_url ON pages (url,rendered,fetched_at)")
+
+    def add(self,url:str,body:str,status=200,rendered=False,fetched_at=None,if_missing=False) -> bool:
+        """
+        SUMMARY
+        store a fetched page
+
+        PARAMETERS
+        url (str): url of page
+        body (str): html of page
+        status (int): status code of response (default=200)
+        rendered (bool): whether html is of rendered page (default=False)
+        fetched_at (float): unix time page was fetched (default=None, now)
+        if_missing (bool): only store page if this body isn't archived for url yet (e.g. pages served from a cache) (default=False)
+
+        OUTPUT
+        bool: whether page was stored
+        """
+        data=body.encode("utf-8")
+        digest=hashlib.sha256(data).hexdigest()
+        if (fetched_at is None): fetched_at=time.time()
+
+        with self.lock, self.connection:
+            if (if_missing) and (self.connection.execute("SELECT 1 FROM pages WHERE url=? AND rendered=? AND digest=?",(url,int(rendered),digest)).fetchone() is not None): return False
+            if (self.connection.execute("SELECT 1 FROM bodies WHERE digest=?",(digest,)).fetchone() is None):
+                self.connection.execute("INSERT INTO bodies VALUES (?,?)",(digest,zlib.compress(data)))
+            self.connection.execute("INSERT INTO pages (url,fetched_at,status,rendered,digest) VALUES (?,?,?,?,?)",(url,fetched_at,status,int(rendered),digest))
+        return True
+
+    def latest(self,url:str,rendered=False) -> dict:
+        """
+        SUMMARY
+        get latest archived version of a page
+
+        PARAMETERS
+        url (str): url of page
+        rendered (bool): whether to get rendered version of page (default=False)
+
+        OUTPUT
+        dict: page includes (`None` if page isn't archived)
+                "url" (str) url of page
+                "fetched_at" (float) unix time page was fetched
+                "status" (int) status code of response
+                "rendered" (bool) whether html is of rendered page
+                "body" (str) html of page
+        """
+        with self.lock:
+            row=self.connection.execute("SELECT pages.url,fetched_at,status,rendered,body FROM pages JOIN bodies ON pages.digest=bodies.digest WHERE url=? AND rendered=? ORDER BY fetched_at DESC LIMIT 1",(url,int(rendered))).fetchone()
+        if (row is None): return None
+
+        return self._to_page(row)
+
+    def iter_pages(self,latest_only=True,rendered=False):
+        """
+        SUMMARY
+        lazily iterate through archived pages (one query, bodies are decompressed as they are read)
+
+        PARAMETERS
+        latest_only (bool): whether to only get latest version of each page (default=True)
+        rendered (bool): whether to get rendered versions of pages (default=False)
+
+        OUTPUT
+        generator(dict): pages (see PageArchive.latest)
+        """
+        query="SELECT pages.url,fetched_at,status,rendered,body FROM pages JOIN bodies ON pages.digest=bodies.digest WHERE rendered=?"
+        if (latest_only): query+=" AND pages.id IN (SELECT id FROM pages p WHERE p.url=pages.url AND p.rendered=pages.rendered ORDER BY fetched_at DESC LIMIT 1)"
+        query+=" ORDER BY pages.url"
+
+        # separate connection, so archive can still be written to while iterating
+        connection=sqlite3.connect(self.path)
+        try:
+            for row in connection.execute(query,(int(rendered),)): yield self._to_page(row)
+        finally:
+            connection.close()
+
+    def _to_page(self,row) -> dict:
+        url,fetched_at,status,rendered,body=row
+        return {"url":url,"fetched_at":fetched_at,"status":status,"rendered":bool(rendered),"body":zlib.decompress(body).decode("utf-8")}
+
+    def stats(self) -> dict:
+        """
+        SUMMARY
+        get size of archive
+
+        OUTPUT
+        dict: stats include
+                "pages" (int) number of archived fetches
+                "urls" (int) number of distinct urls
+                "bodies" (int) number of distinct bodies stored
+                "compressed_bytes" (int) size of stored bodies
+        """
+        with self.lock:
+            pages,urls=self.connection.execute("SELECT COUNT(*),COUNT(DISTINCT url) FROM pages").fetchone()
+            bodies,compressed_bytes=self.connection.execute("SELECT COUNT(*),COALESCE(SUM(LENGTH(body)),0) FROM bodies").fetchone()
+
+        return {"pages":pages,"urls":urls,"bodies":bodies,"compressed_bytes":compressed_bytes}
+
+    def close(self):
+        with self.lock: self.connection.close()
+
+class ArchiveFetcher(Fetcher.Fetcher):
+    """
+    SUMMARY
+    fetcher serving pages from an archive, without any network (pages which aren't archived raise a LookupError)
+    E.G. Fetcher.set_fetcher(ArchiveFetcher(PageArchive("pcs_archive.sqlite")))
+
+    PARAMETERS
+    archive (Archive.PageArchive): archive to serve pages from
+    """
+
+    def __init__(self,archive:PageArchive):
+        super().__init__()
+        self.source=archive
+
+    def fetch(self,url:str) -> str:
+        page=self.source.latest(url)
+        if (page is None): raise LookupError("{} is not archived".format(url))
+        return page["body"]
+
+    def get_html(self,url:str,render=False) -> str:
+        # rendered version is used if page was rendered when it was fetched
+        page=self.source.latest(url,rendered=True) if (render) else None
+        if (page is not None): return page["body"]
+        return self.fetch(url)
+
+"""
+RE-PARSING
+"""
+
+# tables parsed from each kind of page: (url pattern, page type, table name, parser)
+PAGE_PARSERS=[
+    (r"races\.php\?(?!.*circuit=)","tours","tours",lambda soup:pd.DataFrame(list(Scraper.parse_available_tours_for_year(soup).items()),columns=["tour","tour_code"])),
+    (r"races\.php\?.*circuit=","races","tour_races",Scraper.parse_tour_races_for_year),
+    (r"teams\.php","teams","teams",Scraper.parse_teams_for_year),
+    (r"/team/[^/]+/?$","team","team_riders",Scraper.parse_riders_from_team),
+    (r"/race/[^/]+/[0-9]{4}/startlist/?$","startlist","startlists",Scraper.parse_race_startlist),
+    (r"/race/[^/]+/[0-9]{4}/overview/?$","stage_race_overview","race_information",lambda soup:Scraper.parse_race_information(soup).to_frame().T),
+    (r"/race/[^/]+/[0-9]{4}/overview/?$","stage_race_overview","stages",Scraper.parse_stage_race_overview_stages),
+    (r"/race/[^/]+/[0-9]{4}/stage-[0-9]+[a-z]?/?$","stage_results","stage_results",Scraper.parse_stage_race_stage_results),
+    (r"/race/[^/]+/[0-9]{4}/result/?$","one_day_results","one_day_results",Scraper.parse_one_day_results),
+    (r"/race/[^/]+(?:/overview)?/?$","race_editions","race_editions",Scraper.parse_race_editions),
+    (r"/rider/[^/]+/[0-9]{4}/?$","rider_year","rider_year_results",Scraper.parse_rider_year_results),
+    (r"/rider/[^/]+/?$","rider","rider_details",lambda soup:Scraper.parse_rider_details(soup).to_frame().T),
+    (r"/rider/[^/]+/?$","rider","rider_teams",lambda soup:Scraper.parse_rider_teams(soup).reset_index())
+]
+
+# columns of each table, in order. every page's table is reindexed to these (missing columns are empty),
+# so tables of pages whose columns differ (e.g. rider details with only some points types) line up when written to one csv
+TABLE_COLUMNS={
+    "tours":["tour","tour_code"],
+    "tour_races":list(Scraper.RACES_DTYPES),
+    "teams":list(Scraper.TEAMS_DTYPES),
+    "team_riders":list(Scraper.TEAM_RIDERS_DTYPES),
+    "startlists":list(Scraper.STARTLIST_DTYPES),
+    "race_information":list(Scraper.RACE_INFORMATION_SPEC),
+    "stages":list(Scraper.STAGES_DTYPES),
+    "stage_results":list(Scraper.STAGE_RESULTS_DTYPES),
+    "one_day_results":list(Scraper.ONE_DAY_RESULTS_DTYPES),
+    "race_editions":list(Scraper.RACE_EDITIONS_DTYPES),
+    "rider_year_results":list(Scraper.RIDER_YEAR_RESULTS_DTYPES),
+    "rider_details":list(SCHEMAS["rider_details"]),
+    "rider_teams":list(Scraper.RIDER_TEAMS_DTYPES)
+}
+
+def get_page_parsers(url:str) -> [(str,str,object)]:
+    """
+    SUMMARY
+    get parsers which apply to a page
+    USED by Archive.reparse
+
+    PARAMETERS
+    url (str): url of page
+
+    OUTPUT
+    list((str,str,function)): page type, table name & parser of each table in page (see `PAGE_PARSERS`)
+    """
+    return [(page_type,name,parser) for pattern,page_type,name,parser in PAGE_PARSERS if (re.search(pattern,url) is not None)]
+
+def reparse_page(page:dict,names=None) -> [(str,pd.DataFrame)]:
+    """
+    SUMMARY
+    run parsers over an archived page
+    USED by Archive.reparse
+
+    PARAMETERS
+    page (dict): archived page (see PageArchive.latest)
+    names (list(str)): only parse these tables (default=None, all tables)
+
+    OUTPUT
+    list((str,pandas.DataFrame)): name & parsed table (columns of `TABLE_COLUMNS`, with "url" of page) of each table in page. tables which failed to parse are left out
+    """
+    tables=[]
+    soups={}
+    for page_type,name,parser in get_page_parsers(page["url"]):
+        if (names is not None) and (name not in names): continue
+
+        if (page_type not in soups): soups[page_type]=Scraper.parse_page(page["body"],page_type)
+        try: table=parser(soups[page_type])
+        except (AttributeError,IndexError,KeyError,TypeError,ValueError): continue # page not in expected format
+        if (table is None): continue
+
+        table=table.reindex(columns=TABLE_COLUMNS[name])
+        table["url"]=page["url"]
+        tables.append((name,table))
+
+    return tables
+
+def reparse(archive:PageArchive,output_dir="pcs_reparsed",names=None,processes=None,chunk_size=64) -> {str:int}:
+    """
+    SUMMARY
+    re-run parsers over latest version of every archived page (no network is used), writing one csv per table to `output_dir`,
+    e.g. "stage_results.csv" holds results of every archived stage with "url" of its page.
+    pages are parsed in chunks across a pool of processes (see Archive.iter_parse_chunks) & tables are appended to as chunks are parsed, so memory stays bounded
+    E.G. reparse(PageArchive("pcs_archive.sqlite"),"pcs_reparsed",["stage_results"])
+
+    PARAMETERS
+    archive (Archive.PageArchive): archive to parse
+    output_dir (str): directory to write tables to (default="pcs_reparsed")
+    names (list(str)): only parse these tables (see `PAGE_PARSERS`) (default=None, all tables)
+    processes (int): number of processes to parse with (default=None, one per cpu)
+    chunk_size (int): number of pages parsed by a process at once (default=64)
+
+    OUTPUT
+    dict: number of pages parsed, by table
+    """
+    os.makedirs(output_dir,exist_ok=True)
+
+    pages=((page["url"],page["body"]) for page in archive.iter_pages() if (page["status"]==200))
+
+    files={}
+    counts={}
+    try:
+        for tables,page_counts in iter_parse_chunks(pages,names,processes,chunk_size):
+            for name,table in tables.items():
+                if (name not in files): files[name]=open(os.path.join(output_dir,name+".csv.tmp"),"w",encoding="utf-8",newline="")
+                table.to_csv(files[name],header=(name not in counts),index=False)
+                counts[name]=counts.get(name,0)+page_counts[name]
+    finally:
+        for f in files.values(): f.close()
+
+    # only replace tables once they are complete
+    for name in files: os.replace(os.path.join(output_dir,name+".csv.tmp"),os.path.join(output_dir,name+".csv"))
+
+    return counts
+
+"""
+BATCH PARSING
+"""
+
+def merge_columns(parts:[(int,{str:np.ndarray})]) -> pd.DataFrame:
+    """
+    SUMMARY
+    build one data frame from several columnar parts, concatenating each column once
+    (columns missing from a part are filled with `None`)
+    USED by Archive.parse_chunk & Archive.iter_parse_chunks
+
+    PARAMETERS
+    parts (list((int,dict))): number of rows & arrays of each column, of each part
+
+    OUTPUT
+    pandas.DataFrame: merged table
+    """
+    columns=[]
+    for length,part in parts:
+        for column in part:
+            if (column not in columns): columns.append(column)
+
+    merged={}
+    for column in columns:
+        arrays=[part[column] if (column in part) else np.full(length,None,dtype="object") for length,part in parts]
+        merged[column]=np.concatenate(arrays) if (len(arrays)>0) else np.array([])
+
+    return pd.DataFrame(merged,columns=columns)
+
+def parse_chunk(pages:[(str,str)],names=None) -> ({str:(int,{str:np.ndarray})},{str:int}):
+    """
+    SUMMARY
+    parse a chunk of pages into columnar tables (run in a worker process).
+    tables are returned as one numpy array per column, which is much cheaper to send between processes than data frames
+    USED by Archive.iter_parse_chunks
+
+    PARAMETERS
+    pages (list((str,str))): url & html of each page
+    names (list(str)): only parse these tables (see `PAGE_PARSERS`) (default=None, all tables)
+
+    OUTPUT
+    dict: number of rows & arrays of each column, by table
+    dict: number of pages parsed, by table
+    """
+    parts={}
+    page_counts={}
+    for url,html in pages:
+        for name,table in reparse_page({"url":url,"body":html},names):
+            parts.setdefault(name,[]).append((len(table),{column:table[column].to_numpy() for column in table.columns}))
+            page_counts[name]=page_counts.get(name,0)+1
+
+    tables={}
+    for name,table_parts in parts.items():
+        table=merge_columns(table_parts)
+        tables[name]=(len(table),{column:table[column].to_numpy() for column in table.columns})
+
+    return tables,page_counts
+
+def iter_parse_chunks(pages,names=None,processes=None,chunk_size=64):
+    """
+    SUMMARY
+    lazily parse many pages across a pool of processes, a chunk of pages at a time.
+    only a few chunks are in flight ahead of the one being consumed, so any number of pages can be parsed with bounded memory
+    USED by Archive.reparse & Archive.parse_pages
+
+    PARAMETERS
+    pages (iterable((str,str))): url & html of each page
+    names (list(str)): only parse these tables (see `PAGE_PARSERS`) (default=None, all tables)
+    processes (int): number of processes to parse with (default=None, one per cpu. 1 parses in this process)
+    chunk_size (int): number of pages parsed by a process at once (default=64)
+
+    OUTPUT
+    generator((dict,dict)): tables parsed from each chunk, in order of pages (by table name) & number of pages parsed, by table
+    """
+    if (processes is None): processes=os.cpu_count() or 1
+    pages=iter(pages)
+    chunks=iter(lambda:list(islice(pages,chunk_size)),[])
+
+    to_tables=lambda result:({name:merge_columns([part]) for name,part in result[0].items()},result[1])
+
+    if (processes==1):
+        for chunk in chunks: yield to_tables(parse_chunk(chunk,names))
+        return
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        pending=deque(executor.submit(parse_chunk,chunk,names) for chunk in islice(chunks,2*processes))
+        try:
+            while (len(pending)>0):
+                result=pending.popleft().result()
+                pending.extend(executor.submit(parse_chunk,chunk,names) for chunk in islice(chunks,1)) # keep workers busy
+                yield to_tables(result)
+        finally:
+            for future in pending: future.cancel() # consumer stopped early
+
+def parse_pages(pages:[(str,str)],name:str,processes=None,chunk_size=64) -> pd.DataFrame:
+    """
+    SUMMARY
+    parse many pages of a kind into a single table, across a pool of processes (see Archive.iter_parse_chunks)
+    E.G. parse_pages([(url,html) for each stage page],"stage_results")
+
+    PARAMETERS
+    pages (list((str,str))): url & html of each page
+    name (str): table to parse (see `PAGE_PARSERS`)
+    processes (int): number of processes to parse with (default=None, one per cpu)
+    chunk_size (int): number of pages parsed by a process at once (default=64)
+
+    OUTPUT
+    pandas.DataFrame: parsed table, with "url" of page each row was parsed from
+    """
+    tables=[tables[name] for tables,page_counts in iter_parse_chunks(pages,[name],processes,chunk_size) if (name in tables)]
+    if (len(tables)==0): return pd.DataFrame()
+
+    return pd.concat(tables,ignore_index=True)
+
+"""
+COMMAND LINE
+"""
+
+def main(args=None):
+    """
+    SUMMARY
+    command line interface to an archive
+    E.G. python Archive.py reparse pcs_archive.sqlite pcs_reparsed --tables stage_results rider_year_results
+    E.G. python Archive.py crawl-season pcs_archive.sqlite 2020 pcs_data
+    E.G. python Archive.py stats pcs_archive.sqlite
+
+    PARAMETERS
+    args (list(str)): command line arguments (default=None, uses sys.argv)
+    """
+    parser=argparse.ArgumentParser(description="Re-parse archived PCS pages without any network")
+    commands=parser.add_subparsers(dest="command",required=True)
+
+    stats_parser=commands.add_parser("stats",help="show size of archive")
+    stats_parser.add_argument("archive",help="path of archive")
+
+    reparse_parser=commands.add_parser("reparse",help="parse every archived page into one csv per table")
+    reparse_parser.add_argument("archive",help="path of archive")
+    reparse_parser.add_argument("output_dir",help="directory to write tables to")
+    reparse_parser.add_argument("--tables",nargs="+",default=None,help="only parse these tables (e.g. stage_results)")
+    reparse_parser.add_argument("--processes",type=int,default=None,help="number of processes to parse with (default one per cpu)")
+
+    crawl_parser=commands.add_parser("crawl-season",help="rebuild a season dataset (see Crawler.crawl_season) from archived pages")
+    crawl_parser.add_argument("archive",help="path of archive")
+    crawl_parser.add_argument("year",type=int,help="season to rebuild")
+    crawl_parser.add_argument("output_dir",help="directory to write dataset to")
+
+    args=parser.parse_args(args)
+    archive=PageArchive(args.archive)
+
+    if (args.command=="stats"):
+        for key,value in archive.stats().items(): print("{}: {}".format(key,value))
+
+    elif (args.command=="reparse"):
+        for name,count in reparse(archive,args.output_dir,args.tables,args.processes).items(): print("{}: {} pages".format(name,count))
+
+    elif (args.command=="crawl-season"):
+        Fetcher.set_fetcher(ArchiveFetcher(archive))
+        races=Crawler.crawl_season(args.year,args.output_dir)
+        print("\n{} of {} races rebuilt".format(int(races["crawled"].sum()) if (len(races)>0) else 0,len(races)))
+
+    archive.close()
+
+if __name__=="__main__":
+    main()
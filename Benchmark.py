@@ -0,0 +1,369 @@
+import pandas as pd
+import contextlib
+import tracemalloc
+import argparse
+import hashlib
+import json
+import time
+import io
+import os
+import re
+
+import Fetcher
+import Scraper
+
+"""
+FIXTURES
+"""
+# directory saved pages are kept in
+FIXTURE_DIR=os.path.join(os.path.dirname(os.path.abspath(__file__)),"fixtures")
+
+# file in fixture directory holding expected output of each benchmarked function (see Benchmark.summarise)
+EXPECTED_FILE="expected.json"
+
+# fixture served for each url (first match is used) & url it is recorded from
+FIXTURES=[
+    (r"races\.php","races","https://www.procyclingstats.com/races.php?year=2020&circuit=1"),
+    (r"teams\.php","teams","https://www.procyclingstats.com/teams.php?s=worldtour&year=2020"),
+    (r"/team/","team","https://www.procyclingstats.com/team/ag2r-la-mondiale-2020"),
+    (r"/startlist$","startlist","https://www.procyclingstats.com/race/tour-de-france/2020/startlist"),
+    (r"/stage-[0-9]+$","stage","https://www.procyclingstats.com/race/tour-de-france/2020/stage-5"),
+    (r"/overview$","overview","https://www.procyclingstats.com/race/tour-de-france/2020/overview"),
+    (r"/result$","one_day","https://www.procyclingstats.com/race/gp-samyn/2020/result"),
+    (r"/rider/[^/]+/[0-9]{4}$","rider_year","https://www.procyclingstats.com/rider/caleb-ewan/2020"),
+    (r"/rider/[^/]+/?$","rider","https://www.procyclingstats.com/rider/caleb-ewan/"),
+    (r"/race/[^/]+/?$","race_editions","https://www.procyclingstats.com/race/tour-de-france")
+]
+
+class FixtureFetcher(Fetcher.Fetcher):
+    """
+    SUMMARY
+    fetcher serving saved pages from `FIXTURE_DIR` (read once, then served from memory), so parsing can be measured without any network
+    E.G. Fetcher.set_fetcher(FixtureFetcher())
+
+    PARAMETERS
+    fixture_dir (str): directory of saved pages (default=`FIXTURE_DIR`)
+    """
+
+    def __init__(self,fixture_dir=FIXTURE_DIR):
+        super().__init__()
+        self.fixtures={}
+        for pattern,name,url in FIXTURES:
+            with open(os.path.join(fixture_dir,name+".html"),encoding="utf-8") as f: self.fixtures[name]=f.read()
+
+        self.pages=0 # number of pages served
+
+    def fetch(self,url:str) -> str:
+        for pattern,name,fixture_url in FIXTURES:
+            if (re.search(pattern,url) is not None):
+                self.pages+=1
+                return self.fixtures[name]
+
+        raise LookupError("no fixture for {}".format(url))
+
+    def get_html(self,url:str,render=False) -> str:
+        return self.fetch(url) # saved pages are never rendered
+
+def record_fixtures(fixture_dir=FIXTURE_DIR):
+    """
+    SUMMARY
+    save live pages (see `FIXTURES`) as fixtures, through the shared fetcher, & record expected output parsed from them
+    E.G. python Benchmark.py record
+
+    PARAMETERS
+    fixture_dir (str): directory to save pages to (default=`FIXTURE_DIR`)
+    """
+    os.makedirs(fixture_dir,exist_ok=True)
+
+    fetcher=Fetcher.get_fetcher()
+    for pattern,name,url in FIXTURES:
+        with open(os.path.join(fixture_dir,name+".html"),"w",encoding="utf-8") as f: f.write(fetcher.get_html(url))
+        print("recorded {} from {}".format(name,url))
+
+    record_expected(fixture_dir)
+
+@contextlib.contextmanager
+def serving_fixtures(fixture_dir=FIXTURE_DIR):
+    # replace shared fetcher with a fixture fetcher for the duration
+    fetcher=FixtureFetcher(fixture_dir)
+    previous=Fetcher.set_fetcher(fetcher)
+    try: yield fetcher
+    finally: Fetcher.set_fetcher(previous)
+
+"""
+BENCHMARKS
+"""
+R="https://www.procyclingstats.com/"
+
+# public functions benchmarked, by name
+BENCHMARKS={
+    "get_race_editions":lambda:Scraper.get_race_editions(R+"race/tour-de-france"),
+    "get_available_tours_for_year":lambda:Scraper.get_available_tours_for_year(2020),
+    "scrape_tour_races_for_year":lambda:Scraper.scrape_tour_races_for_year(2020,1),
+    "scrape_races_for_year":lambda:Scraper.scrape_races_for_year(2020),
+    "scrape_teams_for_year":lambda:Scraper.scrape_teams_for_year(2020),
+    "scrape_riders_from_team":lambda:Scraper.scrape_riders_from_team(R+"team/ag2r-la-mondiale-2020"),
+    "scrape_race_startlist":lambda:Scraper.scrape_race_startlist(R+"race/tour-de-france/2020/startlist"),
+    "scrape_race_information":lambda:Scraper.scrape_race_information(R+"race/tour-de-france/2020/overview"),
+    "scrape_stage_race_overview":lambda:Scraper.scrape_stage_race_overview(R+"race/tour-de-france/2020/overview"),
+    "scrape_stage_race_overview_stages":lambda:Scraper.scrape_stage_race_overview_stages(R+"race/tour-de-france/2020/overview"),
+    "scrape_stage_race_stage_results":lambda:Scraper.scrape_stage_race_stage_results(R+"race/tour-de-france/2020/stage-5"),
+    "scrape_stage_race_all_stage_results":lambda:Scraper.scrape_stage_race_all_stage_results(R+"race/tour-de-france/2020/overview"),
+    "scrape_one_day_results":lambda:Scraper.scrape_one_day_results(R+"race/gp-samyn/2020/result"),
+    "scrape_rider_profile":lambda:Scraper.scrape_rider_profile(R+"rider/caleb-ewan/"),
+    "get_rider_details":lambda:Scraper.get_rider_details(R+"rider/caleb-ewan/"),
+    "get_rider_teams":lambda:Scraper.get_rider_teams(R+"rider/caleb-ewan/"),
+    "get_rider_years":lambda:Scraper.get_rider_years(R+"rider/caleb-ewan/"),
+    "scrape_rider_year_results":lambda:Scraper.scrape_rider_year_results(R+"rider/caleb-ewan/2020"),
+    "scrape_rider_all_results":lambda:Scraper.scrape_rider_all_results(R+"rider/caleb-ewan/")
+}
+
+def count_rows(result) -> int:
+    # number of rows in a scraped result (tables in lists & dicts are summed)
+    if (result is None): return 0
+    if (isinstance(result,(pd.DataFrame,pd.Series))): return len(result)
+    if (isinstance(result,dict)): result=list(result.values())
+    if (isinstance(result,list)) and (all(isinstance(value,(pd.DataFrame,pd.Series)) or (value is None) for value in result)): return sum(count_rows(value) for value in result)
+    return len(result)
+
+def run_benchmark(function,fetcher:FixtureFetcher,min_time=1.0) -> dict:
+    """
+    SUMMARY
+    measure parse throughput & peak memory of a function, fetching from fixtures
+    USED by Benchmark.run_benchmarks
+
+    PARAMETERS
+    function (function): function to benchmark (called without arguments)
+    fetcher (Benchmark.FixtureFetcher): fetcher function fetches through
+    min_time (float): minimum seconds to repeat function for (default=1)
+
+    OUTPUT
+    dict: results include
+            "calls" (int) number of times function was called
+            "pages_per_sec" (float) pages parsed per second
+            "rows_per_sec" (float) rows returned per second
+            "seconds_per_call" (float) average seconds per call
+            "peak_memory_kb" (float) peak memory allocated during one call
+    """
+    with contextlib.redirect_stdout(io.StringIO()): # some functions print progress
+        function() # warm up (imports, compiled patterns)
+
+        # peak memory of a single call
+        tracemalloc.start()
+        function()
+        peak_memory=tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        # throughput
+        calls=0
+        rows=0
+        fetcher.pages=0
+        start=time.perf_counter()
+        while (time.perf_counter()-start<min_time):
+            rows+=count_rows(function())
+            calls+=1
+        seconds=time.perf_counter()-start
+
+    return {"calls":calls,"pages_per_sec":fetcher.pages/seconds,"rows_per_sec":rows/seconds,"seconds_per_call":seconds/calls,"peak_memory_kb":peak_memory/1024}
+
+def run_benchmarks(names=None,min_time=1.0,fixture_dir=FIXTURE_DIR) -> {str:dict}:
+    """
+    SUMMARY
+    benchmark public functions against saved pages (the shared fetcher is replaced for the duration)
+    E.G. run_benchmarks(["scrape_stage_race_stage_results"])
+
+    PARAMETERS
+    names (list(str)): functions to benchmark (see `BENCHMARKS`) (default=None, all)
+    min_time (float): minimum seconds to repeat each function for (default=1)
+    fixture_dir (str): directory of saved pages (default=`FIXTURE_DIR`)
+
+    OUTPUT
+    dict: results of each function (see Benchmark.run_benchmark)
+    """
+    with serving_fixtures(fixture_dir) as fetcher:
+        return {name:run_benchmark(function,fetcher,min_time) for name,function in BENCHMARKS.items() if (names is None) or (name in names)}
+
+"""
+EXPECTED OUTPUT
+"""
+
+def summarise(result):
+    """
+    SUMMARY
+    summarise a scraped result for comparing against expected output: tables by their size, columns, first & last rows
+    & a digest of every value, other values as strings (tables in lists & dicts are summarised in turn)
+    E.G. summarise(Scraper.scrape_one_day_results(url))
+
+    PARAMETERS
+    result: value returned by a benchmarked function
+
+    OUTPUT
+    json serialisable summary of result
+    """
+    if (isinstance(result,pd.DataFrame)):
+        summary={"rows":len(result),"columns":[str(column) for column in result.columns]}
+        if (len(result)>0):
+            summary["first"]={str(column):str(result[column].iloc[0]) for column in result.columns}
+            summary["last"]={str(column):str(result[column].iloc[-1]) for column in result.columns}
+        summary["digest"]=hashlib.sha1(result.to_csv().encode("utf-8")).hexdigest()
+        return summary
+    if (isinstance(result,pd.Series)): return {str(key):str(value) for key,value in result.items()}
+    if (isinstance(result,dict)): return {str(key):summarise(value) for key,value in result.items()}
+    if (isinstance(result,list)) and (len(result)>0) and (all(isinstance(value,pd.DataFrame) for value in result)):
+        return {"tables":len(result),"rows":count_rows(result),"first":summarise(result[0]),"digest":hashlib.sha1("".join(table.to_csv() for table in result).encode("utf-8")).hexdigest()}
+    if (isinstance(result,list)): return [summarise(value) for value in result]
+    return None if (result is None) else str(result)
+
+def compare_summaries(summary,expected,path="") -> [str]:
+    # description of each value of a summary differing from expected summary
+    if (isinstance(summary,dict)) and (isinstance(expected,dict)):
+        differences=[]
+        for key in list(expected)+[key for key in summary if (key not in expected)]:
+            differences+=compare_summaries(summary.get(key),expected.get(key),path+"/"+key)
+        return differences
+    if (summary!=expected): return ["{} is {} (expected {})".format(path,json.dumps(summary,ensure_ascii=False),json.dumps(expected,ensure_ascii=False))]
+    return []
+
+def summarise_outputs(names=None,fixture_dir=FIXTURE_DIR) -> dict:
+    # summary of output of each benchmarked function, parsed from saved pages
+    with serving_fixtures(fixture_dir), contextlib.redirect_stdout(io.StringIO()):
+        return {name:summarise(function()) for name,function in BENCHMARKS.items() if (names is None) or (name in names)}
+
+def record_expected(fixture_dir=FIXTURE_DIR):
+    """
+    SUMMARY
+    record output parsed from saved pages as their expected output (see Benchmark.summarise), to check parsers against.
+    recorded output should be checked by hand against the pages before it is committed
+    E.G. python Benchmark.py record --outputs-only
+
+    PARAMETERS
+    fixture_dir (str): directory of saved pages (default=`FIXTURE_DIR`)
+    """
+    expected=summarise_outputs(None,fixture_dir)
+    with open(os.path.join(fixture_dir,EXPECTED_FILE),"w",encoding="utf-8") as f: json.dump(expected,f,indent=4,ensure_ascii=False)
+    print("recorded expected output to {}".format(os.path.join(fixture_dir,EXPECTED_FILE)))
+
+def check_outputs(names=None,fixture_dir=FIXTURE_DIR) -> [str]:
+    """
+    SUMMARY
+    check output parsed from saved pages against their expected output (see Benchmark.record_expected)
+    E.G. check_outputs(["scrape_stage_race_stage_results"])
+
+    PARAMETERS
+    names (list(str)): functions to check (see `BENCHMARKS`) (default=None, all)
+    fixture_dir (str): directory of saved pages (default=`FIXTURE_DIR`)
+
+    OUTPUT
+    list(str): description of each value differing from expected output
+    """
+    with open(os.path.join(fixture_dir,EXPECTED_FILE),encoding="utf-8") as f: expected=json.load(f)
+
+    mismatches=[]
+    for name,summary in summarise_outputs(names,fixture_dir).items():
+        if (name not in expected): mismatches.append("{}: no expected output recorded".format(name))
+        else: mismatches+=[name+": "+difference for difference in compare_summaries(summary,expected[name])]
+
+    return mismatches
+
+"""
+BASELINE
+"""
+
+def compare_to_baseline(results:{str:dict},baseline:{str:dict},tolerance=0.2) -> [str]:
+    """
+    SUMMARY
+    find regressions against a baseline run: throughput lower or peak memory higher by more than `tolerance`
+
+    PARAMETERS
+    results (dict): results of this run (see Benchmark.run_benchmarks)
+    baseline (dict): results of baseline run
+    tolerance (float): fraction a measure may be worse by before it counts as a regression (default=0.2)
+
+    OUTPUT
+    list(str): description of each regression
+    """
+    regressions=[]
+    for name,result in results.items():
+        if (name not in baseline): continue
+
+        if (result["pages_per_sec"]<baseline[name]["pages_per_sec"]*(1-tolerance)):
+            regressions.append("{}: {:.1f} pages/sec (baseline {:.1f})".format(name,result["pages_per_sec"],baseline[name]["pages_per_sec"]))
+        if (result["peak_memory_kb"]>baseline[name]["peak_memory_kb"]*(1+tolerance)):
+            regressions.append("{}: {:.1f} KB peak memory (baseline {:.1f})".format(name,result["peak_memory_kb"],baseline[name]["peak_memory_kb"]))
+
+    return regressions
+
+def print_results(results:{str:dict},baseline=None):
+    # table of results, with change against baseline
+    print("{:40} {:>12} {:>12} {:>14} {:>10}".format("function","pages/sec","rows/sec","peak memory KB","vs base"))
+    for name,result in results.items():
+        change=""
+        if (baseline is not None) and (name in baseline): change="{:+.0%}".format(result["pages_per_sec"]/baseline[name]["pages_per_sec"]-1)
+        print("{:40} {:>12.1f} {:>12.1f} {:>14.1f} {:>10}".format(name,result["pages_per_sec"],result["rows_per_sec"],result["peak_memory_kb"],change))
+
+"""
+COMMAND LINE
+"""
+
+def main(args=None) -> int:
+    """
+    SUMMARY
+    command line interface to benchmarks
+    E.G. python Benchmark.py run --save-baseline benchmark_baseline.json
+    E.G. python Benchmark.py run --baseline benchmark_baseline.json --tolerance 0.2
+    E.G. python Benchmark.py check
+    E.G. python Benchmark.py record
+
+    PARAMETERS
+    args (list(str)): command line arguments (default=None, uses sys.argv)
+
+    OUTPUT
+    int: exit code (1 if output differs from expected output, or there are regressions against baseline)
+    """
+    parser=argparse.ArgumentParser(description="Benchmark PCS parsers against saved pages")
+    commands=parser.add_subparsers(dest="command",required=True)
+
+    run_parser=commands.add_parser("run",help="benchmark public functions")
+    run_parser.add_argument("--only",nargs="+",default=None,help="only benchmark these functions")
+    run_parser.add_argument("--min-time",type=float,default=1.0,help="minimum seconds to repeat each function for")
+    run_parser.add_argument("--baseline",default=None,help="json file of baseline run to compare against")
+    run_parser.add_argument("--tolerance",type=float,default=0.2,help="fraction a measure may be worse than baseline by")
+    run_parser.add_argument("--save-baseline",default=None,help="json file to save this run to")
+
+    check_parser=commands.add_parser("check",help="check output parsed from fixtures against expected output")
+    check_parser.add_argument("--only",nargs="+",default=None,help="only check these functions")
+
+    record_parser=commands.add_parser("record",help="save live pages as fixtures & record their expected output")
+    record_parser.add_argument("--outputs-only",action="store_true",help="only record expected output of saved fixtures")
+
+    args=parser.parse_args(args)
+
+    if (args.command=="record"):
+        if (args.outputs_only): record_expected()
+        else: record_fixtures()
+        return 0
+
+    # parsers are checked before they are timed, so a faster parser can't hide wrong output
+    mismatches=check_outputs(args.only)
+    for mismatch in mismatches: print("MISMATCH "+mismatch)
+    if (args.command=="check") or (len(mismatches)>0): return int(len(mismatches)>0)
+
+    results=run_benchmarks(args.only,args.min_time)
+
+    baseline=None
+    if (args.baseline is not None):
+        with open(args.baseline) as f: baseline=json.load(f)
+    print_results(results,baseline)
+
+    if (args.save_baseline is not None):
+        with open(args.save_baseline,"w") as f: json.dump(results,f,indent=4)
+
+    if (baseline is not None):
+        regressions=compare_to_baseline(results,baseline,args.tolerance)
+        for regression in regressions: print("REGRESSION "+regression)
+        if (len(regressions)>0): return 1
+
+    return 0
+
+if __name__=="__main__":
+    raise SystemExit(main())
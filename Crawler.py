@@ -0,0 +1,761 @@
+from datetime import date
+import pandas as pd
+import threading
+import json
+import sqlite3
+import time
+import os
+import re
+
+import Scraper
+
+"""
+DATASET
+"""
+# race pages are listed as `.../race/<name>/<year>/gc` (stage races) or `.../race/<name>/<year>/result` (one day races)
+RACE_PAGE_PATTERN=re.compile(r"/(?:gc|result|overview)/?$")
+
+def get_race_base_url(race_url:str) -> str:
+    """
+    SUMMARY
+    get url which identifies a race edition, whichever of its pages is linked to
+    E.G. https://www.procyclingstats.com/race/tour-de-france/2020/gc -> https://www.procyclingstats.com/race/tour-de-france/2020
+
+    PARAMETERS
+    race_url (str): full url to one of race's pages
+
+    OUTPUT
+    str: full url to race edition
+    """
+    return RACE_PAGE_PATTERN.sub("",race_url.rstrip("/"))
+
+def get_race_key(race_url:str) -> str:
+    """
+    SUMMARY
+    get name of files a race's data is stored in
+    E.G. https://www.procyclingstats.com/race/tour-de-france/2020/gc -> tour-de-france
+
+    PARAMETERS
+    race_url (str): full url to one of race's pages
+
+    OUTPUT
+    str: race's name in its url
+    """
+    return get_race_base_url(race_url).split("/")[-2]
+
+# rider & team urls are identified by their first path segment (e.g. `rider/caleb-ewan/2020` is rider `rider/caleb-ewan`)
+SITE_PATTERN=re.compile(r"^(?:https?://)?(?:www\.)?procyclingstats\.com/+",re.IGNORECASE)
+ENTITY_PATH_PATTERN=re.compile(r"^(?:rider|team)/[^/]+")
+
+def get_entity_url(url:str) -> str:
+    """
+    SUMMARY
+    get canonical url of a page, so the same rider or team linked to in different ways is only crawled once
+    E.G. http://procyclingstats.com/rider/Caleb-Ewan/2020?p=1 -> https://www.procyclingstats.com/rider/caleb-ewan
+
+    PARAMETERS
+    url (str): full or relative url to page
+
+    OUTPUT
+    str: canonical full url (rider & team urls are cut down to the rider or team-year they belong to)
+    """
+    path=SITE_PATTERN.sub("",url.strip()).split("#")[0].split("?")[0].strip("/").lower()
+
+    entity=ENTITY_PATH_PATTERN.match(path)
+    if (entity is not None): path=entity.group(0)
+
+    return "https://www.procyclingstats.com/"+path
+
+def write_csv(df:pd.DataFrame,path:str):
+    """
+    SUMMARY
+    write dataframe to a csv atomically, so a crash never leaves a partial file behind
+
+    PARAMETERS
+    df (pandas.DataFrame): data to write
+    path (str): path of csv file
+    """
+    os.makedirs(os.path.dirname(path),exist_ok=True)
+    temp_path=path+".tmp"
+    df.to_csv(temp_path,index=False)
+    os.replace(temp_path,path)
+
+def read_csv(path:str,dtypes=None) -> pd.DataFrame:
+    """
+    SUMMARY
+    read dataframe written by Crawler.write_csv, restoring columns which csv doesn't keep the type of (strings & durations)
+
+    PARAMETERS
+    path (str): path of csv file
+    dtypes ({str:str}): dtypes of scraped table (e.g. Scraper.STAGE_RESULTS_DTYPES) (default=None)
+
+    OUTPUT
+    pandas.DataFrame: data read
+    """
+    if (dtypes is None): dtypes={}
+
+    df=pd.read_csv(path,dtype={column:str for column,dtype in dtypes.items() if (dtype=="object")}) # e.g. keep "02.23" as a string
+    for column,dtype in dtypes.items():
+        if (column in df.columns) and (dtype.startswith("timedelta")): df[column]=pd.to_timedelta(df[column])
+
+    return df
+
+def get_results_path(season_dir:str,race_key:str) -> str:
+    # results file of a race
+    return os.path.join(season_dir,"results",race_key+".csv")
+
+"""
+FRONTIER
+"""
+
+class Frontier:
+    """
+    SUMMARY
+    persistent record of urls to crawl, so an interrupted crawl can be restarted without repeating completed work.
+    each url is "pending", "done" (with location of its parsed output) or "failed".
+    failed urls are retried with an exponential backoff (capped at `max_backoff`) until they have been tried `max_attempts` times
+    USED by Crawler.run_frontier
+
+    PARAMETERS
+    path (str): path of sqlite database to store frontier in (default="pcs_frontier.sqlite")
+    max_attempts (int): number of times a url is tried before it is given up on (default=5)
+    backoff (float): seconds to wait before first retry, doubling on each retry (default=60)
+    max_backoff (float): maximum seconds to wait before a retry (default=3600)
+    """
+
+    def __init__(self,path="pcs_frontier.sqlite",max_attempts=5,backoff=60,max_backoff=3600):
+        self.path=path
+        self.max_attempts=max_attempts
+        self.backoff=backoff
+        self.max_backoff=max_backoff
+
+        if (os.path.dirname(path)!=""): os.makedirs(os.path.dirname(path),exist_ok=True)
+
+        # frontier is shared between threads, so access is serialised
+        self.lock=threading.Lock()
+        self.connection=sqlite3.connect(path,check_same_thread=False)
+        with self.connection:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS urls (url TEXT PRIMARY KEY, kind TEXT, state TEXT, output TEXT, attempts INTEGER, next_attempt_at REAL, error TEXT, updated_at REAL)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS urls_state ON urls (state,kind,next_attempt_at)")
+            self.connection.execute("CREATE TABLE IF NOT EXISTS states (entity TEXT PRIMARY KEY, state TEXT, updated_at REAL)")
+            self.connection.execute("CREATE TABLE IF NOT EXISTS edges (source TEXT, target TEXT, kind TEXT, PRIMARY KEY (kind,source,target))")
+
+    def add(self,urls:[str],kind=None) -> int:
+        """
+        SUMMARY
+        add urls to frontier as pending (urls already in frontier are left as they are)
+
+        PARAMETERS
+        urls (list(str)): urls to add
+        kind (str): type of page, to tell urls of different crawls apart (default=None)
+
+        OUTPUT
+        int: number of urls which were new
+        """
+        now=time.time()
+        with self.lock, self.connection:
+            before=self.connection.total_changes
+            self.connection.executemany("INSERT OR IGNORE INTO urls VALUES (?,?,'pending',NULL,0,NULL,NULL,?)",[(url,kind,now) for url in urls])
+            return self.connection.total_changes-before
+
+    def get(self,url:str) -> dict:
+        """
+        SUMMARY
+        get record of a url
+
+        PARAMETERS
+        url (str): url to look up
+
+        OUTPUT
+        dict: record includes (`None` if url isn't in frontier)
+                "kind" (str) type of page
+                "state" (str) one of ["pending","done","failed"]
+                "output" (str) location of parsed output (`None` unless done)
+                "attempts" (int) number of failed attempts
+                "next_attempt_at" (float) unix time url will be retried at (`None` if not waiting to be retried)
+                "error" (str) error from last failed attempt
+        """
+        with self.lock:
+            row=self.connection.execute("SELECT kind,state,output,attempts,next_attempt_at,error FROM urls WHERE url=?",(url,)).fetchone()
+        if (row is None): return None
+
+        return dict(zip(["kind","state","output","attempts","next_attempt_at","error"],row))
+
+    def is_done(self,url:str) -> bool:
+        record=self.get(url)
+        return (record is not None) and (record["state"]=="done")
+
+    def due(self,kind=None,limit=None) -> [str]:
+        """
+        SUMMARY
+        get urls which should be crawled now: pending urls & failed urls whose backoff has passed
+
+        PARAMETERS
+        kind (str): only get urls of this type (default=None, all types)
+        limit (int): maximum number of urls to get (default=None, all)
+
+        OUTPUT
+        list(str): urls to crawl, oldest first
+        """
+        query="SELECT url FROM urls WHERE (state='pending' OR (state='failed' AND next_attempt_at<=?))"
+        parameters=[time.time()]
+        if (kind is not None):
+            query+=" AND kind=?"
+            parameters.append(kind)
+        query+=" ORDER BY updated_at"
+        if (limit is not None):
+            query+=" LIMIT ?"
+            parameters.append(limit)
+
+        with self.lock:
+            return [row[0] for row in self.connection.execute(query,parameters)]
+
+    def urls(self,kind=None,state=None) -> [str]:
+        """
+        SUMMARY
+        get urls in frontier
+
+        PARAMETERS
+        kind (str): only get urls of this type (default=None, all types)
+        state (str): only get urls in this state (default=None, all states)
+
+        OUTPUT
+        list(str): urls
+        """
+        query="SELECT url FROM urls WHERE 1=1"
+        parameters=[]
+        if (kind is not None):
+            query+=" AND kind=?"
+            parameters.append(kind)
+        if (state is not None):
+            query+=" AND state=?"
+            parameters.append(state)
+
+        with self.lock:
+            return [row[0] for row in self.connection.execute(query,parameters)]
+
+    def next_retry_at(self,kind=None) -> float:
+        """
+        SUMMARY
+        get time of next retry of a failed url
+
+        PARAMETERS
+        kind (str): only consider urls of this type (default=None, all types)
+
+        OUTPUT
+        float: unix time of next retry (`None` if no urls are waiting to be retried)
+        """
+        query="SELECT MIN(next_attempt_at) FROM urls WHERE state='failed'"
+        parameters=[]
+        if (kind is not None):
+            query+=" AND kind=?"
+            parameters.append(kind)
+
+        with self.lock:
+            return self.connection.execute(query,parameters).fetchone()[0]
+
+    def mark_done(self,url:str,output=None):
+        """
+        SUMMARY
+        record url as crawled
+
+        PARAMETERS
+        url (str): url which was crawled
+        output (str): location of parsed output (default=None)
+        """
+        with self.lock, self.connection:
+            self.connection.execute("UPDATE urls SET state='done', output=?, next_attempt_at=NULL, error=NULL, updated_at=? WHERE url=?",(output,time.time(),url))
+
+    def mark_failed(self,url:str,error=None) -> bool:
+        """
+        SUMMARY
+        record failed attempt to crawl url, scheduling a retry after an exponential backoff
+
+        PARAMETERS
+        url (str): url which failed
+        error (str): description of error (default=None)
+
+        OUTPUT
+        bool: whether url will be retried (False once it has been tried `max_attempts` times)
+        """
+        with self.lock, self.connection:
+            attempts=self.connection.execute("SELECT attempts FROM urls WHERE url=?",(url,)).fetchone()[0]+1
+            retry=(attempts<self.max_attempts)
+            now=time.time()
+            next_attempt_at=now+min(self.max_backoff,self.backoff*2**(attempts-1)) if (retry) else None
+            self.connection.execute("UPDATE urls SET state='failed', attempts=?, next_attempt_at=?, error=?, updated_at=? WHERE url=?",(attempts,next_attempt_at,error,now,url))
+
+        return retry
+
+    def reopen(self,urls:[str]):
+        """
+        SUMMARY
+        make urls which are done pending again, so they are crawled again (e.g. pages which can have changed)
+
+        PARAMETERS
+        urls (list(str)): urls to crawl again
+        """
+        now=time.time()
+        with self.lock, self.connection:
+            self.connection.executemany("UPDATE urls SET state='pending', updated_at=? WHERE url=? AND state='done'",[(now,url) for url in urls])
+
+    def get_state(self,entity:str) -> dict:
+        """
+        SUMMARY
+        get last seen state of an entity (e.g. latest season of a rider), used to only crawl what can have changed
+
+        PARAMETERS
+        entity (str): url or name of entity
+
+        OUTPUT
+        dict: state stored by Crawler.Frontier.set_state (`None` if entity has no state)
+        """
+        with self.lock:
+            row=self.connection.execute("SELECT state FROM states WHERE entity=?",(entity,)).fetchone()
+        if (row is None): return None
+
+        return json.loads(row[0])
+
+    def set_state(self,entity:str,state:dict):
+        """
+        SUMMARY
+        store last seen state of an entity
+
+        PARAMETERS
+        entity (str): url or name of entity
+        state (dict): state to store (must be json serialisable)
+        """
+        with self.lock, self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO states VALUES (?,?,?)",(entity,json.dumps(state),time.time()))
+
+    def add_edges(self,edges:[(str,str)],kind=None) -> int:
+        """
+        SUMMARY
+        record links between entities (e.g. team-year to rider memberships), kept apart from the urls crawled (edges already recorded are ignored)
+
+        PARAMETERS
+        edges (list((str,str))): (source,target) of each link
+        kind (str): type of link (default=None)
+
+        OUTPUT
+        int: number of edges which were new
+        """
+        with self.lock, self.connection:
+            before=self.connection.total_changes
+            self.connection.executemany("INSERT OR IGNORE INTO edges VALUES (?,?,?)",[(source,target,kind) for source,target in edges])
+            return self.connection.total_changes-before
+
+    def edges(self,kind=None) -> [(str,str)]:
+        """
+        SUMMARY
+        get links between entities
+
+        PARAMETERS
+        kind (str): only get links of this type (default=None, all types)
+
+        OUTPUT
+        list((str,str)): (source,target) of each link
+        """
+        query="SELECT source,target FROM edges"
+        parameters=[]
+        if (kind is not None):
+            query+=" WHERE kind=?"
+            parameters.append(kind)
+        query+=" ORDER BY source,target"
+
+        with self.lock:
+            return self.connection.execute(query,parameters).fetchall()
+
+    def retry_failed(self,kind=None):
+        """
+        SUMMARY
+        make urls which were given up on pending again (with their attempts reset)
+
+        PARAMETERS
+        kind (str): only reset urls of this type (default=None, all types)
+        """
+        query="UPDATE urls SET state='pending', attempts=0, next_attempt_at=NULL, updated_at=? WHERE state='failed'"
+        parameters=[time.time()]
+        if (kind is not None):
+            query+=" AND kind=?"
+            parameters.append(kind)
+
+        with self.lock, self.connection:
+            self.connection.execute(query,parameters)
+
+    def counts(self,kind=None) -> {str:int}:
+        """
+        SUMMARY
+        get number of urls in each state
+
+        PARAMETERS
+        kind (str): only count urls of this type (default=None, all types)
+
+        OUTPUT
+        dict: number of urls, by state
+        """
+        query="SELECT state,COUNT(*) FROM urls"
+        parameters=[]
+        if (kind is not None):
+            query+=" WHERE kind=?"
+            parameters.append(kind)
+        query+=" GROUP BY state"
+
+        with self.lock:
+            return dict(self.connection.execute(query,parameters).fetchall())
+
+    def close(self):
+        with self.lock: self.connection.close()
+
+def run_frontier(frontier:Frontier,function,kind=None,max_workers=None,wait=True,only=None) -> {str:int}:
+    """
+    SUMMARY
+    crawl all due urls of a frontier concurrently, until none are left.
+    `function` is called with each url & returns location of its parsed output (url is marked done),
+    or `None` if there is nothing to crawl yet (url stays pending for a later crawl).
+    urls for which `function` raises an error are marked failed & retried after their backoff
+    E.G. run_frontier(frontier,crawl_rider,kind="rider")
+
+    PARAMETERS
+    frontier (Crawler.Frontier): frontier to crawl
+    function (function): function crawling a single url
+    kind (str): only crawl urls of this type (default=None, all types)
+    max_workers (int): maximum number of urls crawled at once (default=None, uses `Scraper.MAX_WORKERS`)
+    wait (bool): whether to wait for failed urls' backoffs to pass, rather than leaving them for a later crawl (default=True)
+    only (list(str)): only crawl these urls, leaving other urls of frontier as they are (default=None, all urls of `kind`)
+
+    OUTPUT
+    dict: number of urls of `kind` in each state, once crawl is finished
+    """
+    def crawl(url):
+        try: return url,function(url),None
+        except Exception as e: return url,None,repr(e)
+
+    if (only is not None): only=set(only)
+
+    skipped=set() # urls with nothing to crawl yet
+    while (True):
+        urls=[url for url in frontier.due(kind) if (url not in skipped) and ((only is None) or (url in only))]
+        if (len(urls)==0):
+            if (only is None): next_retry_at=frontier.next_retry_at(kind)
+            else: next_retry_at=min([record["next_attempt_at"] for record in map(frontier.get,only) if (record is not None) and (record["state"]=="failed") and (record["next_attempt_at"] is not None)],default=None)
+            if (not wait) or (next_retry_at is None): break
+            time.sleep(max(0,next_retry_at-time.time()))
+            continue
+
+        for url,output,error in Scraper.iter_concurrent(crawl,urls,max_workers):
+            if (error is not None): frontier.mark_failed(url,error) # urls given up on are left failed (see Crawler.Frontier.counts)
+            elif (output is None): skipped.add(url)
+            else: frontier.mark_done(url,output)
+
+    return frontier.counts(kind)
+
+"""
+SEASON CRAWL
+"""
+
+def crawl_season(year=2020,output_dir="pcs_data",max_workers=None,frontier=None,wait=False) -> pd.DataFrame:
+    """
+    SUMMARY
+    crawl calendar & results of every race in a season, writing a dataset to `output_dir/year`:
+        "races.csv" every race in season, once each (races listed under several tours are only kept for first tour)
+        "stages/<race>.csv" stages of each stage race
+        "results/<race>.csv" results of each race (every stage of stage races)
+    races are crawled concurrently & written as soon as they are done.
+    crawl is resumable: progress is kept in a frontier (`output_dir/year/frontier.sqlite`), so an interrupted crawl can be rerun
+    without fetching races again, & races which failed are retried.
+    crawl is incremental: rerunning it only fetches what can have changed. calendar is reused once season is over,
+    & races which hadn't finished when they were crawled are crawled again, only fetching stages without stored results
+    E.G. crawl_season(2020,"pcs_data")
+
+    PARAMETERS
+    year (int): season to crawl (default=2020)
+    output_dir (str): directory to write dataset to (default="pcs_data")
+    max_workers (int): maximum number of races fetched at once (default=None, uses `Scraper.MAX_WORKERS`)
+    frontier (Crawler.Frontier): frontier to record progress in (default=None, uses frontier in season's directory)
+    wait (bool): whether to wait to retry races which failed, rather than leaving them for next crawl (default=False)
+
+    OUTPUT
+    pandas.DataFrame: races in season (see Crawler.crawl_calendar), with "crawled" (bool) whether its results were written
+    """
+    season_dir=os.path.join(output_dir,str(year))
+    if (frontier is None): frontier=Frontier(os.path.join(season_dir,"frontier.sqlite"))
+
+    races=crawl_calendar(year,season_dir,frontier)
+    if (len(races)==0): return races
+
+    # only crawl races which haven't been cancelled (races already crawled are left as done, unless they hadn't finished)
+    race_records={race["race_url"]:race for race in races[~races["cancelled"]].to_dict("records")}
+    frontier.add(race_records.keys(),kind="race")
+    frontier.reopen([race_url for race_url in race_records if (not is_final(frontier,race_url))])
+
+    # only this season's races (frontier can hold races since cancelled, or races of other seasons when it is shared)
+    crawl=lambda race_url:crawl_race(race_records[race_url],season_dir,frontier)
+    run_frontier(frontier,crawl,kind="race",max_workers=max_workers,wait=wait,only=race_records.keys())
+
+    races["crawled"]=races["race_url"].map(frontier.is_done)
+    return races
+
+def is_final(frontier:Frontier,entity:str) -> bool:
+    # whether entity was crawled once it could no longer change
+    state=frontier.get_state(entity)
+    return (state is not None) and state.get("final",False)
+
+def crawl_calendar(year:int,season_dir:str,frontier:Frontier) -> pd.DataFrame:
+    """
+    SUMMARY
+    get every race in a season, deduplicated on race (same race is listed by several tours), & write it to "races.csv".
+    once a season is over its stored calendar is reused rather than fetched again
+    USED by Crawler.crawl_season
+
+    PARAMETERS
+    year (int): season to get races for
+    season_dir (str): directory of season's dataset
+    frontier (Crawler.Frontier): frontier to record state of calendar in
+
+    OUTPUT
+    pandas.DataFrame: races in season (see Scraper.scrape_races_for_year), with "race_key" (str) name of race's files & "end_date" (str) last day of race (YYYY-MM-DD)
+    """
+    races_path=os.path.join(season_dir,"races.csv")
+    if (is_final(frontier,"calendar/{}".format(year))) and (os.path.exists(races_path)): return read_csv(races_path,Scraper.RACES_DTYPES)
+
+    races=Scraper.scrape_races_for_year(year)
+    if (len(races)==0): return races
+    races["race_url"]=races["race_url"].map(get_race_base_url)
+    races=races.drop_duplicates(subset="race_url",keep="first").reset_index(drop=True)
+    races["race_key"]=races["race_url"].map(get_race_key)
+    races["end_date"]=races["race_dates"].map(lambda race_dates:get_race_end_date(race_dates,year).isoformat())
+    write_csv(races,races_path)
+
+    frontier.set_state("calendar/{}".format(year),{"final":year<date.today().year})
+    return races
+
+def get_race_end_date(race_dates:str,year:int) -> date:
+    """
+    SUMMARY
+    get last day of a race
+    E.G. "08.29 - 09.20" -> 2020-09-20
+
+    PARAMETERS
+    race_dates (str): dates of race (either "M.D - M.D" or "M.D"), from Scraper.scrape_races_for_year
+    year (int): season of race
+
+    OUTPUT
+    datetime.date: last day of race
+    """
+    month,day=race_dates.split("-")[-1].strip().split(".")
+    return date(year,int(month),int(day))
+
+def crawl_race(race:dict,season_dir:str,frontier=None) -> str:
+    """
+    SUMMARY
+    fetch stages & results of a single race & merge them into the dataset.
+    stages whose results are already stored are not fetched again
+    USED by Crawler.crawl_season
+
+    PARAMETERS
+    race (dict): race from calendar (see Crawler.crawl_calendar)
+    season_dir (str): directory of season's dataset
+    frontier (Crawler.Frontier): frontier to record whether race had finished when crawled (default=None)
+
+    OUTPUT
+    str: path of race's results file (`None` if race has no results yet)
+    """
+    results_path=get_results_path(season_dir,race["race_key"])
+    stored=read_csv(results_path,Scraper.STAGE_RESULTS_DTYPES) if (race["stage_race"]) and (os.path.exists(results_path)) else None
+
+    if (race["stage_race"]): stages,results=scrape_stage_race(race["race_url"],stored)
+    else: stages,results=None,scrape_one_day_race(race["race_url"])
+
+    if (len(results)==0): return None # no results yet
+
+    if (stages is not None): write_csv(stages,os.path.join(season_dir,"stages",race["race_key"]+".csv"))
+    write_csv(results,results_path)
+
+    if (frontier is not None): frontier.set_state(race["race_url"],{"final":date.fromisoformat(race["end_date"])<date.today()})
+    return results_path
+
+def scrape_stage_race(race_url:str,stored=None) -> (pd.DataFrame,pd.DataFrame):
+    """
+    SUMMARY
+    get stages & results of every stage of a stage race
+    USED by Crawler.crawl_race
+
+    PARAMETERS
+    race_url (str): full url to race edition (see Crawler.get_race_base_url)
+    stored (pandas.DataFrame): results already stored for race, from a previous crawl. stages in these aren't fetched again (default=None)
+
+    OUTPUT
+    pandas.DataFrame: stages of race (see Scraper.scrape_stage_race_overview_stages), with "race_url"
+    pandas.DataFrame: results of all stages which have results (see Scraper.scrape_stage_race_stage_results), with "race_url" & "stage_url" (empty if no stage has results yet)
+    """
+    stages=Scraper.scrape_stage_race_overview_stages(race_url+"/overview")
+    stages["race_url"]=race_url
+
+    existing={} if (stored is None) else {stage_url:results for stage_url,results in stored.groupby("stage_url",sort=False)}
+
+    stage_results=[]
+    for stage_url,results in Scraper.iter_stage_race_all_stage_results(race_url+"/overview",stages=stages,existing=existing):
+        if (results is None): continue # stage hasn't been raced yet
+        results["race_url"]=race_url
+        results["stage_url"]=stage_url
+        stage_results.append(results)
+
+    if (len(stage_results)==0): return stages,pd.DataFrame()
+    return stages,pd.concat(stage_results,ignore_index=True)
+
+def scrape_one_day_race(race_url:str) -> pd.DataFrame:
+    """
+    SUMMARY
+    get results of a one day race
+    USED by Crawler.crawl_race
+
+    PARAMETERS
+    race_url (str): full url to race edition (see Crawler.get_race_base_url)
+
+    OUTPUT
+    pandas.DataFrame: results of race (see Scraper.scrape_one_day_results), with "race_url" & "stage_url" (url of results page) (empty if race has no results yet)
+    """
+    results=Scraper.scrape_one_day_results(race_url+"/result")
+    if (results is None): return pd.DataFrame() # race hasn't been raced yet
+
+    results["race_url"]=race_url
+    results["stage_url"]=race_url+"/result"
+
+    return results
+
+"""
+RIDER CRAWL
+"""
+
+TEAM_YEAR_PATTERN=re.compile(r"-([0-9]{4})$")
+
+def get_team_year(team_url:str) -> int:
+    # season of a team-year page (e.g. .../team/ag2r-la-mondiale-2020 -> 2020), `None` if url has no season
+    team_year=TEAM_YEAR_PATTERN.search(team_url.rstrip("/"))
+    return int(team_year.group(1)) if (team_year is not None) else None
+
+def crawl_riders(years:[int],output_dir="pcs_data",max_workers=None,frontier=None,wait=False,update=False) -> {str:int}:
+    """
+    SUMMARY
+    crawl the graph of teams & riders in the given seasons, writing a dataset to `output_dir`:
+        "teams/<year>.csv" teams of each season
+        "riders/<rider>.csv" all results of each rider
+        "riders.csv" details of each rider
+        "memberships.csv" team-year to rider links (from team rosters & riders' team histories)
+    every team-year & rider is kept in a frontier (`output_dir/frontier.sqlite`) under its canonical url (see Crawler.get_entity_url),
+    so a rider on many rosters has their profile & career fetched once, & an interrupted crawl can be rerun
+    without fetching teams or riders again (pages which failed are retried).
+    with `update` riders & teams already crawled are refreshed incrementally: only seasons which weren't over when they were
+    last crawled are fetched again & merged into stored results (riders whose career ended before then aren't fetched at all)
+    E.G. crawl_riders(range(2000,2021),"pcs_data")
+
+    PARAMETERS
+    years (list(int)): seasons to get teams from
+    output_dir (str): directory to write dataset to (default="pcs_data")
+    max_workers (int): maximum number of pages fetched at once (default=None, uses `Scraper.MAX_WORKERS`)
+    frontier (Crawler.Frontier): frontier to record progress in (default=None, uses frontier in `output_dir`)
+    wait (bool): whether to wait to retry pages which failed, rather than leaving them for next crawl (default=False)
+    update (bool): whether to refresh teams & riders which were already crawled but can have changed since (default=False)
+
+    OUTPUT
+    dict: number of rider urls in each state (see Crawler.Frontier)
+    """
+    if (frontier is None): frontier=Frontier(os.path.join(output_dir,"frontier.sqlite"))
+
+    # teams of each season (lists of past seasons are only fetched once)
+    for year in years:
+        if (is_final(frontier,"teams/{}".format(year))): continue
+        teams=Scraper.scrape_teams_for_year(year)
+        write_csv(teams.assign(year=year),os.path.join(output_dir,"teams","{}.csv".format(year)))
+        frontier.add([get_entity_url(team_url) for team_url in teams["team_url"]],kind="team")
+        frontier.set_state("teams/{}".format(year),{"final":year<date.today().year})
+
+    if (update):
+        frontier.reopen([url for url in frontier.urls("team","done") if (not is_final(frontier,url))])
+        frontier.reopen([url for url in frontier.urls("rider","done") if (not is_final(frontier,url))])
+
+    # riders of each team
+    def crawl_team(team_url):
+        riders=Scraper.scrape_riders_from_team(team_url)
+        rider_urls=[get_entity_url(rider_url) for rider_url in riders["rider_url"]]
+        frontier.add(rider_urls,kind="rider") # riders already seen on another roster aren't added again
+        frontier.add_edges([(team_url,rider_url) for rider_url in rider_urls],kind="member")
+
+        team_year=get_team_year(team_url)
+        frontier.set_state(team_url,{"final":(team_year is not None) and (team_year<date.today().year)})
+        return team_url
+    run_frontier(frontier,crawl_team,kind="team",max_workers=max_workers,wait=wait)
+
+    # profile & results of each rider
+    crawl=lambda rider_url:crawl_rider(rider_url,output_dir,frontier)
+    counts=run_frontier(frontier,crawl,kind="rider",max_workers=max_workers,wait=wait)
+
+    write_rider_graph(frontier,output_dir)
+    return counts
+
+def write_rider_graph(frontier:Frontier,output_dir:str):
+    """
+    SUMMARY
+    write riders & team-year memberships recorded in a frontier to `output_dir/riders.csv` & `output_dir/memberships.csv`
+    USED by Crawler.crawl_riders
+
+    PARAMETERS
+    frontier (Crawler.Frontier): frontier riders were crawled through
+    output_dir (str): directory of dataset
+    """
+    rows=[]
+    for rider_url in frontier.urls("rider","done"):
+        state=frontier.get_state(rider_url)
+        if (state is not None) and ("details" in state): rows.append({"rider_url":rider_url,**state["details"]})
+    write_csv(pd.DataFrame(rows),os.path.join(output_dir,"riders.csv"))
+
+    memberships=pd.DataFrame(frontier.edges("member"),columns=["team_url","rider_url"])
+    memberships.insert(1,"year",pd.array([get_team_year(team_url) for team_url in memberships["team_url"]],dtype="Int64"))
+    write_csv(memberships,os.path.join(output_dir,"memberships.csv"))
+
+def crawl_rider(rider_url:str,output_dir:str,frontier=None) -> str:
+    """
+    SUMMARY
+    fetch profile & all results of a rider & merge them into the dataset.
+    seasons which were over when results were last stored aren't fetched again
+    USED by Crawler.crawl_riders
+
+    PARAMETERS
+    rider_url (str): full url to rider's overview page
+    output_dir (str): directory of dataset
+    frontier (Crawler.Frontier): frontier to record rider's details, team history & last season which was over when rider was crawled in (default=None)
+
+    OUTPUT
+    str: path of rider's results file
+    """
+    results_path=os.path.join(output_dir,"riders",rider_url.rstrip("/").split("/")[-1]+".csv")
+
+    # last season which was over when results were stored
+    state=frontier.get_state(rider_url) if (frontier is not None) else None
+    final_year=state["final_year"] if (state is not None) and (os.path.exists(results_path)) else None
+
+    # only fetch seasons which can have changed
+    profile=Scraper.scrape_rider_profile(rider_url)
+    years=profile["years"]
+    fetch_years=[year for year in years if (final_year is None) or (year>final_year)]
+    year_results={int(year_results["year"].iloc[0]):year_results for year_results in Scraper.iter_rider_all_results(rider_url,{"years":fetch_years}) if (len(year_results)>0)}
+
+    if (final_year is not None):
+        stored=read_csv(results_path,Scraper.RIDER_YEAR_RESULTS_DTYPES)
+        if ("year" in stored.columns): # rider with no results has no years stored
+            for year,stored_results in stored[stored["year"]<=final_year].groupby("year",sort=False): year_results.setdefault(int(year),stored_results.drop(columns="rider_url"))
+
+    # rider with no results is written with every column, so file can be read like any other
+    results=pd.concat([year_results[year] for year in years if (year in year_results)],ignore_index=True) if (len(year_results)>0) else pd.DataFrame(columns=[*Scraper.RIDER_YEAR_RESULTS_DTYPES,"year"])
+    results["rider_url"]=rider_url
+    write_csv(results,results_path)
+
+    if (frontier is not None):
+        # teams rider rode for, including seasons outside the crawl
+        team_urls=profile["teams"]["team_url"].dropna()
+        frontier.add_edges([(get_entity_url(team_url),rider_url) for team_url in team_urls],kind="member")
+
+        final_year=date.today().year-1
+        frontier.set_state(rider_url,{"final_year":final_year,"final":(len(years)>0) and (max(years)<final_year),"details":profile["details"].to_dict()})
+    return results_path
@@ -0,0 +1,230 @@
+import pandas as pd
+import glob
+import os
+
+import Scraper
+import Crawler
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow=None # only needed to write parquet
+
+"""
+SCHEMAS
+"""
+# column types used by schemas:
+#   "int" nullable integer, "float" float, "category" categorical (e.g. codes & classes), "str" string, "bool" boolean,
+#   "duration" timedelta stored as whole seconds (nullable integer)
+SCHEMAS={
+    "race_editions":{"year":"int","edition_url":"str"},
+    "races":{"race_dates":"str","race_name":"str","stage_race":"bool","race_class":"category","race_country_code":"category","cancelled":"bool","race_url":"str","tour":"category","tour_code":"int","race_key":"str","end_date":"str"},
+    "teams":{"team_name":"str","team_nationality_code":"category","team_url":"str","team_class_name":"category","team_class":"int"},
+    "team_riders":{"rider_name":"str","rider_nationality_code":"category","rider_career_points":"int","rider_age":"int","rider_url":"str"},
+    "startlist":{"bib_number":"int","rider_name":"str","rider_nationality_code":"category","team_name":"str","rider_url":"str","team_url":"str"},
+    "top_competitors":{"rider_name":"str","rider_url":"str","rider_nationality_code":"category"},
+    "competing_teams":{"team_name":"str","team_url":"str","team_nationality_code":"category"},
+    "stages":{"date":"str","stage_name":"str","start_location":"str","end_location":"str","profile":"category","distance":"float","stage_url":"str","race_url":"str"},
+    "stage_results":{"stage_pos":"int","gc_pos":"int","gc_time_diff_after":"duration","bib_number":"int","rider_age":"int","team_name":"str","rider_name":"str","rider_nationality_code":"category","uci_points":"int","points":"int","finish_time":"duration","rider_url":"str"},
+    "one_day_results":{"finish_pos":"int","bib_number":"int","rider_age":"int","team_name":"str","rider_name":"str","rider_nationality_code":"category","uci_points":"int","points":"int","finish_time":"duration","rider_url":"str"},
+    "rider_details":{"name":"str","dob":"str","nationality":"str","birth_place":"str","weight":"str","height":"str","points_classic":"int","points_gc":"int","points_tt":"int","points_sprint":"int","points_climber":"int"},
+    "rider_teams":{"year":"int","team_name":"str","team_class":"category","team_url":"str"},
+    "rider_year_results":{"date":"str","type":"category","result":"int","gc_pos":"int","race_country_code":"category","race_name":"str","race_class":"category","stage_name":"str","distance":"float","pcs_points":"int","uci_points":"int","url":"str","year":"int","rider_url":"str"}
+}
+
+# results of a season dataset (see Crawler.crawl_season) hold both stage & one day results
+SCHEMAS["results"]={**SCHEMAS["stage_results"],"finish_pos":"int","race_url":"str","stage_url":"str"}
+
+# team-year to rider links of a rider dataset (see Crawler.crawl_riders)
+SCHEMAS["memberships"]={"team_url":"str","year":"int","rider_url":"str"}
+
+def convert_column(series:pd.Series,column_type:str) -> pd.Series:
+    """
+    SUMMARY
+    convert column to a schema type (values which can't be converted become missing)
+    USED by Export.apply_schema
+
+    PARAMETERS
+    series (pandas.Series): column to convert
+    column_type (str): type in ["int","float","category","str","bool","duration"]
+
+    OUTPUT
+    pandas.Series: converted column
+    """
+    if (column_type=="int"): return pd.to_numeric(series,errors="coerce").round().astype("Int64")
+    if (column_type=="float"): return pd.to_numeric(series,errors="coerce").astype("float64")
+    if (column_type=="category"): return series.astype("category")
+    if (column_type=="str"): return series.map(lambda value:value if (pd.isna(value)) else str(value)).astype("object")
+    if (column_type=="bool"): return series.fillna(False).astype("bool")
+    if (column_type=="duration"):
+        if (pd.api.types.is_numeric_dtype(series)): return series.round().astype("Int64") # already seconds
+        return pd.to_timedelta(series).dt.total_seconds().round().astype("Int64")
+
+    raise ValueError("Unknown column type {}".format(column_type))
+
+def apply_schema(df:pd.DataFrame,schema:{str:str}) -> pd.DataFrame:
+    """
+    SUMMARY
+    give a scraped table a stable schema: columns in schema's order & typed (missing columns are added as missing values).
+    columns not in schema are kept after schema's columns
+    E.G. apply_schema(Scraper.scrape_rider_all_results(url),SCHEMAS["rider_year_results"])
+
+    PARAMETERS
+    df (pandas.DataFrame): scraped table
+    schema ({str:str}): type of each column (see Export.SCHEMAS)
+
+    OUTPUT
+    pandas.DataFrame: typed table
+    """
+    columns={}
+    for column,column_type in schema.items():
+        series=df[column] if (column in df.columns) else pd.Series([None]*len(df),index=df.index,dtype="object")
+        columns[column]=convert_column(series,column_type)
+
+    for column in df.columns:
+        if (column not in schema): columns[column]=df[column]
+
+    return pd.DataFrame(columns,index=df.index).reset_index(drop=True)
+
+"""
+PARQUET
+"""
+
+def get_arrow_type(column_type:str):
+    # arrow type each schema type is stored as
+    if (column_type in ["int","duration"]): return pyarrow.int64()
+    if (column_type=="float"): return pyarrow.float64()
+    if (column_type=="category"): return pyarrow.dictionary(pyarrow.int32(),pyarrow.string())
+    if (column_type=="str"): return pyarrow.string()
+    if (column_type=="bool"): return pyarrow.bool_()
+
+    raise ValueError("Unknown column type {}".format(column_type))
+
+def to_arrow_table(df:pd.DataFrame,schema:{str:str}):
+    """
+    SUMMARY
+    convert scraped table to an arrow table, with schema's types (so every file written for a schema has the same types)
+
+    PARAMETERS
+    df (pandas.DataFrame): scraped table
+    schema ({str:str}): type of each column (see Export.SCHEMAS)
+
+    OUTPUT
+    pyarrow.Table: typed table
+    """
+    if (pyarrow is None): raise ImportError("writing parquet requires pyarrow")
+
+    df=apply_schema(df,schema)
+
+    fields=[]
+    for field in pyarrow.Schema.from_pandas(df,preserve_index=False):
+        if (field.name in schema): field=pyarrow.field(field.name,get_arrow_type(schema[field.name]))
+        fields.append(field)
+
+    return pyarrow.Table.from_pandas(df,schema=pyarrow.schema(fields),preserve_index=False)
+
+def write_parquet(df:pd.DataFrame,path:str,schema:{str:str},partition_cols=None,file_name="part-0") -> [str]:
+    """
+    SUMMARY
+    write scraped table to a parquet dataset, partitioned into directories by value of `partition_cols` (e.g. `path/year=2020/race_key=tour-de-france/part-0.parquet`).
+    each partition's file is replaced, so writing the same data again doesn't duplicate it
+    E.G. write_parquet(results,"pcs_parquet/results",SCHEMAS["results"],["year","race_key"])
+
+    PARAMETERS
+    df (pandas.DataFrame): scraped table
+    path (str): directory of dataset
+    schema ({str:str}): type of each column (see Export.SCHEMAS)
+    partition_cols (list(str)): columns to partition by (default=None, not partitioned)
+    file_name (str): name of file written in each partition (default="part-0")
+
+    OUTPUT
+    list(str): paths of files written
+    """
+    if (pyarrow is None): raise ImportError("writing parquet requires pyarrow")
+    if (partition_cols is None): partition_cols=[]
+
+    if (len(partition_cols)==0): groups=[((),df)]
+    else: groups=df.groupby(partition_cols,sort=False)
+
+    paths=[]
+    for values,partition in groups:
+        if (not isinstance(values,tuple)): values=(values,)
+        partition_dir=os.path.join(path,*["{}={}".format(column,value) for column,value in zip(partition_cols,values)])
+        os.makedirs(partition_dir,exist_ok=True)
+
+        # partition values are kept in directory names only
+        table=to_arrow_table(partition.drop(columns=partition_cols),{column:column_type for column,column_type in schema.items() if (column not in partition_cols)})
+        file_path=os.path.join(partition_dir,file_name+".parquet")
+        pyarrow.parquet.write_table(table,file_path+".tmp")
+        os.replace(file_path+".tmp",file_path)
+        paths.append(file_path)
+
+    return paths
+
+"""
+DATASET EXPORT
+"""
+
+def export_season(year=2020,output_dir="pcs_data",parquet_dir="pcs_parquet") -> [str]:
+    """
+    SUMMARY
+    write season dataset crawled by Crawler.crawl_season to parquet datasets in `parquet_dir`:
+        "races" partitioned by year
+        "stages" & "results" partitioned by year & race
+    E.G. export_season(2020,"pcs_data","pcs_parquet")
+
+    PARAMETERS
+    year (int): season to export (default=2020)
+    output_dir (str): directory season was crawled to (default="pcs_data")
+    parquet_dir (str): directory to write parquet datasets to (default="pcs_parquet")
+
+    OUTPUT
+    list(str): paths of files written
+    """
+    season_dir=os.path.join(output_dir,str(year))
+
+    races=Crawler.read_csv(os.path.join(season_dir,"races.csv"),Scraper.RACES_DTYPES)
+    races["year"]=year
+    paths=write_parquet(races,os.path.join(parquet_dir,"races"),SCHEMAS["races"],["year"])
+
+    for race in races.to_dict("records"):
+        stages_path=os.path.join(season_dir,"stages",race["race_key"]+".csv")
+        if (os.path.exists(stages_path)):
+            stages=Crawler.read_csv(stages_path,Scraper.STAGES_DTYPES)
+            stages["year"]=year
+            stages["race_key"]=race["race_key"]
+            paths+=write_parquet(stages,os.path.join(parquet_dir,"stages"),SCHEMAS["stages"],["year","race_key"])
+
+        results_path=Crawler.get_results_path(season_dir,race["race_key"])
+        if (os.path.exists(results_path)):
+            results=Crawler.read_csv(results_path,Scraper.STAGE_RESULTS_DTYPES if (race["stage_race"]) else Scraper.ONE_DAY_RESULTS_DTYPES)
+            results["year"]=year
+            results["race_key"]=race["race_key"]
+            paths+=write_parquet(results,os.path.join(parquet_dir,"results"),SCHEMAS["results"],["year","race_key"])
+
+    return paths
+
+def export_riders(output_dir="pcs_data",parquet_dir="pcs_parquet") -> [str]:
+    """
+    SUMMARY
+    write rider results crawled by Crawler.crawl_riders to a parquet dataset "rider_results" in `parquet_dir`, partitioned by year
+    (one file per rider in each year)
+    E.G. export_riders("pcs_data","pcs_parquet")
+
+    PARAMETERS
+    output_dir (str): directory riders were crawled to (default="pcs_data")
+    parquet_dir (str): directory to write parquet dataset to (default="pcs_parquet")
+
+    OUTPUT
+    list(str): paths of files written
+    """
+    paths=[]
+    for results_path in sorted(glob.glob(os.path.join(output_dir,"riders","*.csv"))):
+        results=Crawler.read_csv(results_path,Scraper.RIDER_YEAR_RESULTS_DTYPES)
+        if (len(results)==0): continue
+
+        rider_key=os.path.splitext(os.path.basename(results_path))[0]
+        paths+=write_parquet(results,os.path.join(parquet_dir,"rider_results"),SCHEMAS["rider_year_results"],["year"],file_name=rider_key)
+
+    return paths
@@ -0,0 +1,891 @@
+from requests_html import HTMLSession
+from requests.adapters import HTTPAdapter
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+import pyppeteer.errors
+import pyppeteer
+import threading
+import asyncio
+import weakref
+import atexit
+import hashlib
+import sqlite3
+import gzip
+import time
+import os
+import re
+
+try: import aiohttp
+except ImportError: aiohttp=None # only needed by AsyncFetcher
+
+"""
+RATE LIMITING
+"""
+
+class RateLimiter:
+    """
+    SUMMARY
+    token bucket limiting how often requests are sent, shared by threads & asyncio tasks.
+    callers reserve a token & wait until it is due, so requests are sent in the order they asked for one
+    USED by Fetcher.Fetcher & Fetcher.AsyncFetcher
+
+    PARAMETERS
+    rate (float): requests allowed per second (default=4)
+    burst (int): requests which can be sent at once after a quiet period (default=8)
+    """
+
+    def __init__(self,rate=4,burst=8):
+        self.rate=rate
+        self.burst=burst
+
+        self.lock=threading.Lock()
+        self.tokens=burst
+        self.updated=time.monotonic() # time tokens were last counted (later than now while paused)
+
+    def _reserve(self) -> float:
+        # take a token, returning seconds until it can be used
+        with self.lock:
+            now=time.monotonic()
+            if (now>self.updated):
+                self.tokens=min(self.burst,self.tokens+(now-self.updated)*self.rate)
+                self.updated=now
+
+            self.tokens-=1 # negative while tokens are owed
+            return (self.updated-now)+max(0,-self.tokens/self.rate)
+
+    def acquire(self):
+        """
+        SUMMARY
+        block until a request can be sent
+        """
+        time.sleep(self._reserve())
+
+    async def async_acquire(self):
+        """
+        SUMMARY
+        wait (without blocking event loop) until a request can be sent
+        """
+        await asyncio.sleep(self._reserve())
+
+    def pause(self,seconds:float):
+        """
+        SUMMARY
+        stop all requests for a number of seconds (e.g. after server asks to slow down)
+
+        PARAMETERS
+        seconds (float): seconds to pause for
+        """
+        with self.lock:
+            now=time.monotonic()
+            if (now>self.updated):
+                self.tokens=min(self.burst,self.tokens+(now-self.updated)*self.rate)
+            self.updated=max(self.updated,now+seconds)
+            self.tokens=min(self.tokens,0) # no burst once pause is over
+
+# status codes on which server is asked to slow down
+THROTTLE_STATUS_CODES=[429,503]
+
+class StatusError(IOError):
+    """
+    SUMMARY
+    raised when server responds to a fetch or render with an error status (e.g. 404, or 429/503 once retries are used up),
+    so error pages are never parsed, rendered, cached or archived
+
+    PARAMETERS
+    url (str): url of page
+    status (int): status code of response
+    """
+
+    def __init__(self,url:str,status:int):
+        super().__init__("{} responded with status {}".format(url,status))
+        self.url=url
+        self.status=status
+
+def retry_after_seconds(retry_after:str,default:float) -> float:
+    """
+    SUMMARY
+    get seconds to wait from a Retry-After header (either seconds or a HTTP date)
+
+    PARAMETERS
+    retry_after (str): value of header (`None` if header was missing)
+    default (float): seconds to wait if header is missing or invalid
+
+    OUTPUT
+    float: seconds to wait
+    """
+    if (retry_after is None): return default
+
+    try: return max(0,float(retry_after))
+    except ValueError: pass
+
+    try: return max(0,(parsedate_to_datetime(retry_after)-datetime.now(timezone.utc)).total_seconds())
+    except (TypeError,ValueError): return default
+
+# rate limiter shared by all fetchers
+_rate_limiter=None
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    SUMMARY
+    get rate limiter shared by all fetchers (created on first use)
+
+    OUTPUT
+    Fetcher.RateLimiter: shared rate limiter
+    """
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if (_rate_limiter is None): _rate_limiter=RateLimiter()
+    return _rate_limiter
+
+def set_rate_limiter(limiter:RateLimiter) -> RateLimiter:
+    """
+    SUMMARY
+    replace rate limiter shared by all fetchers
+    E.G. set_rate_limiter(RateLimiter(rate=1,burst=2))
+
+    PARAMETERS
+    limiter (Fetcher.RateLimiter): rate limiter to use from now on
+
+    OUTPUT
+    Fetcher.RateLimiter: previous rate limiter (`None` if one had not been created)
+    """
+    global _rate_limiter
+    previous=_rate_limiter
+    _rate_limiter=limiter
+    return previous
+
+_rate_limiter_lock=threading.Lock()
+
+"""
+CACHE
+"""
+
+# seconds a cached page stays fresh, by url class (first match is used, `None` never expires)
+CACHE_TTLS=[
+    (r"/startlist/?$",3600), # changes up to the start of a race
+    (r"/rider/[^/]+/?$",24*3600), # rider overview, changes with each result
+    (r".*",6*3600)
+]
+
+SEASON_PATTERN=re.compile(r"(?:/|year=|-)((?:19|20)[0-9]{2})(?:/|&|$)")
+
+def cache_ttl(url:str,fetched_at:float) -> float:
+    """
+    SUMMARY
+    get number of seconds a cached page stays fresh for.
+    pages for a season which was already over when they were fetched never expire, otherwise first match in `CACHE_TTLS` is used
+    (a page fetched during its season is incomplete, so it keeps expiring after the season is over until it is fetched again)
+    USED by Fetcher.DiskCache
+
+    PARAMETERS
+    url (str): url of page
+    fetched_at (float): unix time page was fetched at
+
+    OUTPUT
+    float: seconds page stays fresh for (`None` if page never expires, `0` if it must always be revalidated)
+    """
+    # results from finished seasons do not change
+    year=SEASON_PATTERN.search(url)
+    if (year is not None) and (int(year.group(1))<datetime.fromtimestamp(fetched_at).year): return None
+
+    for pattern,ttl in CACHE_TTLS:
+        if (re.search(pattern,url) is not None): return ttl
+
+    return 0
+
+class DiskCache:
+    """
+    SUMMARY
+    persistent, content-addressed cache of fetched pages.
+    bodies are stored (gzipped) under the sha256 of their content, with an sqlite index from url to body & validators (ETag/Last-Modified).
+    least recently used entries are evicted once the cache exceeds `max_bytes`
+    USED by Fetcher.Fetcher
+
+    PARAMETERS
+    path (str): directory to store cache in (default="pcs_cache")
+    max_bytes (int): maximum size of stored bodies, in bytes (default=2GB)
+    ttl (function): function from url & unix time entry was fetched at to seconds entry stays fresh for (`None` to never expire) (default=Fetcher.cache_ttl)
+    """
+
+    def __init__(self,path="pcs_cache",max_bytes=2*1024**3,ttl=cache_ttl):
+        self.path=path
+        self.max_bytes=max_bytes
+        self.ttl=ttl
+
+        os.makedirs(os.path.join(path,"objects"),exist_ok=True)
+
+        # index is shared between threads, so access is serialised
+        self.lock=threading.Lock()
+        self.connection=sqlite3.connect(os.path.join(path,"index.sqlite"),check_same_thread=False)
+        with self.connection:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS entries (url TEXT PRIMARY KEY, digest TEXT, etag TEXT, last_modified TEXT, fetched_at REAL, accessed_at REAL, size INTEGER)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)")
+
+    def _object_path(self,digest:str) -> str:
+        return os.path.join(self.path,"objects",digest[:2],digest)
+
+    def get(self,url:str) -> dict:
+        """
+        SUMMARY
+        get cached entry for a url (marking it as recently used)
+
+        PARAMETERS
+        url (str): url of page
+
+        OUTPUT
+        dict: entry includes (`None` if url is not cached)
+                "body" (str) cached html
+                "etag" (str) ETag header of cached response
+                "last_modified" (str) Last-Modified header of cached response
+                "fresh" (bool) whether entry can be used without revalidating it
+        """
+        with self.lock:
+            row=self.connection.execute("SELECT digest,etag,last_modified,fetched_at FROM entries WHERE url=?",(url,)).fetchone()
+            if (row is None): return None
+
+            digest,etag,last_modified,fetched_at=row
+            try:
+                with gzip.open(self._object_path(digest),"rt",encoding="utf-8") as f: body=f.read()
+            except OSError: # body lost, treat as uncached
+                with self.connection: self.connection.execute("DELETE FROM entries WHERE url=?",(url,))
+                return None
+
+            with self.connection: self.connection.execute("UPDATE entries SET accessed_at=? WHERE url=?",(time.time(),url))
+
+        ttl=self.ttl(url,fetched_at)
+        fresh=(ttl is None) or (time.time()-fetched_at<ttl)
+
+        return {"body":body,"etag":etag,"last_modified":last_modified,"fresh":fresh}
+
+    def put(self,url:str,body:str,etag=None,last_modified=None):
+        """
+        SUMMARY
+        store page in cache (evicting least recently used entries if cache is full)
+
+        PARAMETERS
+        url (str): url of page
+        body (str): html of page
+        etag (str): ETag header of response (default=None)
+        last_modified (str): Last-Modified header of response (default=None)
+        """
+        data=body.encode("utf-8")
+        digest=hashlib.sha256(data).hexdigest()
+        object_path=self._object_path(digest)
+
+        with self.lock:
+            # identical bodies are only stored once
+            if (not os.path.exists(object_path)):
+                os.makedirs(os.path.dirname(object_path),exist_ok=True)
+                with gzip.open(object_path+".tmp","wb") as f: f.write(data)
+                os.replace(object_path+".tmp",object_path)
+
+            now=time.time()
+            with self.connection:
+                previous=self.connection.execute("SELECT digest FROM entries WHERE url=?",(url,)).fetchone()
+                self.connection.execute("INSERT OR REPLACE INTO entries VALUES (?,?,?,?,?,?,?)",(url,digest,etag,last_modified,now,now,os.path.getsize(object_path)))
+            if (previous is not None) and (previous[0]!=digest): self._remove_object(previous[0])
+
+            self._evict()
+
+    def touch(self,url:str):
+        """
+        SUMMARY
+        mark cached entry as fresh (after server confirmed it is unchanged)
+
+        PARAMETERS
+        url (str): url of page
+        """
+        with self.lock, self.connection:
+            now=time.time()
+            self.connection.execute("UPDATE entries SET fetched_at=?, accessed_at=? WHERE url=?",(now,now,url))
+
+    def _remove_object(self,digest:str):
+        # only remove body once no url refers to it
+        if (self.connection.execute("SELECT 1 FROM entries WHERE digest=?",(digest,)).fetchone() is None):
+            try: os.remove(self._object_path(digest))
+            except OSError: pass
+
+    def _evict(self):
+        total=self.connection.execute("SELECT COALESCE(SUM(size),0) FROM entries").fetchone()[0]
+        while (total>self.max_bytes):
+            url,digest,size=self.connection.execute("SELECT url,digest,size FROM entries ORDER BY accessed_at LIMIT 1").fetchone()
+            with self.connection: self.connection.execute("DELETE FROM entries WHERE url=?",(url,))
+            self._remove_object(digest)
+            total-=size
+
+"""
+RENDERING
+"""
+
+class BrowserPool:
+    """
+    SUMMARY
+    long lived headless browser with a pool of reusable tabs, rendering up to `max_tabs` pages at once.
+    the browser is launched on first use & driven by an event loop in its own thread, so it can be used from any worker thread
+    (or event loop). tabs which time out or crash are closed & replaced, & the browser is relaunched if it dies
+    USED by Fetcher.Fetcher & Fetcher.AsyncFetcher
+
+    PARAMETERS
+    max_tabs (int): maximum number of pages rendered at once (default=4)
+    timeout (float): seconds to wait for a page to render (default=30)
+    retries (int): number of retries when rendering fails (each on a fresh tab) or server responds with 429/503 (default=2)
+    backoff (float): seconds to wait after first 429/503 without a Retry-After header, doubling on each retry (default=1)
+    browser_args (list(str)): command line arguments for chromium (default=None, ["--no-sandbox"])
+    """
+
+    def __init__(self,max_tabs=4,timeout=30,retries=2,backoff=1,browser_args=None):
+        self.max_tabs=max_tabs
+        self.timeout=timeout
+        self.retries=retries
+        self.backoff=backoff
+        self.browser_args=browser_args if (browser_args is not None) else ["--no-sandbox"]
+
+        self.lock=threading.Lock()
+        self.loop=None # started on first use
+        self.thread=None
+
+        # only used from browser's event loop
+        self.browser=None
+        self.idle_tabs=[]
+        self.semaphore=None
+        self.counts={"renders":0,"launches":0,"recycled_tabs":0,"timeouts":0}
+
+    def _start(self):
+        with self.lock:
+            if (self.loop is None):
+                self.loop=asyncio.new_event_loop()
+                self.thread=threading.Thread(target=self.loop.run_forever,name="BrowserPool",daemon=True)
+                self.thread.start()
+                atexit.register(self.close)
+
+    def _submit(self,coroutine):
+        # run coroutine on browser's event loop
+        self._start()
+        return asyncio.run_coroutine_threadsafe(coroutine,self.loop)
+
+    async def _get_browser(self):
+        # launch browser (again, if it died)
+        process=getattr(self.browser,"process",None)
+        if (self.browser is not None) and (process is not None) and (process.poll() is not None): self.browser=None
+
+        if (self.browser is None):
+            self.idle_tabs=[]
+            self.browser=await pyppeteer.launch(headless=True,args=self.browser_args,handleSIGINT=False,handleSIGTERM=False,handleSIGHUP=False,autoClose=False)
+            self.counts["launches"]+=1
+
+        return self.browser
+
+    async def _recycle_tab(self,tab):
+        # close a tab which timed out or crashed (a fresh tab replaces it)
+        self.counts["recycled_tabs"]+=1
+        try: await asyncio.wait_for(tab.close(),self.timeout)
+        except Exception: pass # tab or browser already gone
+
+    async def _render(self,url:str,limiter:RateLimiter) -> str:
+        if (self.semaphore is None): self.semaphore=asyncio.Semaphore(self.max_tabs)
+
+        async with self.semaphore:
+            for attempt in range(self.retries+1):
+                browser=await self._get_browser()
+                tab=self.idle_tabs.pop() if (len(self.idle_tabs)>0) else await browser.newPage()
+
+                # every navigation downloads the page again, so it waits for the rate limiter like any other request
+                await limiter.async_acquire()
+                try:
+                    response=await asyncio.wait_for(tab.goto(url,options={"timeout":int(self.timeout*1000)}),self.timeout)
+                    html=await asyncio.wait_for(tab.content(),self.timeout)
+                except Exception as e:
+                    if (isinstance(e,(asyncio.TimeoutError,pyppeteer.errors.TimeoutError))): self.counts["timeouts"]+=1
+                    await self._recycle_tab(tab)
+                    if (attempt==self.retries): raise
+                    continue
+
+                self.idle_tabs.append(tab)
+                status=response.status if (response is not None) else 200
+                if (status==200):
+                    self.counts["renders"]+=1
+                    return html
+
+                # error pages are never returned, server asking to slow down pauses all requests before retrying
+                if (status not in THROTTLE_STATUS_CODES) or (attempt==self.retries): raise StatusError(url,status)
+                limiter.pause(retry_after_seconds(response.headers.get("retry-after"),self.backoff*2**attempt))
+
+    def render(self,url:str,html=None,limiter=None) -> str:
+        """
+        SUMMARY
+        render a page's javascript in a free tab (waiting for one if all are busy), waiting for the rate limiter before loading it
+
+        PARAMETERS
+        url (str): url of page
+        html (str): html of page as served (default=None, unused as page is loaded from `url`)
+        limiter (Fetcher.RateLimiter): rate limiter page is loaded through (default=None, uses shared rate limiter)
+
+        OUTPUT
+        str: html of rendered page
+        """
+        if (limiter is None): limiter=get_rate_limiter()
+        return self._submit(self._render(url,limiter)).result()
+
+    async def async_render(self,url:str,html=None,limiter=None) -> str:
+        """
+        SUMMARY
+        async version of Fetcher.BrowserPool.render, for use from any event loop
+        """
+        if (limiter is None): limiter=get_rate_limiter()
+        return await asyncio.wrap_future(self._submit(self._render(url,limiter)))
+
+    def stats(self) -> dict:
+        """
+        SUMMARY
+        get usage of pool
+
+        OUTPUT
+        dict: stats include
+                "renders" (int) pages rendered
+                "launches" (int) times browser was launched
+                "recycled_tabs" (int) tabs closed after timing out or crashing
+                "timeouts" (int) renders which timed out
+                "tabs" (int) idle tabs kept open
+        """
+        return {**self.counts,"tabs":len(self.idle_tabs)}
+
+    async def _close_browser(self):
+        if (self.browser is not None):
+            try: await asyncio.wait_for(self.browser.close(),self.timeout)
+            except Exception: pass # browser already gone
+        self.browser=None
+        self.idle_tabs=[]
+
+    def close(self):
+        """
+        SUMMARY
+        close browser & stop its event loop (a later render starts them again)
+        """
+        with self.lock:
+            loop,thread=self.loop,self.thread
+            self.loop=None
+            self.thread=None
+        if (loop is None): return
+
+        asyncio.run_coroutine_threadsafe(self._close_browser(),loop).result()
+        self.semaphore=None
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+        atexit.unregister(self.close)
+
+# browser pool shared by all fetchers
+_browser_pool=None
+_browser_pool_lock=threading.Lock()
+
+def get_browser_pool() -> BrowserPool:
+    """
+    SUMMARY
+    get browser pool shared by all fetchers (created on first use, browser is launched on first render)
+
+    OUTPUT
+    Fetcher.BrowserPool: shared browser pool
+    """
+    global _browser_pool
+    with _browser_pool_lock:
+        if (_browser_pool is None): _browser_pool=BrowserPool()
+    return _browser_pool
+
+def set_browser_pool(pool:BrowserPool) -> BrowserPool:
+    """
+    SUMMARY
+    replace browser pool shared by all fetchers (e.g. to render more pages at once)
+    E.G. set_browser_pool(BrowserPool(max_tabs=8,timeout=20))
+
+    PARAMETERS
+    pool (Fetcher.BrowserPool): browser pool to use from now on
+
+    OUTPUT
+    Fetcher.BrowserPool: previous browser pool (`None` if one had not been created)
+    """
+    global _browser_pool
+    previous=_browser_pool
+    _browser_pool=pool
+    return previous
+
+"""
+FETCHER
+"""
+
+class Fetcher:
+    """
+    SUMMARY
+    fetches pages through a single persistent session, so connections (and TLS handshakes) are reused across scrapes
+    USED by every Scraper.scrape_* & Scraper.get_* function (via Scraper.fetch_soup)
+
+    PARAMETERS
+    pool_connections (int): number of per-host connection pools to keep (default=4)
+    pool_maxsize (int): number of keep-alive connections kept per host (default=16)
+    max_retries (int): number of retries on failed connections (default=3)
+    timeout (float): seconds to wait for a response (default=30)
+    cache (Fetcher.DiskCache): cache to serve & store pages with (default=None, no caching)
+    limiter (Fetcher.RateLimiter): rate limiter requests are sent through (default=None, uses shared rate limiter)
+    throttle_retries (int): number of retries when server responds with 429/503 (default=5)
+    backoff (float): seconds to wait after first 429/503 without a Retry-After header, doubling on each retry (default=1)
+    archive (Archive.PageArchive): archive every fetched & rendered page is stored in, including pages served from the cache (default=None, no archiving)
+    browser (Fetcher.BrowserPool): headless browser pages are rendered in (default=None, uses shared browser pool)
+    """
+
+    def __init__(self,pool_connections=4,pool_maxsize=16,max_retries=3,timeout=30,cache=None,limiter=None,throttle_retries=5,backoff=1,archive=None,browser=None):
+        self.timeout=timeout
+        self.cache=cache
+        self.archive=archive
+        self.limiter=limiter
+        self.throttle_retries=throttle_retries
+        self.backoff=backoff
+        self.browser=browser
+
+        # one session shared by all requests
+        self.session=HTMLSession()
+        adapter=HTTPAdapter(pool_connections=pool_connections,pool_maxsize=pool_maxsize,max_retries=max_retries)
+        self.session.mount("https://",adapter)
+        self.session.mount("http://",adapter)
+
+    def get(self,url:str,headers=None):
+        """
+        SUMMARY
+        send GET request for a url through the pooled session, waiting for the rate limiter.
+        if server asks to slow down (429/503) all requests are paused (for Retry-After, or an exponential backoff) & request is retried
+
+        PARAMETERS
+        url (str): url to fetch
+        headers (dict): extra request headers (default=None)
+
+        OUTPUT
+        requests_html.HTMLResponse: response from server
+        """
+        limiter=self.limiter if (self.limiter is not None) else get_rate_limiter()
+
+        for attempt in range(self.throttle_retries+1):
+            limiter.acquire()
+            response=self.session.get(url,headers=headers,timeout=self.timeout)
+            if (response.status_code not in THROTTLE_STATUS_CODES): break
+
+            if (attempt<self.throttle_retries):
+                limiter.pause(retry_after_seconds(response.headers.get("Retry-After"),self.backoff*2**attempt))
+
+        return response
+
+    def fetch(self,url:str) -> str:
+        """
+        SUMMARY
+        get html of a page as served, from the cache if it is fresh.
+        stale cache entries are revalidated with a conditional request.
+        raises Fetcher.StatusError if server responds with an error (e.g. 404, or 429/503 once retries are used up)
+
+        PARAMETERS
+        url (str): url to fetch
+
+        OUTPUT
+        str: html of page
+        """
+        entry=self.cache.get(url) if (self.cache is not None) else None
+        if (entry is not None) and (entry["fresh"]):
+            if (self.archive is not None): self.archive.add(url,entry["body"],if_missing=True) # e.g. cached before archive was set up
+            return entry["body"]
+
+        # revalidate stale entry
+        headers={}
+        if (entry is not None):
+            if (entry["etag"] is not None): headers["If-None-Match"]=entry["etag"]
+            if (entry["last_modified"] is not None): headers["If-Modified-Since"]=entry["last_modified"]
+
+        response=self.get(url,headers=headers)
+
+        if (entry is not None) and (response.status_code==304): # unchanged
+            self.cache.touch(url)
+            if (self.archive is not None): self.archive.add(url,entry["body"],if_missing=True)
+            return entry["body"]
+
+        if (response.status_code!=200): raise StatusError(url,response.status_code)
+
+        html=response.html.html
+        if (self.cache is not None):
+            self.cache.put(url,html,etag=response.headers.get("ETag"),last_modified=response.headers.get("Last-Modified"))
+        if (self.archive is not None): self.archive.add(url,html,response.status_code)
+
+        return html
+
+    def render(self,url:str,html:str) -> str:
+        """
+        SUMMARY
+        render a page's javascript in a headless browser (a tab of the browser pool, so pages from several threads are rendered at once).
+        page is loaded again by the browser, so it waits for the rate limiter too
+
+        PARAMETERS
+        url (str): url of page
+        html (str): html of page as served
+
+        OUTPUT
+        str: html of rendered page
+        """
+        browser=self.browser if (self.browser is not None) else get_browser_pool()
+        return browser.render(url,html,limiter=self.limiter)
+
+    def get_html(self,url:str,render=False) -> str:
+        """
+        SUMMARY
+        fetch a page, optionally rendering its javascript in a headless browser
+
+        PARAMETERS
+        url (str): url to fetch
+        render (bool): whether to render page before returning it (default=False)
+
+        OUTPUT
+        str: html of page (as served if `render=False`)
+        """
+        html=self.fetch(url)
+        if (render):
+            html=self.render(url,html)
+            if (self.archive is not None): self.archive.add(url,html,200,rendered=True)
+        return html
+
+    def close(self):
+        """
+        SUMMARY
+        close session (the browser pool is shared, so it is left open)
+        """
+        self.session.close()
+
+# fetcher shared by all scrape functions
+_fetcher=None
+_fetcher_lock=threading.Lock()
+
+def get_fetcher() -> Fetcher:
+    """
+    SUMMARY
+    get fetcher shared by all scrape functions (created on first use)
+
+    OUTPUT
+    Fetcher.Fetcher: shared fetcher
+    """
+    global _fetcher
+    with _fetcher_lock:
+        if (_fetcher is None): _fetcher=Fetcher()
+    return _fetcher
+
+def set_fetcher(fetcher:Fetcher) -> Fetcher:
+    """
+    SUMMARY
+    replace fetcher shared by all scrape functions (e.g. to resize connection pool or add a cache)
+    E.G. set_fetcher(Fetcher(pool_maxsize=32,cache=DiskCache("pcs_cache")))
+
+    PARAMETERS
+    fetcher (Fetcher.Fetcher): fetcher to use from now on
+
+    OUTPUT
+    Fetcher.Fetcher: previous fetcher (`None` if one had not been created)
+    """
+    global _fetcher
+    previous=_fetcher
+    _fetcher=fetcher
+    return previous
+
+"""
+ASYNC FETCHER
+"""
+
+class AsyncFetcher:
+    """
+    SUMMARY
+    asyncio counterpart of Fetcher.Fetcher, fetching pages through an aiohttp client session.
+    each event loop the fetcher is used from (e.g. each `asyncio.run`) gets its own session, closed when the loop shuts down,
+    & a semaphore capping the number of requests in flight
+    USED by every Scraper.async_* function (via Scraper.async_fetch_soup)
+
+    PARAMETERS
+    max_concurrency (int): maximum number of requests in flight at once (default=100)
+    timeout (float): seconds to wait for a response (default=30)
+    cache (Fetcher.DiskCache): cache to serve & store pages with (default=None, no caching)
+    limiter (Fetcher.RateLimiter): rate limiter requests are sent through (default=None, uses shared rate limiter)
+    throttle_retries (int): number of retries when server responds with 429/503 (default=5)
+    backoff (float): seconds to wait after first 429/503 without a Retry-After header, doubling on each retry (default=1)
+    archive (Archive.PageArchive): archive every fetched & rendered page is stored in, including pages served from the cache (default=None, no archiving)
+    browser (Fetcher.BrowserPool): headless browser pages are rendered in (default=None, uses shared browser pool)
+    """
+
+    def __init__(self,max_concurrency=100,timeout=30,cache=None,limiter=None,throttle_retries=5,backoff=1,archive=None,browser=None):
+        if (aiohttp is None): raise ImportError("AsyncFetcher requires aiohttp")
+
+        self.max_concurrency=max_concurrency
+        self.timeout=timeout
+        self.cache=cache
+        self.archive=archive
+        self.limiter=limiter
+        self.throttle_retries=throttle_retries
+        self.backoff=backoff
+        self.browser=browser
+
+        # client session & semaphore of each event loop (both are bound to the loop they are created in)
+        self.sessions=weakref.WeakKeyDictionary()
+
+    def _start(self):
+        # get session of running event loop, creating it on first use in that loop
+        loop=asyncio.get_running_loop()
+        if (loop not in self.sessions):
+            connector=aiohttp.TCPConnector(limit=self.max_concurrency)
+            session=aiohttp.ClientSession(connector=connector,timeout=aiohttp.ClientTimeout(total=self.timeout))
+            self.sessions[loop]=(session,asyncio.Semaphore(self.max_concurrency),loop.create_task(self._close_on_shutdown(session)))
+
+        return self.sessions[loop][:2]
+
+    async def _close_on_shutdown(self,session):
+        # close session once its event loop shuts down (asyncio.run cancels pending tasks before closing the loop)
+        try: await asyncio.get_running_loop().create_future()
+        finally:
+            loop=asyncio.get_running_loop()
+            if (self.sessions.get(loop,(None,))[0] is session): del self.sessions[loop]
+            await session.close()
+
+    async def get(self,url:str,headers=None) -> (int,dict,str):
+        """
+        SUMMARY
+        send GET request for a url, waiting for the rate limiter & a free slot.
+        if server asks to slow down (429/503) all requests are paused (for Retry-After, or an exponential backoff) & request is retried
+
+        PARAMETERS
+        url (str): url to fetch
+        headers (dict): extra request headers (default=None)
+
+        OUTPUT
+        int: status code of response
+        dict: headers of response
+        str: body of response (`None` if status is 304)
+        """
+        session,semaphore=self._start()
+        limiter=self.limiter if (self.limiter is not None) else get_rate_limiter()
+
+        for attempt in range(self.throttle_retries+1):
+            await limiter.async_acquire()
+            async with semaphore:
+                async with session.get(url,headers=headers) as response:
+                    status=response.status
+                    response_headers=response.headers
+                    body=await response.text() if (status!=304) else None
+            if (status not in THROTTLE_STATUS_CODES): break
+
+            if (attempt<self.throttle_retries):
+                limiter.pause(retry_after_seconds(response_headers.get("Retry-After"),self.backoff*2**attempt))
+
+        return status,response_headers,body
+
+    async def fetch(self,url:str) -> str:
+        """
+        SUMMARY
+        get html of a page as served, from the cache if it is fresh.
+        stale cache entries are revalidated with a conditional request.
+        raises Fetcher.StatusError if server responds with an error (e.g. 404, or 429/503 once retries are used up)
+
+        PARAMETERS
+        url (str): url to fetch
+
+        OUTPUT
+        str: html of page
+        """
+        entry=(await asyncio.to_thread(self.cache.get,url)) if (self.cache is not None) else None
+        if (entry is not None) and (entry["fresh"]):
+            if (self.archive is not None): await asyncio.to_thread(self.archive.add,url,entry["body"],if_missing=True) # e.g. cached before archive was set up
+            return entry["body"]
+
+        # revalidate stale entry
+        headers={}
+        if (entry is not None):
+            if (entry["etag"] is not None): headers["If-None-Match"]=entry["etag"]
+            if (entry["last_modified"] is not None): headers["If-Modified-Since"]=entry["last_modified"]
+
+        status,response_headers,html=await self.get(url,headers=headers)
+
+        if (entry is not None) and (status==304): # unchanged
+            await asyncio.to_thread(self.cache.touch,url)
+            if (self.archive is not None): await asyncio.to_thread(self.archive.add,url,entry["body"],if_missing=True)
+            return entry["body"]
+
+        if (status!=200): raise StatusError(url,status)
+
+        if (self.cache is not None):
+            await asyncio.to_thread(self.cache.put,url,html,response_headers.get("ETag"),response_headers.get("Last-Modified"))
+        if (self.archive is not None): await asyncio.to_thread(self.archive.add,url,html,status)
+
+        return html
+
+    async def render(self,url:str,html:str) -> str:
+        """
+        SUMMARY
+        render a page's javascript in a headless browser (a tab of the browser pool, without blocking the event loop).
+        page is loaded again by the browser, so it waits for the rate limiter too
+
+        PARAMETERS
+        url (str): url of page
+        html (str): html of page as served
+
+        OUTPUT
+        str: html of rendered page
+        """
+        browser=self.browser if (self.browser is not None) else get_browser_pool()
+        return await browser.async_render(url,html,limiter=self.limiter)
+
+    async def get_html(self,url:str,render=False) -> str:
+        """
+        SUMMARY
+        fetch a page, optionally rendering its javascript in a headless browser
+
+        PARAMETERS
+        url (str): url to fetch
+        render (bool): whether to render page before returning it (default=False)
+
+        OUTPUT
+        str: html of page (as served if `render=False`)
+        """
+        html=await self.fetch(url)
+        if (render):
+            html=await self.render(url,html)
+            if (self.archive is not None): await asyncio.to_thread(self.archive.add,url,html,200,True)
+        return html
+
+    async def close(self):
+        """
+        SUMMARY
+        close client session of running event loop (sessions are also closed when their event loop shuts down)
+        """
+        session,semaphore,closer=self.sessions.pop(asyncio.get_running_loop(),(None,None,None))
+        if (session is None): return
+
+        closer.cancel()
+        await session.close()
+
+# async fetcher shared by all async scrape functions
+_async_fetcher=None
+
+def get_async_fetcher() -> AsyncFetcher:
+    """
+    SUMMARY
+    get async fetcher shared by all async scrape functions (created on first use)
+
+    OUTPUT
+    Fetcher.AsyncFetcher: shared async fetcher
+    """
+    global _async_fetcher
+    if (_async_fetcher is None): _async_fetcher=AsyncFetcher()
+    return _async_fetcher
+
+def set_async_fetcher(fetcher:AsyncFetcher) -> AsyncFetcher:
+    """
+    SUMMARY
+    replace async fetcher shared by all async scrape functions
+    E.G. set_async_fetcher(AsyncFetcher(max_concurrency=200,cache=DiskCache("pcs_cache")))
+
+    PARAMETERS
+    fetcher (Fetcher.AsyncFetcher): async fetcher to use from now on
+
+    OUTPUT
+    Fetcher.AsyncFetcher: previous async fetcher (`None` if one had not been created)
+    """
+    global _async_fetcher
+    previous=_async_fetcher
+    _async_fetcher=fetcher
+    return previous
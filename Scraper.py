@@ -1,41 +1,595 @@
-from bs4 import BeautifulSoup
-from requests_html import HTMLSession # to remove
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree, html as lxml_html
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque, OrderedDict
+from itertools import islice
+import functools
+import threading
+import inspect
+import asyncio
+import copy
+import time
 from datetime import timedelta
 import pandas as pd
 import numpy as np
 import re
 
+from Fetcher import get_fetcher, get_async_fetcher
+
 """
 UTILITY
 """
-# parse finish time string
+# element each page type must contain to be parsed (used to detect when rendering is needed)
+PAGE_TYPES={
+    "race_editions":("div",{"class":"editions"}),
+    "tours":("select",{"name":"circuit"}),
+    "races":("div",{"class":"tableCont"}),
+    "teams":("div",{"class":"statDivLeft"}),
+    "team":("ul",{"class":"riderlist"}),
+    "startlist":("li",{"class":"team"}),
+    "race_information":("div",{"class":"res-right"}),
+    "stage_race_overview":("div",{"class":"w36"}),
+    "stage_results":("table",{}),
+    "one_day_results":("table",{}),
+    "rider":("div",{"class":"rdr-info-cont"}),
+    "rider_year":("table",{"class":"rdrResults"})
+}
+
+# page types which are always rendered (all others are only rendered if their expected element is missing)
+RENDER_PAGE_TYPES=set()
+
+# elements each page type's parsers use. only these parts of a page are built into a soup
+PARSE_ONLY={
+    "race_editions":[("div",{"class":"editions"})],
+    "tours":[("select",{"name":"circuit"})],
+    "races":[("div",{"class":"tableCont"})],
+    "teams":[("div",{"class":"statDivLeft"})],
+    "team":[("ul",{"class":"riderlist"})],
+    "startlist":[("li",{"class":"team"})],
+    "race_information":[("div",{"class":"res-right"})],
+    "stage_race_overview":[("div",{"class":"res-right"}),("div",{"class":"w48"}),("div",{"class":"w36"})],
+    "stage_results":[("table",{})],
+    "one_day_results":[("table",{})],
+    "rider":[("h1",{}),("div",{"class":"rdr-info-cont"}),("ul",{"class":"rdr-teams"}),("ul",{"class":"rdrSeasonNav"})],
+    "rider_year":[("table",{"class":"rdrResults"})]
+}
+
+def build_parse_only_xpath(elements:[(str,dict)]) -> etree.XPath:
+    """
+    SUMMARY
+    build xpath matching any of a list of elements (in document order)
+    USED by Scraper.parse_page
+
+    PARAMETERS
+    elements (list((str,dict))): tag name & attributes of each element (a "class" attribute matches any element with that class)
+
+    OUTPUT
+    lxml.etree.XPath: compiled xpath
+    """
+    paths=[]
+    for name,attrs in elements:
+        conditions=""
+        for attr,value in attrs.items():
+            if (attr=="class"): conditions+="[contains(concat(' ',normalize-space(@class),' '),' {} ')]".format(value)
+            else: conditions+="[@{}='{}']".format(attr,value)
+        paths.append("//"+name+conditions)
+
+    return etree.XPath(" | ".join(paths))
+
+PARSE_ONLY_XPATHS={}
+
+def parse_page(html:str,page_type=None) -> BeautifulSoup:
+    """
+    SUMMARY
+    parse html of a page into a soup.
+    page is parsed with lxml, & only the parts its parsers use (see `PARSE_ONLY`) are built into a soup, which is much cheaper than building a soup of the whole page
+    USED by Scraper.fetch_soup & Scraper.async_fetch_soup
+
+    PARAMETERS
+    html (str): html of page
+    page_type (str): key of `PARSE_ONLY` for page (default=None, whole page is parsed)
+
+    OUTPUT
+    bs4.BeautifulSoup: parsed page (or parts of it)
+    """
+    if (page_type not in PARSE_ONLY): return BeautifulSoup(html,"lxml")
+
+    try: tree=lxml_html.document_fromstring(html)
+    except (etree.ParserError,ValueError): return BeautifulSoup(html,"lxml") # empty page or encoding declaration
+
+    if (page_type not in PARSE_ONLY_XPATHS): PARSE_ONLY_XPATHS[page_type]=build_parse_only_xpath(PARSE_ONLY[page_type])
+
+    # keep outermost matching elements (their descendants come with them)
+    kept=set()
+    fragments=[]
+    for element in PARSE_ONLY_XPATHS[page_type](tree):
+        if (any(ancestor in kept for ancestor in element.iterancestors())): continue
+        kept.add(element)
+        fragments.append(lxml_html.tostring(element,encoding="unicode",with_tail=False))
+
+    return BeautifulSoup("".join(fragments),"lxml")
+
+# fetch page & parse it
+def fetch_soup(url:str,page_type=None) -> BeautifulSoup:
+    """
+    SUMMARY
+    fetch a page through the shared fetcher & parse the parts of it used by its page type (see Scraper.parse_page).
+    page is parsed as served, unless `page_type` is in `RENDER_PAGE_TYPES` or its expected element (see `PAGE_TYPES`) is missing, in which case it is rendered
+    USED by every scrape_* & get_* function
+
+    PARAMETERS
+    url (str): url of page to fetch
+    page_type (str): key of `PAGE_TYPES` for page (default=None, never render)
+
+    OUTPUT
+    bs4.BeautifulSoup: parsed page
+    """
+    fetcher=get_fetcher()
+
+    render=(page_type in RENDER_PAGE_TYPES)
+    soup=parse_page(fetcher.get_html(url,render=render),page_type)
+
+    # fall back to rendering if page is incomplete
+    if (not render) and (page_type in PAGE_TYPES):
+        name,attrs=PAGE_TYPES[page_type]
+        if (soup.find(name,attrs) is None): soup=parse_page(fetcher.get_html(url,render=True),page_type)
+
+    return soup
+
+# number of pages fetched at once by functions which fetch several pages (kept low to be polite to PCS)
+MAX_WORKERS=4
+
+def iter_concurrent(function,items,max_workers=None):
+    """
+    SUMMARY
+    lazily apply a function (which fetches a page) to each item, using a bounded pool of worker threads.
+    only a few calls are started ahead of the result being consumed, so memory stays bounded however many items there are
+
+    PARAMETERS
+    function (function): function to apply
+    items (iterable): items to apply function to
+    max_workers (int): maximum number of calls in flight at once (default=None, uses `MAX_WORKERS`)
+
+    OUTPUT
+    generator: results of function, in same order as `items`
+    """
+    if (max_workers is None): max_workers=MAX_WORKERS
+    items=iter(items)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending=deque(executor.submit(function,item) for item in islice(items,2*max_workers))
+        try:
+            while (len(pending)>0):
+                result=pending.popleft().result()
+                pending.extend(executor.submit(function,item) for item in islice(items,1)) # keep workers busy
+                yield result
+        finally:
+            for future in pending: future.cancel() # consumer stopped early
+
+# build data frame from parsed rows
+def build_data_frame(rows:[dict],dtypes:{str:str},converters=None) -> pd.DataFrame:
+    """
+    SUMMARY
+    build a data frame in one go from parsed rows, collecting each column into a list first
+    USED by every scrape_* function which returns a data frame
+
+    PARAMETERS
+    rows (list(dict)): parsed rows, from column name to value (missing columns are filled with `np.nan`)
+    dtypes ({str:str}): columns of data frame (in order) to their types
+    converters ({str:function}): functions converting a whole column at once (e.g. Scraper.parse_finish_times), by column (default=None)
+
+    OUTPUT
+    pandas.DataFrame: data frame with one row per parsed row
+    """
+    columns={column:[row.get(column,np.nan) for row in rows] for column in dtypes}
+    for column,converter in (converters or {}).items(): columns[column]=converter(columns[column])
+
+    return pd.DataFrame(columns,columns=list(dtypes)).astype(dtypes)
+
+# markers used in place of a time when rider finished in same time as rider above
+SAME_TIME_MARKERS=[",,","„","s.t.","st"]
+TIME_PATTERN=re.compile(r"^(?:([0-9]+):)?([0-9]+):([0-9]+)$")
+
+def parse_time_seconds(time_strs:[str]) -> np.ndarray:
+    """
+    SUMMARY
+    parse a column of finish times or time gaps ("h:mm:ss", "m:ss", "+0:12") to seconds, in one pass.
+    same time markers (see `Scraper.SAME_TIME_MARKERS`) take the time of the rider above & anything else (e.g. "-") is missing
+    (a same time marker below a missing time is missing too, rather than taking a time from further up)
+    USED by Scraper.parse_finish_times
+
+    PARAMETERS
+    time_strs (list(str)): strings to parse
+
+    OUTPUT
+    numpy.ndarray: seconds of each time (`np.nan` where missing)
+    """
+    # times repeat a lot (gaps of a group, same time markers), so only distinct strings are parsed
+    codes,uniques=pd.factorize(pd.Series(time_strs,dtype="object"))
+
+    unique_seconds=np.full(len(uniques)+1,np.nan) # last entry for missing values (code -1)
+    same_time_codes=[]
+    for code,time_str in enumerate(uniques):
+        time_str=str(time_str).strip().lstrip("+")
+        if (time_str in SAME_TIME_MARKERS): same_time_codes.append(code)
+
+        match=TIME_PATTERN.match(time_str)
+        if (match is not None):
+            hours,minutes,seconds=match.groups()
+            unique_seconds[code]=int(hours or 0)*3600+int(minutes)*60+int(seconds)
+
+    seconds=unique_seconds[codes]
+
+    # same time as rider above: each run of markers takes the time of the row just above it (`np.nan` before first row)
+    if (len(same_time_codes)>0):
+        same_time=np.isin(codes,same_time_codes)
+        times_above=np.concatenate([[np.nan],seconds[~same_time]])
+        seconds=np.where(same_time,times_above[np.cumsum(~same_time)],seconds)
+
+    return seconds
+
+def parse_finish_times(time_strs:[str]) -> pd.Series:
+    """
+    SUMMARY
+    parse a column of finish times or time gaps to timedeltas, in one pass (see Scraper.parse_time_seconds)
+    USED by Scraper.parse_stage_race_stage_results & Scraper.parse_one_day_results
+
+    PARAMETERS
+    time_strs (list(str)): strings to parse
+
+    OUTPUT
+    pandas.Series: parsed times, as timedelta64 (`NaT` where missing)
+    """
+    # converted from nullable integers, as casting `np.nan` seconds to timedeltas warns
+    return pd.Series(pd.to_timedelta(pd.array(parse_time_seconds(time_strs),dtype="Int64"),unit="s"))
+
 def parse_finish_time(time_str:str) -> timedelta:
     """
     SUMMARY
-    parse string of finish times to a datetime.timedelta
+    parse a single finish time string ("h:mm:ss", "m:ss", "+0:12") to a datetime.timedelta
 
     PARAMETERS
     time_str (str): string to parse
 
     OUTPUT
-    datetime.timedelta: parsed timedelta
+    datetime.timedelta: parsed timedelta (`np.nan` if string isn't a time)
+    """
+    match=TIME_PATTERN.match(time_str.strip().lstrip("+"))
+    if (match is None): return np.nan
+
+    hours,minutes,seconds=match.groups()
+    return timedelta(hours=int(hours or 0),minutes=int(minutes),seconds=int(seconds))
+
+
+"""
+MEMOISATION
+"""
+# opt-in, in-process memo of parsed results of public scrape functions (see Scraper.set_memo).
+# unlike Fetcher.DiskCache, a hit skips parsing as well as fetching
+
+class MemoCache:
+    """
+    SUMMARY
+    size bounded memo of results of scrape functions, by function & canonical arguments.
+    least recently used results are evicted once there are `max_entries`, & results expire `ttl` seconds after they were stored.
+    results are copied as they are stored & returned, so callers can't change memoised results
+    USED by every public scrape function (via Scraper.memoised), once set with Scraper.set_memo
+
+    PARAMETERS
+    max_entries (int): maximum number of results kept (default=1024)
+    ttl (float): seconds a result is kept for (default=None, until evicted)
+    """
+
+    MISSING=object() # no result memoised (results can be `None`)
+
+    def __init__(self,max_entries=1024,ttl=None):
+        self.max_entries=max_entries
+        self.ttl=ttl
+
+        # memo is shared between threads, so access is serialised
+        self.lock=threading.Lock()
+        self.entries=OrderedDict() # key to (time stored, result), least recently used first
+        self.counts={"hits":0,"misses":0,"evictions":0,"expirations":0}
+
+    def get(self,key):
+        """
+        SUMMARY
+        get memoised result (marking it as recently used)
+
+        PARAMETERS
+        key (tuple): function name & canonical arguments
+
+        OUTPUT
+        copy of result (`MemoCache.MISSING` if there is no fresh result)
+        """
+        with self.lock:
+            entry=self.entries.get(key)
+            if (entry is not None) and (self.ttl is not None) and (time.time()-entry[0]>self.ttl):
+                del self.entries[key]
+                self.counts["expirations"]+=1
+                entry=None
+
+            if (entry is None):
+                self.counts["misses"]+=1
+                return MemoCache.MISSING
+
+            self.entries.move_to_end(key)
+            self.counts["hits"]+=1
+            result=entry[1]
+
+        return copy_result(result)
+
+    def put(self,key,result):
+        """
+        SUMMARY
+        memoise result, evicting least recently used results beyond `max_entries`
+
+        PARAMETERS
+        key (tuple): function name & canonical arguments
+        result: result of function
+        """
+        result=copy_result(result)
+        with self.lock:
+            self.entries[key]=(time.time(),result)
+            self.entries.move_to_end(key)
+            while (len(self.entries)>self.max_entries):
+                self.entries.popitem(last=False)
+                self.counts["evictions"]+=1
+
+    def stats(self) -> dict:
+        """
+        SUMMARY
+        get usage of memo
+
+        OUTPUT
+        dict: stats include
+                "hits" (int) calls answered from memo
+                "misses" (int) calls which ran their function
+                "evictions" (int) results evicted to stay within `max_entries`
+                "expirations" (int) results dropped after `ttl`
+                "entries" (int) number of results kept
+        """
+        with self.lock: return {**self.counts,"entries":len(self.entries)}
+
+    def clear(self):
+        with self.lock: self.entries.clear()
+
+def copy_result(result):
+    # defensive copy of a scraped result (tables are copied, immutable values shared)
+    if (isinstance(result,(pd.DataFrame,pd.Series))): return result.copy(deep=True)
+    if (isinstance(result,dict)): return {key:copy_result(value) for key,value in result.items()}
+    if (isinstance(result,list)): return [copy_result(value) for value in result]
+    if (isinstance(result,tuple)): return tuple(copy_result(value) for value in result)
+    return copy.deepcopy(result)
+
+CANONICAL_SITE_PATTERN=re.compile(r"^(?:https?://)?(?:www\.)?procyclingstats\.com/+",re.IGNORECASE)
+
+def get_canonical_url(url:str) -> str:
+    """
+    SUMMARY
+    get one form of a url, so the same page asked for in different ways shares a memoised result
+    E.G. http://procyclingstats.com/rider/caleb-ewan/ -> https://www.procyclingstats.com/rider/caleb-ewan
+
+    PARAMETERS
+    url (str): full url to page
+
+    OUTPUT
+    str: canonical url
+    """
+    url=CANONICAL_SITE_PATTERN.sub("https://www.procyclingstats.com/",url.strip().split("#")[0])
+    return url.rstrip("/")
+
+# memo shared by all scrape functions (`None` until set, so memoisation is opt-in)
+_memo=None
+
+def get_memo() -> MemoCache:
+    """
+    SUMMARY
+    get memo shared by all scrape functions
+
+    OUTPUT
+    Scraper.MemoCache: shared memo (`None` if memoisation is off)
+    """
+    return _memo
+
+def set_memo(memo:MemoCache) -> MemoCache:
+    """
+    SUMMARY
+    memoise results of public scrape functions (`None` stops memoising)
+    E.G. set_memo(MemoCache(max_entries=4096,ttl=3600))
+
+    PARAMETERS
+    memo (Scraper.MemoCache): memo to use from now on
+
+    OUTPUT
+    Scraper.MemoCache: previous memo (`None` if there was none)
+    """
+    global _memo
+    previous=_memo
+    _memo=memo
+    return previous
+
+def memoised(function):
     """
-    spl=time_str.split(":")
-    spl=[int(val) for val in spl]
+    SUMMARY
+    decorator memoising a scrape function in the shared memo (if one is set), by its name & canonical arguments.
+    urls are canonicalised, `max_workers` is ignored, & calls with unhashable arguments (e.g. stored results) aren't memoised.
+    async functions share results with their sync counterparts (e.g. `async_get_rider_years` & `get_rider_years`)
+
+    PARAMETERS
+    function (function): scrape function
 
-    if (time_str.count(":")==2): # hours:mins:secs
-        return timedelta(hours=spl[0],minutes=spl[1],seconds=spl[2])
+    OUTPUT
+    function: memoised function
+    """
+    signature=inspect.signature(function)
+    name=function.__name__[len("async_"):] if (function.__name__.startswith("async_")) else function.__name__
+
+    def get_key(args,kwargs):
+        arguments=signature.bind(*args,**kwargs)
+        arguments.apply_defaults()
+        key=[name]
+        for argument,value in arguments.arguments.items():
+            if (argument=="max_workers"): continue
+            if (argument=="url") and (isinstance(value,str)): value=get_canonical_url(value)
+            key.append(value)
+
+        key=tuple(key)
+        try: hash(key)
+        except TypeError: return None # e.g. a profile or stored results
+        return key
+
+    if (inspect.iscoroutinefunction(function)):
+        @functools.wraps(function)
+        async def async_wrapper(*args,**kwargs):
+            memo=_memo
+            key=get_key(args,kwargs) if (memo is not None) else None
+            if (key is None): return await function(*args,**kwargs)
+
+            result=memo.get(key)
+            if (result is MemoCache.MISSING):
+                result=await function(*args,**kwargs)
+                memo.put(key,result)
+            return result
+
+        return async_wrapper
+
+    @functools.wraps(function)
+    def wrapper(*args,**kwargs):
+        memo=_memo
+        key=get_key(args,kwargs) if (memo is not None) else None
+        if (key is None): return function(*args,**kwargs)
+
+        result=memo.get(key)
+        if (result is MemoCache.MISSING):
+            result=function(*args,**kwargs)
+            memo.put(key,result)
+        return result
+
+    return wrapper
 
-    elif (time_str.count(":")==1): # mins:secs
-        return timedelta(minutes=spl[0],seconds=spl[1])
+"""
+EXTRACTION SPECS
+"""
+# pages are parsed by declarative specs (e.g. `STAGE_RESULTS_ROW_SPEC`), compiled once into extractors by Scraper.compile_extractor.
+# a spec maps each field to (path,source,converter,required):
+#   path (list((str,dict,int))) tag name, attributes & index among matches of each element from the root down to the element holding the value
+#   source where the value is read from that element: None its text, str one of its attributes, compiled regex first group matched in its text,
+#       list of compiled regexes first of them to match, function called with the element
+#   converter (function) function converting value read (None keeps value as read)
+#   required (bool) whether a missing value raises a ValueError (missing values are otherwise `None`)
+
+def compile_extractor(spec:{str:tuple}):
+    """
+    SUMMARY
+    compile a declarative extraction spec into a function extracting every field of an element in one pass.
+    the spec's paths are compiled into a plan of lookups (with prebuilt strainers), in which each element is only looked up once
+    (with one find_all shared by fields indexing the same matches) & the text of each element is only built once
+    E.G. extract=compile_extractor({"bib_number":([("td",{},3)],None,int,True)}); extract(row)
 
-    else: return np.NaN
+    PARAMETERS
+    spec ({str:tuple}): (path,source,converter,required) of each field (see above)
 
+    OUTPUT
+    function: extractor, taking root element & returning dict of fields (in order of spec)
+    """
+    # number every distinct element of the paths (0 is the root), in order they are looked up
+    elements={():0}
+    matches={} # find_all results to keep, by parent element & match
+    lookups=[] # (element,parent element,match,index) of each element
+    fields=[]
+    for field,(path,source,converter,required) in spec.items():
+        key=()
+        for name,attrs,index in path:
+            parent=elements[key]
+            match_key=(parent,name,tuple(sorted(attrs.items())))
+            key=key+((match_key[1:],index),)
+            if (key not in elements):
+                elements[key]=len(elements)
+                if (match_key not in matches): matches[match_key]=[len(matches),SoupStrainer(name,attrs) if (len(attrs)>0) else name,False] # bs4 matches bare names fastest
+                if (index!=0): matches[match_key][2]=True # indexed beyond first, so every match is found
+                lookups.append((elements[key],parent,match_key,index))
+
+        if (isinstance(source,re.Pattern)): source=[source]
+        fields.append((field,elements[key],source,converter,required))
+
+    plan=[(element,parent,matches[match_key][0],matches[match_key][1],matches[match_key][2],index) for element,parent,match_key,index in lookups]
+    number_of_elements=len(elements)
+    number_of_matches=len(matches)
+
+    def extract(root) -> dict:
+        found=[None]*number_of_elements
+        found[0]=root
+        found_all=[None]*number_of_matches
+        for element,parent,match,strainer,find_all,index in plan:
+            parent_element=found[parent]
+            if (parent_element is None): continue
+            if (not find_all): found[element]=parent_element.find(strainer)
+            else:
+                if (found_all[match] is None): found_all[match]=parent_element.find_all(strainer)
+                if (-len(found_all[match])<=index<len(found_all[match])): found[element]=found_all[match][index]
+
+        texts={} # text of elements, by element
+        values={}
+        for field,element,source,converter,required in fields:
+            value=None
+            element_found=found[element]
+            if (element_found is not None):
+                if (source is None) or (type(source) is list):
+                    if (element not in texts): texts[element]=element_found.text
+                    text=texts[element]
+
+                if (source is None): value=text
+                elif (type(source) is str): value=element_found.get(source)
+                elif (type(source) is list):
+                    for pattern in source:
+                        match=pattern.search(text)
+                        if (match is not None):
+                            value=match.group(1)
+                            break
+                else: value=source(element_found)
+
+            if (value is None):
+                if (required): raise ValueError("{} not found".format(field))
+            elif (converter is not None): value=converter(value)
+            values[field]=value
+
+        return values
+
+    return extract
+
+# converters shared by specs
+NOT_FINISHED_POSITIONS=["DF","DNF","OTL","DNS"]
+
+def to_position(text:str):
+    # finish position (`np.nan` if rider didn't finish)
+    return int(text) if (text not in NOT_FINISHED_POSITIONS) else np.nan
+
+def to_int_or_nan(text:str):
+    return int(text) if (text!="") else np.nan
+
+def to_int_or_zero(text:str) -> int:
+    return int(text) if (text!="") else 0
+
+def to_url(href:str) -> str:
+    return "https://www.procyclingstats.com/"+href
+
+def to_last_class(classes:[str]) -> str:
+    return classes[-1]
+
+def cell(index:int,*path) -> list:
+    # path to table cell of a row (& elements within it)
+    return [("td",{},index)]+list(path)
 
 """
 AVAILABLE RACES
 """
 
+# column types of tables in this section
+RACE_EDITIONS_DTYPES={"year":"object","edition_url":"object"}
+RACES_DTYPES={"race_dates":"object","race_name":"object","stage_race":"bool","race_class":"object","race_country_code":"object","cancelled":"bool","race_url":"object"}
+
+@memoised
 def get_race_editions(url:str) -> pd.DataFrame:
     """
     SUMMARY
@@ -51,32 +605,43 @@ def get_race_editions(url:str) -> pd.DataFrame:
                         "edition_url" (str) full url to overview page of edition
     """
 
-    # start session
-    session=HTMLSession()
-    response=session.get(url)
-    response.html.render()
-    soup=BeautifulSoup(response.html.html,"lxml")
+    # fetch data
+    soup=fetch_soup(url,"race_editions")
+
+    return parse_race_editions(soup)
+
+def parse_race_editions(soup) -> pd.DataFrame:
+    """
+    SUMMARY
+    get list of editions (years) from a race's overview page
+    USED by Scraper.get_race_editions
+
+    PARAMETERS
+    soup (bs4.BeautifulSoup): parsed overview page of race
 
+    OUTPUT
+    pandas.DataFrame: fetched data includes:
+                        "year" (int) year of edition
+                        "edition_url" (str) full url to overview page of edition
+    """
     # isolate select options
     div=soup.find("div",{"class":"editions"})
     edition_select=div.find("select")
     edition_options=edition_select.find_all("option")
 
-    # prepare data frame
-    df=pd.DataFrame(columns=["year","edition_url"])
-
-    # fill data frame
+    # parse rows
+    rows=[]
     for option in edition_options:
-        series={}
+        row={}
 
-        series["year"]=option.text
-        series["edition_url"]="https://www.procyclingstats.com/"+option["value"]
+        row["year"]=option.text
+        row["edition_url"]="https://www.procyclingstats.com/"+option["value"]
 
-        series=pd.Series(series)
-        df=df.append(series,ignore_index=True)
+        rows.append(row)
 
-    return df
+    return build_data_frame(rows,RACE_EDITIONS_DTYPES)
 
+@memoised
 def scrape_races_for_year(year=2020) -> pd.DataFrame:
     """
     SUMMARY
@@ -98,20 +663,35 @@ def scrape_races_for_year(year=2020) -> pd.DataFrame:
                         "tour" (str) name of tour race occured in
                         "tour_code" (int) PCS code for tour in
     """
-    years=get_available_tours_for_year(year)
+    tour_dfs=list(iter_races_for_year(year))
+
+    if (len(tour_dfs)==0): return pd.DataFrame()
+    return pd.concat(tour_dfs,ignore_index=True)
+
+def iter_races_for_year(year=2020,max_workers=None):
+    """
+    SUMMARY
+    lazily get details of all races which occurred in a given year, one tour at a time.
+    tours are fetched concurrently & each is yielded as soon as it is parsed
+    USED by Scraper.scrape_races_for_year
+    E.G. https://www.procyclingstats.com/races.php?year=2020
+
+    PARAMETERS
+    year (int): year to get races for (default=2020)
+    max_workers (int): maximum number of tours fetched at once (default=None, uses `Scraper.MAX_WORKERS`)
 
-    # prepare data frame
-    df=pd.DataFrame()
+    OUTPUT
+    generator(pandas.DataFrame): races of each tour, in tour order (see Scraper.scrape_races_for_year)
+    """
+    tours=list(get_available_tours_for_year(year).items())
 
-    for key,value in years.items():
-        print("{}             ".format(key),end="\r")
-        year_race_series=scrape_tour_races_for_year(year=year,tour_code=value)
+    fetch_tour=lambda tour:scrape_tour_races_for_year(year=year,tour_code=tour[1])
+    for (key,value),year_race_series in zip(tours,iter_concurrent(fetch_tour,tours,max_workers)):
         year_race_series["tour"]=key
         year_race_series["tour_code"]=value
-        df=pd.concat([df,year_race_series],ignore_index=True)
-
-    return df
+        yield year_race_series
 
+@memoised
 def get_available_tours_for_year(year=2020) -> {str:int}:
     """
     SUMMARY
@@ -128,11 +708,22 @@ def get_available_tours_for_year(year=2020) -> {str:int}:
     url="https://www.procyclingstats.com/races.php?year={}".format(year)
 
     # fetch data
-    session=HTMLSession()
-    response=session.get(url)
-    response.html.render()
-    soup=BeautifulSoup(response.html.html,"lxml")
+    soup=fetch_soup(url,"tours")
+
+    return parse_available_tours_for_year(soup)
+
+def parse_available_tours_for_year(soup) -> {str:int}:
+    """
+    SUMMARY
+    get details for all tours which occured in a given year.
+    USED by Scraper.get_available_tours_for_year
+
+    PARAMETERS
+    soup (bs4.BeautifulSoup): parsed page of races in year
 
+    OUTPUT
+    {str:int}: dictionary from `tour_name` to `tour_code`
+    """
     # isolate input field
     select_field=soup.find("select",{"name":"circuit"})
     select_field_options=select_field.find_all("option")
@@ -146,6 +737,7 @@ def get_available_tours_for_year(year=2020) -> {str:int}:
 
     return tours
 
+@memoised
 def scrape_tour_races_for_year(year=2020,tour_code=1) -> pd.DataFrame:
     """
     SUMMARY
@@ -170,24 +762,38 @@ def scrape_tour_races_for_year(year=2020,tour_code=1) -> pd.DataFrame:
     url="https://www.procyclingstats.com/races.php?year={}&circuit={}".format(year,tour_code)
 
     # fetch data
-    session=HTMLSession()
-    response=session.get(url)
-    response.html.render()
-    soup=BeautifulSoup(response.html.html,"lxml")
+    soup=fetch_soup(url,"races")
 
+    return parse_tour_races_for_year(soup)
+
+def parse_tour_races_for_year(soup) -> pd.DataFrame:
+    """
+    SUMMARY
+    get details for all races which occured in a given tour, in a given year
+    USED by Scraper.scrape_tour_races_for_year
+
+    PARAMETERS
+    soup (bs4.BeautifulSoup): parsed page of races in tour & year
+
+    OUTPUT
+    pandas.DataFrame: fetched data includes:
+                        "race_dates" (str) string of when race occurred (either "M.D - M.D" or "M.D")
+                        "race_name" (str) name of race
+                        "stage_race" (bool) whether race is a stage race of not
+                        "race_class" (str) classification of race
+                        "race_country_code" (str) code for host country
+                        "cancelled" (bool) whether race was/is cancelled
+                        "race_url" (str) full url to race overview page
+    """
     table_div=soup.find("div",{"class":"tableCont"})
     table_body=table_div.find("tbody")
     table_rows=table_body.find_all("tr")
 
-    df=pd.DataFrame(columns=["race_dates","race_name","stage_race","race_class","race_country_code","cancelled","race_url"])
-
-    for row in table_rows:
-        series=parse_tour_races_for_year_row(row)
-        df=df.append(series,ignore_index=True)
+    rows=[parse_tour_races_for_year_row(row) for row in table_rows]
 
-    return df
+    return build_data_frame(rows,RACES_DTYPES)
 
-def parse_tour_races_for_year_row(row) -> pd.Series:
+def parse_tour_races_for_year_row(row) -> dict:
     """
     SUMMARY
     parse details from row of table of races in a given year & tour
@@ -197,7 +803,7 @@ def parse_tour_races_for_year_row(row) -> pd.Series:
     row (bs4.element.Tag): row from table
 
     OUTPUT
-    pandas.Series: fetched data includes:
+    dict: fetched data includes:
                         "race_dates" (str) string of when race occurred (either "M.D - M.D" or "M.D")
                         "race_name" (str) name of race
                         "stage_race" (bool) whether race is a stage race of not
@@ -219,12 +825,16 @@ def parse_tour_races_for_year_row(row) -> pd.Series:
     series["race_name"]=row_details[1].find("a").text
     series["race_class"]=row_details[3].text
 
-    return pd.Series(series)
+    return series
 
 """
 AVAILABLE TEAMS
 """
 
+# column types of tables in this section
+TEAMS_DTYPES={"team_name":"object","team_nationality_code":"object","team_url":"object","team_class_name":"object","team_class":"int64"}
+
+@memoised
 def scrape_teams_for_year(year=2020) -> pd.DataFrame:
     """
     SUMMARY
@@ -246,13 +856,28 @@ def scrape_teams_for_year(year=2020) -> pd.DataFrame:
     url="https://www.procyclingstats.com/teams.php?s=worldtour&year={}".format(year)
 
     # fetch data
-    session=HTMLSession()
-    response=session.get(url)
-    response.html.render()
-    soup=BeautifulSoup(response.html.html,"lxml")
+    soup=fetch_soup(url,"teams")
+
+    return parse_teams_for_year(soup)
 
-    df=pd.DataFrame()
+def parse_teams_for_year(soup) -> pd.DataFrame:
+    """
+    SUMMARY
+    scrape all world tour & continental teams in a given year
+    USED by Scraper.scrape_teams_for_year
+
+    PARAMETERS
+    soup (bs4.BeautifulSoup): parsed page of teams in year
 
+    OUTPUT
+    pandas.DataFrame: fetched data includes
+                        "team_name" (str) name of team
+                        "team_nationality_code" (str) PCS code for home nation of team
+                        "team_url" (str) full url to overview of team in given year
+                        "team_class_name" (str) name of team's classification
+                        "team_class" (int) team's classification (`
+                        ` for top, `2` for not)
+    """
     # isolate areas
     div=soup.find("div",{"class":"statDivLeft"})
 
@@ -267,27 +892,28 @@ def scrape_teams_for_year(year=2020) -> pd.DataFrame:
     class_name=headings[0]
     class_divs=team_divs[:2]
 
-    # fill data frame
+    # parse rows
+    rows=[]
     for div in class_divs:
-        div_df=parse_team_div(div)
-        div_df["team_class_name"]=class_name
-        div_df["team_class"]=1
-        df=pd.concat([df,div_df],ignore_index=True)
+        for row in parse_team_div(div):
+            row["team_class_name"]=class_name
+            row["team_class"]=1
+            rows.append(row)
 
     # second class
     class_name=headings[1]
     class_divs=team_divs[2:]
 
-    # fill data frame
+    # parse rows
     for div in class_divs:
-        div_df=parse_team_div(div)
-        div_df["team_class_name"]=class_name
-        div_df["team_class"]=2
-        df=pd.concat([df,div_df],ignore_index=True)
+        for row in parse_team_div(div):
+            row["team_class_name"]=class_name
+            row["team_class"]=2
+            rows.append(row)
 
-    return df
+    return build_data_frame(rows,TEAMS_DTYPES)
 
-def parse_team_div(div) -> pd.DataFrame:
+def parse_team_div(div) -> [dict]:
     """
     SUMMARY
     parse details of teams in a given div
@@ -297,8 +923,7 @@ def parse_team_div(div) -> pd.DataFrame:
     div (bs4.element.Tag): div to parse details from
 
     OUTPUT
-    type: description
-    pandas.DataFrame: fetched data includes
+    list(dict): one per team, fetched data includes
                         "team_name" (str) name of team
                         "team_nationality_code" (str) PCS code for home nation of team
                         "team_url" (str) full url to overview of team in given year
@@ -306,8 +931,7 @@ def parse_team_div(div) -> pd.DataFrame:
     anchors=div.find_all("a")
     spans=div.find_all("span")
 
-    df=pd.DataFrame(columns=["team_name","team_nationality_code","team_url"])
-
+    rows=[]
     for i in range(len(anchors)):
         series={}
 
@@ -315,14 +939,18 @@ def parse_team_div(div) -> pd.DataFrame:
         series["team_url"]="https://www.procyclingstats.com/"+anchors[i]["href"]
         series["team_nationality_code"]=spans[i]["class"][-1]
 
-        df=df.append(pd.Series(series),ignore_index=True)
+        rows.append(series)
 
-    return df
+    return rows
 
 """
 AVAILABLE RIDERS
 """
 
+# column types of tables in this section
+TEAM_RIDERS_DTYPES={"rider_name":"object","rider_nationality_code":"object","rider_career_points":"object","rider_age":"object","rider_url":"object"}
+
+@memoised
 def scrape_riders_from_team(url:str) -> pd.DataFrame:
     """
     SUMMARY
@@ -342,26 +970,37 @@ def scrape_riders_from_team(url:str) -> pd.DataFrame:
     """
 
     # fetch data
-    session=HTMLSession()
-    response=session.get(url)
-    response.html.render()
-    soup=BeautifulSoup(response.html.html,"lxml")
+    soup=fetch_soup(url,"team")
+
+    return parse_riders_from_team(soup)
+
+def parse_riders_from_team(soup) -> pd.DataFrame:
+    """
+    SUMMARY
+    get details from riders in a team in a given year
+    USED by Scraper.scrape_riders_from_team
+
+    PARAMETERS
+    soup (bs4.BeautifulSoup): parsed overview page of team
 
+    OUTPUT
+    pandas.DataFrame: fetched data includes
+                        "rider_name" (str) name of ride
+                        "rider_nationality_code" (str) PCS code for rider's official nationality
+                        "rider_career_points" (int) number of PCS points won
+                        "rider_age" (int) age of rider (in given year of team)
+                        "rider_url" (str) full url to rider's overview page
+    """
     # isolate rider list
     rider_list=soup.find("ul",{"class","riderlist"})
     rider_list_items=rider_list.find_all("li")
 
-    # prepare data frame
-    df=pd.DataFrame(columns=["rider_name","rider_nationality_code","rider_career_points","rider_age","rider_url"])
-
-    # fill data frame
-    for item in rider_list_items:
-        series=parse_rider_list_item(item)
-        df=df.append(series,ignore_index=True)
+    # parse rows
+    rows=[parse_rider_list_item(item) for item in rider_list_items]
 
-    return df
+    return build_data_frame(rows,TEAM_RIDERS_DTYPES)
 
-def parse_rider_list_item(item) -> pd.Series:
+def parse_rider_list_item(item) -> dict:
     """
     SUMMARY
     parse details of rider in a given li
@@ -371,8 +1010,7 @@ def parse_rider_list_item(item) -> pd.Series:
     item (bs4.element.Tag): div to parse details from
 
     OUTPUT
-    type: description
-    pandas.Series: fetched data includes
+    dict: fetched data includes
                         "rider_name" (str) name of ride
                         "rider_nationality_code" (str) PCS code for rider's official nationality
                         "rider_career_points" (int) number of PCS points won
@@ -389,11 +1027,16 @@ def parse_rider_list_item(item) -> pd.Series:
     series["rider_career_points"]=item["data-pnts"]
     series["rider_age"]=item["data-age"]
 
-    return pd.Series(series)
+    return series
 
 """
 RACE DETAILS
 """
+
+# column types of tables in this section
+STARTLIST_DTYPES={"bib_number":"int64","rider_name":"object","rider_nationality_code":"object","team_name":"object","rider_url":"object","team_url":"object"}
+
+@memoised
 def scrape_race_startlist(url:str) -> pd.DataFrame:
     """
     SUMMARY
@@ -418,25 +1061,39 @@ def scrape_race_startlist(url:str) -> pd.DataFrame:
         url+="startlist"
 
     # fetch data
-    session=HTMLSession()
-    response=session.get(url)
-    response.html.render()
-    soup=BeautifulSoup(response.html.html,"lxml")
+    soup=fetch_soup(url,"startlist")
+
+    return parse_race_startlist(soup)
+
+def parse_race_startlist(soup) -> pd.DataFrame:
+    """
+    SUMMARY
+    scrape list of riders from a race's startlist
+    USED by Scraper.scrape_race_startlist
 
+    PARAMETERS
+    soup (bs4.BeautifulSoup): parsed startlist page of race
+
+    OUTPUT
+    pandas.DataFrame: fetched data includes
+                        "bib_number" (int) rider's race number
+                        "rider_name" (str) name of rider
+                        "rider_nationality_code" (str) PCS code for rider's official nationality
+                        "team_name" (str) name of rider's team
+                        "rider_url" (url) full url to rider's overview page
+                        "team_url" (url) full url to team's overview page for given year
+    """
     # isolate rider lists
     team_lists=soup.find_all("li",{"class":"team"})
 
-    # prepare data frame
-    df=pd.DataFrame(columns=["bib_number","rider_name","rider_nationality_code","team_name","rider_url","team_url"])
-
-    # fill data frame
+    # parse rows
+    rows=[]
     for team in team_lists:
-        team_df=parse_team_startlist_div(team)
-        df=pd.concat([df,team_df])
+        rows.extend(parse_team_startlist_div(team))
 
-    return df
+    return build_data_frame(rows,STARTLIST_DTYPES)
 
-def parse_team_startlist_div(div) -> pd.DataFrame:
+def parse_team_startlist_div(div) -> [dict]:
     """
     SUMMARY
     parse details for all riders in a team, from the div for team in startlist
@@ -445,7 +1102,7 @@ def parse_team_startlist_div(div) -> pd.DataFrame:
     div (bs4.element.Tag): div to parse from
 
     OUTPUT
-    pandas.DataFrame: fetched data includes
+    list(dict): one per rider, fetched data includes
                         "bib_number" (int) rider's race number
                         "rider_name" (str) name of rider
                         "rider_nationality_code" (str) PCS code for rider's official nationality
@@ -453,8 +1110,6 @@ def parse_team_startlist_div(div) -> pd.DataFrame:
                         "rider_url" (url) full url to rider's overview page
                         "team_url" (url) full url to team's overview page for given year
     """
-    df=pd.DataFrame(columns=["bib_number","rider_name","rider_nationality_code","team_name","rider_url","team_url"])
-
     # extract team data
     heading=div.find("h4")
     team_name=heading.find("a").text
@@ -470,6 +1125,7 @@ def parse_team_startlist_div(div) -> pd.DataFrame:
     flags=rider_list.find_all("span",{"class":"flag"},recursive=False)
 
     # parse rider data
+    rows=[]
     for i in range(len(bib_numbers)):
         series={}
 
@@ -481,10 +1137,24 @@ def parse_team_startlist_div(div) -> pd.DataFrame:
         series["team_name"]=team_name
         series["team_url"]=team_url
 
-        df=df.append(pd.Series(series),ignore_index=True)
+        rows.append(series)
 
-    return df
+    return rows
 
+# information listed down right of race page
+RACE_INFORMATION=("div",{"class":"res-right"},0)
+RACE_INFORMATION_SPEC={
+    "date":([RACE_INFORMATION],re.compile(r"Date:\s+([0-9]+[a-z]{2} [a-z]+ [0-9]{4})",re.IGNORECASE),None,True),
+    "race_cat":([RACE_INFORMATION],re.compile(r"Race category: (.*)Parcours",re.IGNORECASE),lambda race_cat:race_cat if (race_cat.strip()!="") else None,True),
+    "parcours_rating":([RACE_INFORMATION],re.compile(r"Parcours type:\s+([0-9]+)\*?",re.IGNORECASE),lambda rating:int(rating) if (int(rating)!=0) else None,True),
+    "start_location":([RACE_INFORMATION],re.compile(r"finish: (.*) ›",re.IGNORECASE),None,False),
+    "end_location":([RACE_INFORMATION],re.compile(r"› (.*)Climbs",re.IGNORECASE),None,False),
+    "pcs_points_scale":([RACE_INFORMATION],[re.compile(r"scale: (.*) Start/",re.IGNORECASE),re.compile(r"scale: (.*) ",re.IGNORECASE)],None,False),
+    "profile":([RACE_INFORMATION,("span",{"class":"profile"},0)],"class",lambda classes:classes[-1] if (classes[-1]!="p0") else None,True) # p0 when data missing
+}
+extract_race_information=compile_extractor(RACE_INFORMATION_SPEC)
+
+@memoised
 def scrape_race_information(url:str) -> pd.Series:
     """
     SUMMARY
@@ -505,41 +1175,36 @@ def scrape_race_information(url:str) -> pd.Series:
                     "pcs_points_scale" (str) name of points scale being used
                     "profile" (str) code for profile of race
     """
-    series={}
-
     # fetch data
-    session=HTMLSession()
-    response=session.get(url)
-    response.html.render()
-    soup=BeautifulSoup(response.html.html,"lxml")
-
-    # isolate data location
-    information_div=soup.find("div",{"class":"res-right"})
-    text=information_div.text
-
-    series["date"]=re.search("Date:\s+([0-9]+[a-z]{2} [a-z]+ [0-9]{4})",text,re.IGNORECASE).group(1)
-    series["race_cat"]=re.search("Race category: (.*)Parcours",text,re.IGNORECASE).group(1)
-    if (series["race_cat"].strip()==""): series["race_cat"]=None
-
-    series["parcours_rating"]=int(re.search("Parcours type:\s+([0-9]+)\*?",text,re.IGNORECASE).group(1))
-    if (series["parcours_rating"]==0): series["parcours_rating"]=None
-
-    # extract location data if it exists
-    try:
-        series["start_location"]=re.search("finish: (.*) ›",text,re.IGNORECASE).group(1)
-        series["end_location"]=re.search("› (.*)Climbs",text,re.IGNORECASE).group(1)
-    except:
-        series["start_location"]=None
-        series["end_location"]=None
+    soup=fetch_soup(url,"race_information")
 
-    points_scale=re.search("scale: (.*) Start/",text,re.IGNORECASE)
-    if points_scale is None: points_scale=re.search("scale: (.*) ",text,re.IGNORECASE)
+    return parse_race_information(soup)
 
-    if points_scale is not None: series["pcs_points_scale"]=points_scale.group(1)
-    else: series["pcs_points_scale"]=None
+def parse_race_information(soup) -> pd.Series:
+    """
+    SUMMARY
+    parse information about race from it's page
+    USED by Scraper.scrape_race_information & Scraper.parse_stage_race_overview
 
-    series["profile"]=information_div.find("span",{"class":"profile"})["class"][-1]
-    if (series["profile"]=="p0"): series["profile"]=None # data missing
+    PARAMETERS
+    soup (bs4.BeautifulSoup): parsed page of race
+
+    OUTPUT
+    pandas.Series: fetched data includes
+                    "date" (str) date race occured
+                    "race_cat" (str) race classification
+                    "parcours_rating" (int) PCS rating for pacour difficulty
+                    "start_location" (str) name of start town
+                    "end_location" (str) name of finish town
+                    "pcs_points_scale" (str) name of points scale being used
+                    "profile" (str) code for profile of race
+    """
+    series=extract_race_information(soup)
+
+    # locations are only kept if both exist
+    if (series["start_location"] is None) or (series["end_location"] is None):
+        series["start_location"]=None
+        series["end_location"]=None
 
     return pd.Series(series)
 
@@ -547,6 +1212,62 @@ def scrape_race_information(url:str) -> pd.Series:
 STAGE RACING OVERVIEW
 """
 
+# column types of tables in this section
+TOP_COMPETITORS_DTYPES={"rider_name":"object","rider_url":"object","rider_nationality_code":"object"}
+COMPETING_TEAMS_DTYPES={"team_name":"object","team_url":"object","team_nationality_code":"object"}
+STAGES_DTYPES={"date":"object","stage_name":"object","start_location":"object","end_location":"object","profile":"object","distance":"float64","stage_url":"object"}
+
+@memoised
+def scrape_stage_race_overview(url:str) -> dict:
+    """
+    SUMMARY
+    get all details from overview page of a given stage race, fetching the page once
+    E.G. https://www.procyclingstats.com/race/tour-de-france/2019/overview
+
+    PARAMETERS
+    url (str): url for a stage race's overview page
+
+    OUTPUT
+    dict: fetched data includes
+            "information" (pandas.Series) see Scraper.scrape_race_information (`None` if page has no race information)
+            "top_competitors" (pandas.DataFrame) see Scraper.scrape_stage_race_overview_top_competitors
+            "competing_teams" (pandas.DataFrame) see Scraper.scrape_stage_race_overview_competing_teams
+            "stages" (pandas.DataFrame) see Scraper.scrape_stage_race_overview_stages
+    """
+    # fetch data
+    soup=fetch_soup(url,"stage_race_overview")
+
+    return parse_stage_race_overview(soup)
+
+def parse_stage_race_overview(soup) -> dict:
+    """
+    SUMMARY
+    get all details from overview page of a given stage race
+    USED by Scraper.scrape_stage_race_overview & Scraper.async_scrape_stage_race_overview
+
+    PARAMETERS
+    soup (bs4.BeautifulSoup): parsed overview page of stage race
+
+    OUTPUT
+    dict: fetched data includes
+            "information" (pandas.Series) see Scraper.scrape_race_information (`None` if page has no race information)
+            "top_competitors" (pandas.DataFrame) see Scraper.scrape_stage_race_overview_top_competitors
+            "competing_teams" (pandas.DataFrame) see Scraper.scrape_stage_race_overview_competing_teams
+            "stages" (pandas.DataFrame) see Scraper.scrape_stage_race_overview_stages
+    """
+    overview={}
+
+    # race information is not on every overview page
+    try: overview["information"]=parse_race_information(soup)
+    except (AttributeError,TypeError,ValueError): overview["information"]=None
+
+    overview["top_competitors"]=parse_stage_race_overview_top_competitors(soup)
+    overview["competing_teams"]=parse_stage_race_overview_competing_teams(soup)
+    overview["stages"]=parse_stage_race_overview_stages(soup)
+
+    return overview
+
+@memoised
 def scrape_stage_race_overview_top_competitors(url:str) -> pd.DataFrame:
     """
     SUMMARY
@@ -563,20 +1284,32 @@ def scrape_stage_race_overview_top_competitors(url:str) -> pd.DataFrame:
                         "rider_nationality_code" (url) PCS code for rider's official nationality
     """
     # fetch data
-    session=HTMLSession()
-    response=session.get(url)
-    response.html.render()
-    soup=BeautifulSoup(response.html.html,"lxml")
+    soup=fetch_soup(url,"stage_race_overview")
+
+    return parse_stage_race_overview_top_competitors(soup)
+
+def parse_stage_race_overview_top_competitors(soup) -> pd.DataFrame:
+    """
+    SUMMARY
+    scrape details for top competitors from overview page of a given stage race
+    USED by Scraper.scrape_stage_race_overview_top_competitors & Scraper.parse_stage_race_overview
 
+    PARAMETERS
+    soup (bs4.BeautifulSoup): parsed overview page of stage race
+
+    OUTPUT
+    pandas.DataFrame: fetched data includes
+                        "rider_name" (str) name of rider
+                        "rider_url" (str) full url to rider's overview page
+                        "rider_nationality_code" (url) PCS code for rider's official nationality
+    """
     # isolate list
     right_div=soup.find_all("div",{"class":"w48"})[1]
     top_competitor_list=right_div.find_all("ul")[0]
     top_competitor_list_items=top_competitor_list.find_all("li")
 
-    # prepare data frame
-    df=pd.DataFrame(columns=["rider_name","rider_url","rider_nationality_code"])
-
-    # fill data frame
+    # parse rows
+    rows=[]
     for list_item in top_competitor_list_items:
         series={}
 
@@ -584,10 +1317,11 @@ def scrape_stage_race_overview_top_competitors(url:str) -> pd.DataFrame:
         series["rider_url"]="https://www.procyclingstats.com/"+list_item.find("a")["href"]
         series["rider_nationality_code"]=list_item.find("span",{"class":"flag"})["class"][-1]
 
-        df=df.append(pd.Series(series),ignore_index=True)
+        rows.append(series)
 
-    return df
+    return build_data_frame(rows,TOP_COMPETITORS_DTYPES)
 
+@memoised
 def scrape_stage_race_overview_competing_teams(url:str) -> pd.DataFrame:
     """
     SUMMARY
@@ -603,20 +1337,31 @@ def scrape_stage_race_overview_competing_teams(url:str) -> pd.DataFrame:
                         "team_url" (str) full url for team's overview page for year or race edition
     """
     # fetch data
-    session=HTMLSession()
-    response=session.get(url)
-    response.html.render()
-    soup=BeautifulSoup(response.html.html,"lxml")
+    soup=fetch_soup(url,"stage_race_overview")
 
+    return parse_stage_race_overview_competing_teams(soup)
+
+def parse_stage_race_overview_competing_teams(soup) -> pd.DataFrame:
+    """
+    SUMMARY
+    get details of teams in a stage race from the race's overview page
+    USED by Scraper.scrape_stage_race_overview_competing_teams & Scraper.parse_stage_race_overview
+
+    PARAMETERS
+    soup (bs4.BeautifulSoup): parsed overview page of stage race
+
+    OUTPUT
+    pandas.DataFrame: fetched data includes
+                        "team_name" (str) name of team
+                        "team_url" (str) full url for team's overview page for year or race edition
+    """
     # isolate list
     right_div=soup.find_all("div",{"class":"w48"})[1]
     top_competitor_list=right_div.find_all("ul")[1]
     top_competitor_list_items=top_competitor_list.find_all("li")
 
-    # prepare data frame
-    df=pd.DataFrame(columns=["team_name","team_url"])
-
-    # fill data frame
+    # parse rows
+    rows=[]
     for list_item in top_competitor_list_items:
         series={}
 
@@ -624,10 +1369,11 @@ def scrape_stage_race_overview_competing_teams(url:str) -> pd.DataFrame:
         series["team_url"]="https://www.procyclingstats.com/"+list_item.find("a")["href"]
         series["team_nationality_code"]=list_item.find("span",{"class":"flag"})["class"][-1]
 
-        df=df.append(pd.Series(series),ignore_index=True)
+        rows.append(series)
 
-    return df
+    return build_data_frame(rows,COMPETING_TEAMS_DTYPES)
 
+@memoised
 def scrape_stage_race_overview_stages(url:str) -> pd.DataFrame:
     """
     SUMMARY
@@ -649,11 +1395,29 @@ def scrape_stage_race_overview_stages(url:str) -> pd.DataFrame:
                         "stage_url" (str) full url to stage's detail page
     """
     # fetch data
-    session=HTMLSession()
-    response=session.get(url)
-    response.html.render()
-    soup=BeautifulSoup(response.html.html,"lxml")
+    soup=fetch_soup(url,"stage_race_overview")
+
+    return parse_stage_race_overview_stages(soup)
 
+def parse_stage_race_overview_stages(soup) -> pd.DataFrame:
+    """
+    SUMMARY
+    get details for stages in a stage race from it's overview page
+    USED by Scraper.scrape_stage_race_overview_stages & Scraper.parse_stage_race_overview
+
+    PARAMETERS
+    soup (bs4.BeautifulSoup): parsed overview page of stage race
+
+    OUTPUT
+    pandas.DataFrame: fetched data includes
+                        "date" (str) date of stage (D/M)
+                        "stage_name" (str) name of stage (`stage #` or `REST DAY`)
+                        "start_location" (str) name of start town
+                        "end_location" (str) name of finish town
+                        "profile" (str) PCS description of profile
+                        "distance" (int) distance of stage in km
+                        "stage_url" (str) full url to stage's detail page
+    """
     # isolate desired list
     left_div=soup.find("div",{"class":"w36"})
     stage_list=left_div.find_all("ul")[1]
@@ -661,18 +1425,29 @@ def scrape_stage_race_overview_stages(url:str) -> pd.DataFrame:
     # get list items
     stage_list_items=stage_list.find_all("li")
 
-    # prepare data frame
-    df=pd.DataFrame(columns=["date","stage_name","start_location","end_location","profile","distance","stage_url"])
-
-    # fill data frame
+    # parse rows
+    rows=[]
     for list_item in stage_list_items:
         if (list_item.text!="Rest day"): series=parse_stage_list_item(list_item) # not a rest day
-        else: series=pd.Series({"stage_name":"REST DAY"}) # is a rest day
-        df=df.append(series,ignore_index=True)
-
-    return df
-
-def parse_stage_list_item(list_item) -> pd.Series:
+        else: series={"stage_name":"REST DAY"} # is a rest day
+        rows.append(series)
+
+    return build_data_frame(rows,STAGES_DTYPES)
+
+# details of a stage, within its list item's link
+STAGE_LINK=("a",{},0)
+STAGE_LIST_ITEM_SPEC={
+    "date":([("div",{},0)],None,None,True),
+    "stage_url":([STAGE_LINK],"href",to_url,True),
+    "stage_name":([STAGE_LINK,("div",{},0)],None,None,True),
+    "start_location":([STAGE_LINK,("div",{},2)],None,lambda locations:locations.split("›")[0].strip(),True),
+    "end_location":([STAGE_LINK,("div",{},2)],None,lambda locations:locations.split("›")[1].strip(),True),
+    "profile":([STAGE_LINK,("div",{"class":"profile"},0)],"class",lambda classes:classes[-2],True),
+    "distance":([STAGE_LINK,("span",{},0)],None,lambda distance:float(distance.replace("(","").replace("km)","")),True)
+}
+extract_stage_list_item=compile_extractor(STAGE_LIST_ITEM_SPEC)
+
+def parse_stage_list_item(list_item) -> dict:
     """
     SUMMARY
     get details about a single stage
@@ -682,8 +1457,7 @@ def parse_stage_list_item(list_item) -> pd.Series:
     list_item (bs4.element.Tag): stage item from list of stages
 
     OUTPUT
-    type: description
-    pandas.Series: fetched data includes
+    dict: fetched data includes
                         "date" (str) date of stage (D/M)
                         "stage_name" (str) name of stage (`stage #` or `REST DAY`)
                         "start_location" (str) name of start town
@@ -692,59 +1466,84 @@ def parse_stage_list_item(list_item) -> pd.Series:
                         "distance" (int) distance of stage in km
                         "stage_url" (str) full url to stage's detail page
     """
-    series={}
-
-    # date of stage
-    series["date"]=list_item.find("div").text
+    return extract_stage_list_item(list_item)
 
-    # url
-    stage_details=list_item.find("a")
-    series["stage_url"]="https://www.procyclingstats.com/"+stage_details["href"]
+"""
+STAGE RACING STAGES
+"""
 
-    # locations & name
-    stage_detail_divs=stage_details.find_all("div")
-    series["stage_name"]=stage_detail_divs[0].text
-    locations=stage_detail_divs[2].text.split("›")
-    series["start_location"]=locations[0].strip()
-    series["end_location"]=locations[1].strip()
+# column types of tables in this section
+STAGE_RESULTS_DTYPES={"stage_pos":"float64","gc_pos":"float64","gc_time_diff_after":"timedelta64[ns]","bib_number":"int64","rider_age":"int64","team_name":"object","rider_name":"object","rider_nationality_code":"object","uci_points":"int64","points":"int64","finish_time":"timedelta64[ns]","rider_url":"object"}
 
-    # profile
-    series["profile"]=stage_details.find("div",{"class":"profile"})["class"][-2]
+def get_stage_urls(stages:pd.DataFrame) -> [str]:
+    """
+    SUMMARY
+    get full urls of stages which are raced (ie not rest days)
+    USED by Scraper.scrape_stage_race_all_stage_results & Scraper.async_scrape_stage_race_all_stage_results
 
-    # length of stage
-    series["distance"]=float(stage_details.find("span").text.replace("(","").replace("km)",""))
+    PARAMETERS
+    stages (pandas.DataFrame): stages of race, from Scraper.scrape_stage_race_overview_stages
 
-    return pd.Series(series)
+    OUTPUT
+    list(str): full url of each stage, in stage order
+    """
+    stage_urls=[]
+    for stage_url in stages[stages["stage_name"]!="REST DAY"]["stage_url"]:
+        if stage_url[:4]!="http": stage_url="https://"+stage_url
+        stage_urls.append(stage_url)
 
-"""
-STAGE RACING STAGES
-"""
+    return stage_urls
 
-def scrape_stage_race_all_stage_results(url:str) -> [pd.DataFrame]:
+@memoised
+def scrape_stage_race_all_stage_results(url:str,stages=None,existing=None,max_workers=None) -> [pd.DataFrame]:
     """
     SUMMARY
     get finishing results for each stage in a stage race.
+    stages are fetched concurrently
     E.G. https://www.procyclingstats.com/race/tour-de-france/2020/overview
 
     PARAMETERS
     url (str): full url to stage race overview
+    stages (pandas.DataFrame): stages of race, from Scraper.scrape_stage_race_overview (default=None, fetched from `url`)
+    existing ({str:pandas.DataFrame}): results already stored, by stage url. these stages are not fetched again (default=None)
+    max_workers (int): maximum number of stages fetched at once (default=None, uses `Scraper.MAX_WORKERS`)
 
     OUTPUT
-    type: description
-    list(pandas.DataFrame): one dataframe for results for each stage. each dataframe includes
+    list(pandas.DataFrame): one dataframe for results for each stage, in stage order (see Scraper.scrape_stage_race_stage_results)
+    """
+    return [results for stage_url,results in iter_stage_race_all_stage_results(url,stages,existing,max_workers)]
 
+def iter_stage_race_all_stage_results(url:str,stages=None,existing=None,max_workers=None):
     """
-    stages=scrape_stage_race_overview_stages(url)
+    SUMMARY
+    lazily get finishing results for each stage in a stage race.
+    stages are fetched concurrently & each is yielded as soon as it is parsed
+    USED by Scraper.scrape_stage_race_all_stage_results
+    E.G. https://www.procyclingstats.com/race/tour-de-france/2020/overview
 
-    results=[]
-    for stage_url in stages[stages["stage_name"]!="REST DAY"]["stage_url"]:
-        if stage_url[:4]!="http": stage_url="https://"+stage_url
-        print(stage_url)
-        stage_results_df=scrape_stage_race_stage_results(stage_url)
-        results.append(stage_results_df)
+    PARAMETERS
+    url (str): full url to stage race overview
+    stages (pandas.DataFrame): stages of race, from Scraper.scrape_stage_race_overview (default=None, fetched from `url`)
+    existing ({str:pandas.DataFrame}): results already stored, by stage url. these stages are not fetched again (default=None)
+    max_workers (int): maximum number of stages fetched at once (default=None, uses `Scraper.MAX_WORKERS`)
 
-    return results
+    OUTPUT
+    generator((str,pandas.DataFrame)): full url & results of each stage, in stage order (see Scraper.scrape_stage_race_stage_results)
+    """
+    if (stages is None): stages=scrape_stage_race_overview_stages(url)
+    if (existing is None): existing={}
+
+    stage_urls=get_stage_urls(stages)
 
+    # only fetch stages without stored results
+    missing_urls=[stage_url for stage_url in stage_urls if existing.get(stage_url) is None]
+    fetched=iter_concurrent(scrape_stage_race_stage_results,missing_urls,max_workers)
+
+    for stage_url in stage_urls:
+        if (existing.get(stage_url) is None): yield stage_url,next(fetched)
+        else: yield stage_url,existing[stage_url]
+
+@memoised
 def scrape_stage_race_stage_results(url:str) -> pd.DataFrame:
     """
     SUMMARY
@@ -757,8 +1556,8 @@ def scrape_stage_race_stage_results(url:str) -> pd.DataFrame:
     OUTPUT
     type: description
     pandas.DataFrame: fetched data includes
-                        "stage_pos" (int) finish position of rider (`np.NaN` if rider didn't finish stage)
-                        "gc_pos" (int) rider's gc position after stage (`np.NaN` if rider didn't finish stage)
+                        "stage_pos" (int) finish position of rider (`np.nan` if rider didn't finish stage)
+                        "gc_pos" (int) rider's gc position after stage (`np.nan` if rider didn't finish stage)
                         "gc_time_diff_after" (datetime.timedelta) rider's time difference to gc leader after stage
                         "bib_number" (int) rider's race number
                         "rider_age" (int) rider's age on day of stage
@@ -768,31 +1567,67 @@ def scrape_stage_race_stage_results(url:str) -> pd.DataFrame:
                         "uci_points" (int) number of uci points won by rider in stage
                         "points" (int) number of PCS points won by rider in stage
                         "finish_time" (datetime.timedelta) time taken to complete stage (or time behind stage winner)
+                        "rider_url" (str) url of rider's page (`None` if rider has no page)
     """
-    # start session
-    session=HTMLSession()
-    response=session.get(url)
-    response.html.render()
-    soup=BeautifulSoup(response.html.html,"lxml")
+    # fetch data
+    soup=fetch_soup(url,"stage_results")
+
+    return parse_stage_race_stage_results(soup)
 
+def parse_stage_race_stage_results(soup) -> pd.DataFrame:
+    """
+    SUMMARY
+    get finish results for individual stage of a stage race
+    USED by Scraper.scrape_stage_race_stage_results
+
+    PARAMETERS
+    soup (bs4.BeautifulSoup): parsed page of stage
+
+    OUTPUT
+    pandas.DataFrame: fetched data includes
+                        "stage_pos" (int) finish position of rider (`np.nan` if rider didn't finish stage)
+                        "gc_pos" (int) rider's gc position after stage (`np.nan` if rider didn't finish stage)
+                        "gc_time_diff_after" (datetime.timedelta) rider's time difference to gc leader after stage
+                        "bib_number" (int) rider's race number
+                        "rider_age" (int) rider's age on day of stage
+                        "team_name" (str) name of rider's team
+                        "rider_name" (str) name of rider
+                        "rider_nationality_code" (str) PCS code for rider's nationality
+                        "uci_points" (int) number of uci points won by rider in stage
+                        "points" (int) number of PCS points won by rider in stage
+                        "finish_time" (datetime.timedelta) time taken to complete stage (or time behind stage winner)
+                        "rider_url" (str) url of rider's page (`None` if rider has no page)
+    """
     # isolate desired table
     table=soup.find("table")
     if (table is None): return None # results don't exist
 
     results_table=table.find("tbody")
-    rows=results_table.find_all("tr")
-
-    # prepare data frame
-    df=pd.DataFrame(columns=["stage_pos","gc_pos","gc_time_diff_after","bib_number","rider_age","team_name","rider_name","rider_nationality_code","uci_points","points","finish_time"])
-
-    # fill data frame
-    for row in rows:
-        series=parse_stage_race_stage_results_row(row)
-        df=df.append(series,ignore_index=True)
-
-    return df
-
-def parse_stage_race_stage_results_row(row) -> pd.Series:
+    table_rows=results_table.find_all("tr")
+
+    # parse rows
+    rows=[parse_stage_race_stage_results_row(row) for row in table_rows]
+
+    return build_data_frame(rows,STAGE_RESULTS_DTYPES,{"gc_time_diff_after":parse_finish_times,"finish_time":parse_finish_times})
+
+# cells of a row of stage results (times are parsed for whole column at once)
+STAGE_RESULTS_ROW_SPEC={
+    "stage_pos":(cell(0),None,to_position,True),
+    "gc_pos":(cell(1),None,to_int_or_nan,True),
+    "gc_time_diff_after":(cell(2),None,None,True),
+    "bib_number":(cell(3),None,int,True),
+    "rider_age":(cell(5),None,int,True),
+    "team_name":(cell(6),None,None,True),
+    "rider_name":(cell(4),None,None,True),
+    "rider_nationality_code":(cell(4,("span",{"class":"flag"},0)),"class",to_last_class,True),
+    "uci_points":(cell(7),None,to_int_or_zero,True),
+    "points":(cell(8),None,to_int_or_zero,True),
+    "finish_time":(cell(9,("span",{"class":"timeff"},0)),None,None,True),
+    "rider_url":(cell(4,("a",{},0)),"href",to_url,False)
+}
+extract_stage_race_stage_results_row=compile_extractor(STAGE_RESULTS_ROW_SPEC)
+
+def parse_stage_race_stage_results_row(row) -> dict:
     """
     SUMMARY
     parse data from row of stage results table
@@ -802,10 +1637,10 @@ def parse_stage_race_stage_results_row(row) -> pd.Series:
     row (bs4.element.Tag): row to extract details from
 
     OUTPUT
-    pandas.Series: fetched data includes
-                        "stage_pos" (int) finish position of rider (`np.NaN` if rider didn't finish stage)
-                        "gc_pos" (int) rider's gc position after stage (`np.NaN` if rider didn't finish stage)
-                        "gc_time_diff_after" (datetime.timedelta) rider's time difference to gc leader after stage
+    dict: fetched data includes
+                        "stage_pos" (int) finish position of rider (`np.nan` if rider didn't finish stage)
+                        "gc_pos" (int) rider's gc position after stage (`np.nan` if rider didn't finish stage)
+                        "gc_time_diff_after" (str) rider's time difference to gc leader after stage, unparsed (see Scraper.parse_finish_times)
                         "bib_number" (int) rider's race number
                         "rider_age" (int) rider's age on day of stage
                         "team_name" (str) name of rider's team
@@ -813,42 +1648,22 @@ def parse_stage_race_stage_results_row(row) -> pd.Series:
                         "rider_nationality_code" (str) PCS code for rider's nationality
                         "uci_points" (int) number of uci points won by rider in stage
                         "points" (int) number of PCS points won by rider in stage
-                        "finish_time" (datetime.timedelta) time taken to complete stage (or time behind stage winner)
+                        "finish_time" (str) time taken to complete stage (or time behind stage winner), unparsed (see Scraper.parse_finish_times)
+                        "rider_url" (str) url of rider's page (`None` if rider has no page)
     """
-    series={}
-    row_data=row.find_all("td")
-
-    # race details
-    stage_pos=row_data[0].text
-    gc_pos=row_data[1].text
-    gc_time_diff_after=row_data[2].text.replace("+","")
-    series["stage_pos"]=int(stage_pos) if (stage_pos not in ["DNF","OTL","DNS","DF"]) else np.NaN
-    series["gc_pos"]=int(gc_pos) if (gc_pos!="") else np.NaN
-    series["gc_time_diff_after"]=parse_finish_time(gc_time_diff_after) if ("-" not in gc_time_diff_after) else np.NaN
-    series["bib_number"]=int(row_data[3].text)
-
-    # rider and team details
-    series["rider_age"]=int(row_data[5].text)
-    series["team_name"]=row_data[6].text
-    series["rider_name"]=row_data[4].text.replace(series["team_name"],"")
-    series["rider_nationality_code"]=row_data[4].find("span",{"class":"flag"})["class"][-1]
-
-    # point results
-    uci_points=row_data[7].text
-    points=row_data[8].text
-    series["uci_points"]=int(uci_points) if (uci_points!="") else 0
-    series["points"]=int(points) if (points!="") else 0
-
-    # results
-    finish_time=row_data[9].find("span",{"class":"timeff"}).text
-    series["finish_time"]=parse_finish_time(finish_time) if (finish_time!="-") else np.NaN
+    series=extract_stage_race_stage_results_row(row)
+    series["rider_name"]=series["rider_name"].replace(series["team_name"],"") # rider's cell also holds their team
 
-    return pd.Series(series)
+    return series
 
 """
 ONE DAY RACING
 """
 
+# column types of tables in this section
+ONE_DAY_RESULTS_DTYPES={"finish_pos":"float64","bib_number":"int64","rider_age":"int64","team_name":"object","rider_name":"object","rider_nationality_code":"object","uci_points":"int64","points":"int64","finish_time":"timedelta64[ns]","rider_url":"object"}
+
+@memoised
 def scrape_one_day_results(url:str) -> pd.DataFrame:
     """
     SUMMARY
@@ -861,7 +1676,7 @@ def scrape_one_day_results(url:str) -> pd.DataFrame:
     OUTPUT
     type: description
     pandas.DataFrame: fetched data includes
-                        "finish_pos" (int) finish position of rider (`np.NaN` if rider didn't finish stage)
+                        "finish_pos" (int) finish position of rider (`np.nan` if rider didn't finish stage)
                         "bib_number" (int) rider's race number
                         "rider_age" (int) rider's age on day of stage
                         "team_name" (str) name of rider's team
@@ -870,31 +1685,63 @@ def scrape_one_day_results(url:str) -> pd.DataFrame:
                         "uci_points" (int) number of uci points won by rider in stage
                         "points" (int) number of PCS points won by rider in stage
                         "finish_time" (datetime.timedelta) time taken to complete stage (or time behind stage winner)
+                        "rider_url" (str) url of rider's page (`None` if rider has no page)
     """
-    # start session
-    session=HTMLSession()
-    response=session.get(url)
-    response.html.render()
-    soup=BeautifulSoup(response.html.html,"lxml")
+    # fetch data
+    soup=fetch_soup(url,"one_day_results")
 
+    return parse_one_day_results(soup)
+
+def parse_one_day_results(soup) -> pd.DataFrame:
+    """
+    SUMMARY
+    get finish results for a one day race, from its results page
+    USED by Scraper.scrape_one_day_results
+
+    PARAMETERS
+    soup (bs4.BeautifulSoup): parsed results page of one day race
+
+    OUTPUT
+    pandas.DataFrame: fetched data includes
+                        "finish_pos" (int) finish position of rider (`np.nan` if rider didn't finish stage)
+                        "bib_number" (int) rider's race number
+                        "rider_age" (int) rider's age on day of stage
+                        "team_name" (str) name of rider's team
+                        "rider_name" (str) name of rider
+                        "rider_nationality_code" (str) PCS code for rider's nationality
+                        "uci_points" (int) number of uci points won by rider in stage
+                        "points" (int) number of PCS points won by rider in stage
+                        "finish_time" (datetime.timedelta) time taken to complete stage (or time behind stage winner)
+                        "rider_url" (str) url of rider's page (`None` if rider has no page)
+    """
     # isolate desired table
     table=soup.find("table")
     if (table is None): return None # results don't exist
 
     results_table=table.find("tbody")
-    rows=results_table.find_all("tr")
-
-    # prepare data frame
-    df=pd.DataFrame(columns=["finish_pos","bib_number","rider_age","team_name","rider_name","rider_nationality_code","uci_points","points","finish_time"])
-
-    # fill data frame
-    for row in rows:
-        series=parse_one_day_results_row(row)
-        df=df.append(series,ignore_index=True)
-
-    return df
-
-def parse_one_day_results_row(row) -> pd.Series:
+    table_rows=results_table.find_all("tr")
+
+    # parse rows
+    rows=[parse_one_day_results_row(row) for row in table_rows]
+
+    return build_data_frame(rows,ONE_DAY_RESULTS_DTYPES,{"finish_time":parse_finish_times})
+
+# cells of a row of one day results (times are parsed for whole column at once)
+ONE_DAY_RESULTS_ROW_SPEC={
+    "finish_pos":(cell(0),None,to_position,True),
+    "bib_number":(cell(1),None,int,True),
+    "team_name":(cell(4),None,None,True),
+    "rider_name":(cell(2),None,None,True),
+    "rider_nationality_code":(cell(2,("span",{"class":"flag"},0)),"class",to_last_class,True),
+    "rider_age":(cell(3),None,int,True),
+    "uci_points":(cell(5),None,to_int_or_zero,True),
+    "points":(cell(6),None,to_int_or_zero,True),
+    "finish_time":(cell(7,("span",{"class":"timeff"},0)),None,None,True),
+    "rider_url":(cell(2,("a",{},0)),"href",to_url,False)
+}
+extract_one_day_results_row=compile_extractor(ONE_DAY_RESULTS_ROW_SPEC)
+
+def parse_one_day_results_row(row) -> dict:
     """
     SUMMARY
     parse data from row of one-day results table
@@ -904,8 +1751,8 @@ def parse_one_day_results_row(row) -> pd.Series:
     row (bs4.element.Tag): row to extract details from
 
     OUTPUT
-    pandas.Series: fetched data includes
-                        "finish_pos" (int) finish position of rider (`np.NaN` if rider didn't finish stage)
+    dict: fetched data includes
+                        "finish_pos" (int) finish position of rider (`np.nan` if rider didn't finish stage)
                         "bib_number" (int) rider's race number
                         "rider_age" (int) rider's age on day of stage
                         "team_name" (str) name of rider's team
@@ -913,38 +1760,89 @@ def parse_one_day_results_row(row) -> pd.Series:
                         "rider_nationality_code" (str) PCS code for rider's nationality
                         "uci_points" (int) number of uci points won by rider in stage
                         "points" (int) number of PCS points won by rider in stage
-                        "finish_time" (datetime.timedelta) time taken to complete stage (or time behind stage winner)
+                        "finish_time" (str) time taken to complete stage (or time behind stage winner), unparsed (see Scraper.parse_finish_times)
+                        "rider_url" (str) url of rider's page (`None` if rider has no page)
     """
-    series={}
-    row_data=row.find_all("td")
+    series=extract_one_day_results_row(row)
+    series["rider_name"]=series["rider_name"].replace(series["team_name"],"") # rider's cell also holds their team
+
+    return series
+
+"""
+RIDER PROFILES
+"""
 
-    # race details
-    finish_pos=row_data[0].text
-    series["finish_pos"]=int(finish_pos) if (finish_pos not in ["DF","DNF","OTL","DNS"]) else np.NaN
-    series["bib_number"]=int(row_data[1].text)
+# column types of tables in this section
+RIDER_TEAMS_DTYPES={"year":"int64","team_name":"object","team_class":"object","team_url":"object"}
+RIDER_YEAR_RESULTS_DTYPES={"date":"object","type":"object","result":"object","gc_pos":"object","race_country_code":"object","race_name":"object","race_class":"object","stage_name":"object","distance":"object","pcs_points":"object","uci_points":"object","url":"object"}
+
+def get_heading_name(heading) -> str:
+    # text of heading, without its spans
+    text=heading.text
+    for span in heading.find_all("span"): text=text.replace(span.text,"")
+    return text.strip().rstrip()
+
+def get_points_per_type(points_list) -> {str:str}:
+    # rider's rating points, by type
+    return {"points_"+item["class"][0]:item.find_all("span")[1].text for item in points_list.find_all("li")}
+
+# details of rider from their overview page
+RIDER_INFORMATION=("div",{"class":"rdr-info-cont"},0)
+RIDER_DETAILS_SPEC={
+    "name":([("h1",{},0)],get_heading_name,None,True),
+    "dob":([RIDER_INFORMATION],re.compile(r"Date of birth: (.*) \(",re.IGNORECASE),None,True),
+    "nationality":([RIDER_INFORMATION],re.compile(r"Nationality: (.*)Weight",re.IGNORECASE),None,True),
+    "birth_place":([RIDER_INFORMATION],re.compile(r"Place of birth: (.*)Points per",re.IGNORECASE),None,True),
+    "weight":([RIDER_INFORMATION],re.compile(r"([0-9]+ kg)",re.IGNORECASE),None,True),
+    "height":([RIDER_INFORMATION],re.compile(r"([0-2].[0-9]{2} m)",re.IGNORECASE),None,True),
+    "points":([RIDER_INFORMATION,("ul",{"class":"pps"},0)],get_points_per_type,None,True)
+}
+extract_rider_details=compile_extractor(RIDER_DETAILS_SPEC)
+
+@memoised
+def scrape_rider_profile(url:str) -> dict:
+    """
+    SUMMARY
+    get details, teams & seasons of a rider from their overview page, fetching the page once
+    E.G. https://www.procyclingstats.com/rider/caleb-ewan/
 
-    # rider and team details
-    series["team_name"]=row_data[4].text
-    series["rider_name"]=row_data[2].text.replace(series["team_name"],"")
-    series["rider_nationality_code"]=row_data[2].find("span",{"class":"flag"})["class"][-1]
-    series["rider_age"]=int(row_data[3].text)
+    PARAMETERS
+    url (str): url for a rider's overview page
 
-    # point results
-    uci_points=row_data[5].text
-    points=row_data[6].text
-    series["uci_points"]=int(uci_points) if (uci_points!="") else 0
-    series["points"]=int(points) if (points!="") else 0
+    OUTPUT
+    dict: fetched data includes
+            "details" (pandas.Series) see Scraper.get_rider_details
+            "teams" (pandas.DataFrame) see Scraper.get_rider_teams
+            "years" (list(int)) see Scraper.get_rider_years
+    """
+    # fetch data
+    soup=fetch_soup(url,"rider")
 
-    # results
-    finish_time=row_data[7].find("span",{"class":"timeff"}).text
-    series["finish_time"]=parse_finish_time(finish_time) if (finish_time!="-") else np.NaN
+    return parse_rider_profile(soup)
 
-    return pd.Series(series)
+def parse_rider_profile(soup) -> dict:
+    """
+    SUMMARY
+    get details, teams & seasons of a rider from their overview page
+    USED by Scraper.scrape_rider_profile & Scraper.async_scrape_rider_profile
 
-"""
-RIDER PROFILES
-"""
+    PARAMETERS
+    soup (bs4.BeautifulSoup): parsed overview page of rider
 
+    OUTPUT
+    dict: fetched data includes
+            "details" (pandas.Series) see Scraper.get_rider_details
+            "teams" (pandas.DataFrame) see Scraper.get_rider_teams
+            "years" (list(int)) see Scraper.get_rider_years
+    """
+    profile={}
+    profile["details"]=parse_rider_details(soup)
+    profile["teams"]=parse_rider_teams(soup)
+    profile["years"]=parse_rider_years(soup)
+
+    return profile
+
+@memoised
 def get_rider_details(url:str) -> pd.Series:
     """
     SUMMARY
@@ -968,43 +1866,40 @@ def get_rider_details(url:str) -> pd.Series:
                     "points_sprint" (int) rider's PCS points from Sprint Races
                     "points_climber" (int) rider's PCS points from Climbing Races
     """
-    series=pd.Series() # series to fill in
-
-    # start session
-    session=HTMLSession()
-    response=session.get(url)
-    response.html.render()
-    soup=BeautifulSoup(response.html.html,"lxml")
+    # fetch data
+    soup=fetch_soup(url,"rider")
 
-    # find riders name
-    name_header=soup.find("h1")
-    name_header_text=name_header.text
+    return parse_rider_details(soup)
 
-    # remove parts which are not in name
-    spans=name_header.find_all("span")
-    for span in spans: name_header_text=name_header_text.replace(span.text,"")
+def parse_rider_details(soup) -> pd.Series:
+    """
+    SUMMARY
+    get personal details from a rider's overview page
+    USED by Scraper.get_rider_details & Scraper.parse_rider_profile
 
-    series["name"]=name_header_text.strip().rstrip()
+    PARAMETERS
+    soup (bs4.BeautifulSoup): parsed overview page of rider
 
-    # isolate desired table
-    info_div=soup.find("div",{"class":"rdr-info-cont"})
-
-    # extract details from body
-    text=info_div.text
-    series["dob"]=re.search("Date of birth: (.*) \(",text,re.IGNORECASE).group(1)
-    series["nationality"]=re.search("Nationality: (.*)Weight",text,re.IGNORECASE).group(1)
-    series["birth_place"]=re.search("Place of birth: (.*)Points per",text,re.IGNORECASE).group(1)
-    series["weight"]=re.search("([0-9]+ kg)",text,re.IGNORECASE).group(1)
-    series["height"]=re.search("([0-2].[0-9]{2} m)",text,re.IGNORECASE).group(1)
-
-    # rating points
-    pps_list_items=info_div.find("ul",{"class":"pps"}).find_all("li")
-    for item in pps_list_items:
-        point_type=item["class"][0]
-        series["points_"+point_type]=item.find_all("span")[1].text
+    OUTPUT
+    pandas.Series: fetched data includes
+                    "name" (str) rider's name
+                    "dob" (str) rider's date of birth (e.g. 1st Jan 2020)
+                    "nationality" (str) country of rider's birth
+                    "birth_place" (str) town of rider's birth
+                    "weight" (int) rider's weight in kilograms
+                    "height" (int) rider's heigh in meters
+                    "points_classic" (int) rider's PCS points for One Day Races
+                    "points_gc" (int) rider's PCS points for General Classification
+                    "points_tt" (int) rider's PCS points for Time Trials
+                    "points_sprint" (int) rider's PCS points from Sprint Races
+                    "points_climber" (int) rider's PCS points from Climbing Races
+    """
+    series=extract_rider_details(soup)
+    series.update(series.pop("points")) # rating points by type
 
-    return series
+    return pd.Series(series)
 
+@memoised
 def get_rider_teams(url:str) -> pd.DataFrame:
     """
     SUMMARY
@@ -1022,18 +1917,34 @@ def get_rider_teams(url:str) -> pd.DataFrame:
                         "team_url" (str) full url for team's overview for given season
     """
 
-    # start session
-    session=HTMLSession()
-    response=session.get(url)
-    response.html.render()
-    soup=BeautifulSoup(response.html.html,"lxml")
+    # fetch data
+    soup=fetch_soup(url,"rider")
+
+    return parse_rider_teams(soup)
 
+TEAM_CLASS_PATTERN=re.compile(r"\((\w+)\)",re.IGNORECASE)
+
+def parse_rider_teams(soup) -> pd.DataFrame:
+    """
+    SUMMARY
+    get details for teams rider has ridden for each year
+    USED by Scraper.get_rider_teams & Scraper.parse_rider_profile
+
+    PARAMETERS
+    soup (bs4.BeautifulSoup): parsed overview page of rider
+
+    OUTPUT
+    pandas.DataFrame: fetched data includes
+                        "year" (int) season team was ridden for
+                        "team_name" (str) official name of team
+                        "team_class" (str) PCS code for team's classification
+                        "team_url" (str) full url for team's overview for given season
+    """
     # isolate team table
     team_list=soup.find("ul",{"class":"rdr-teams"})
     team_list_items=team_list.find_all("li")
 
-    df=pd.DataFrame(columns=["year","team_name","team_class","team_url"])
-
+    rows=[]
     for item in team_list_items:
         series={}
 
@@ -1046,13 +1957,15 @@ def get_rider_teams(url:str) -> pd.DataFrame:
             series["team_url"]="https://www.procyclingstats.com/"+anchor["href"]
             series["team_name"]=anchor.text
 
-            series["team_class"]=re.search("\((\w+)\)",item_details[1].text,re.IGNORECASE).group(1)
+            series["team_class"]=TEAM_CLASS_PATTERN.search(item_details[1].text).group(1)
 
-            df=df.append(pd.Series(series),ignore_index=True)
+            rows.append(series)
 
+    df=build_data_frame(rows,RIDER_TEAMS_DTYPES)
     df=df.set_index("year")
     return df
 
+@memoised
 def get_rider_years(url:str) -> [int]:
     """
     SUMMARY
@@ -1068,12 +1981,23 @@ def get_rider_years(url:str) -> [int]:
     list(int): years in which rider competed
     """
 
-    # start session
-    session=HTMLSession()
-    response=session.get(url)
-    response.html.render()
-    soup=BeautifulSoup(response.html.html,"lxml")
+    # fetch data
+    soup=fetch_soup(url,"rider")
+
+    return parse_rider_years(soup)
+
+def parse_rider_years(soup) -> [int]:
+    """
+    SUMMARY
+    get list of years in which PCS has results for rider, from the rider's overview page
+    USED by Scraper.get_rider_years & Scraper.parse_rider_profile
+
+    PARAMETERS
+    soup (bs4.BeautifulSoup): parsed overview page of rider
 
+    OUTPUT
+    list(int): years in which rider competed
+    """
     # isolate desired table
     table=soup.find("ul",{"class":"rdrSeasonNav"})
     table_items=table.find_all("li")
@@ -1086,6 +2010,7 @@ def get_rider_years(url:str) -> [int]:
 
     return years
 
+@memoised
 def scrape_rider_year_results(url:str) -> pd.DataFrame:
     """
     SUMMARY
@@ -1100,41 +2025,77 @@ def scrape_rider_year_results(url:str) -> pd.DataFrame:
                         "date" (str) dates of race (`D.M` for one day, `D.M > D.M` for stage)
                         "type" (str) type of race in ["Stage","One Day","Points Classification","Mountains Classification","General Classification","Youth Classification"]
                         "result" (int) finish position of rider in race
-                        "gc_pos" (int) rider's gc position after stage (np.NaN for one day or overall classification)
+                        "gc_pos" (int) rider's gc position after stage (np.nan for one day or overall classification)
                         "race_country_code" (str) PCS code for race's host country
                         "race_name" (str) name of race (name of stage race if individual stage)
                         "race_class" (str) code for rider's class
-                        "stage_name" (str) name of stage (np.NaN for one day or overall classification)
+                        "stage_name" (str) name of stage (np.nan for one day or overall classification)
                         "distance" (int) length of stage in seconds
                         "pcs_points" (int) number of PCS points won by rider in race
                         "uci_points" (int) number of UCI points won by rider in race
                         "url" (str) full url to race results page
     """
 
-    # start session
-    session=HTMLSession()
-    response=session.get(url)
-    response.html.render()
-    soup=BeautifulSoup(response.html.html,"lxml")
+    # fetch data
+    soup=fetch_soup(url,"rider_year")
+
+    return parse_rider_year_results(soup)
+
+def parse_rider_year_results(soup) -> pd.DataFrame:
+    """
+    SUMMARY
+    get details for results of rider from their results page for a given year
+    USED by Scraper.scrape_rider_year_results
 
+    PARAMETERS
+    soup (bs4.BeautifulSoup): parsed results page of rider for a year
+
+    OUTPUT
+    pandas.DataFrame: fetched data includes
+                        "date" (str) dates of race (`D.M` for one day, `D.M > D.M` for stage)
+                        "type" (str) type of race in ["Stage","One Day","Points Classification","Mountains Classification","General Classification","Youth Classification"]
+                        "result" (int) finish position of rider in race
+                        "gc_pos" (int) rider's gc position after stage (np.nan for one day or overall classification)
+                        "race_country_code" (str) PCS code for race's host country
+                        "race_name" (str) name of race (name of stage race if individual stage)
+                        "race_class" (str) code for rider's class
+                        "stage_name" (str) name of stage (np.nan for one day or overall classification)
+                        "distance" (int) length of stage in seconds
+                        "pcs_points" (int) number of PCS points won by rider in race
+                        "uci_points" (int) number of UCI points won by rider in race
+                        "url" (str) full url to race results page
+    """
     # isolate desired table
     table=soup.find("table",{"class":"rdrResults"})
     results_table=table.find("tbody")
-    rows=results_table.find_all("tr")
+    table_rows=results_table.find_all("tr")
 
-    # prepare data frame
-    df=pd.DataFrame(columns=["date","type","result","gc_pos","race_country_code","race_name","race_class","stage_name","distance","pcs_points","uci_points","url"])
-
-    # fill data frame
+    # parse rows
+    rows=[]
     current={"race":"","race_class":"","flag":""}
-    for row in rows:
+    for row in table_rows:
         add,series=parse_rider_year_results_row(row,current)
         current={"race":series["race_name"],"race_class":series["race_class"],"flag":series["race_country_code"]}
-        if add: df=df.append(series,ignore_index=True)
-
-    return df
-
-def parse_rider_year_results_row(row,current={"race":"","race_class":"","flag":""}) -> (bool,pd.Series):
+        if add: rows.append(series)
+
+    return build_data_frame(rows,RIDER_YEAR_RESULTS_DTYPES)
+
+# cells of a row of rider's results (flag only exists in rows of races)
+RIDER_YEAR_RESULTS_ROW_SPEC={
+    "date":(cell(0),None,None,True),
+    "result":(cell(1),None,None,True),
+    "gc_pos":(cell(2),None,None,True),
+    "name":(cell(4),None,None,True),
+    "url":(cell(4,("a",{},0)),"href",to_url,True),
+    "flag":(cell(4,("span",{"class":"flag"},0)),"class",to_last_class,False),
+    "distance":(cell(5),None,None,True),
+    "pcs_points":(cell(6),None,None,True),
+    "uci_points":(cell(7),None,None,True)
+}
+extract_rider_year_results_row=compile_extractor(RIDER_YEAR_RESULTS_ROW_SPEC)
+RACE_CLASS_PATTERN=re.compile(r"\((.*)\)",re.IGNORECASE)
+
+def parse_rider_year_results_row(row,current={"race":"","race_class":"","flag":""}) -> (bool,dict):
     """
     SUMMARY
     parse details from row from results table of rider from their results page for a given year
@@ -1146,58 +2107,56 @@ def parse_rider_year_results_row(row,current={"race":"","race_class":"","flag":"
 
     OUTPUT
     bool: whether to add details to dataframe (ie not just details of a stage race)
-    pandas.Series: fetched data includes
+    dict: fetched data includes
                         "date" (str) dates of race (`D.M` for one day, `D.M > D.M` for stage)
                         "type" (str) type of race in ["Stage","One Day","Points Classification","Mountains Classification","General Classification","Youth Classification"]
                         "result" (int) finish position of rider in race
-                        "gc_pos" (int) rider's gc position after stage (np.NaN for one day or overall classification)
+                        "gc_pos" (int) rider's gc position after stage (np.nan for one day or overall classification)
                         "race_country_code" (str) PCS code for race's host country
                         "race_name" (str) name of race (name of stage race if individual stage)
                         "race_class" (str) code for rider's class
-                        "stage_name" (str) name of stage (np.NaN for one day or overall classification)
+                        "stage_name" (str) name of stage (np.nan for one day or overall classification)
                         "distance" (int) length of stage in seconds
                         "pcs_points" (int) number of PCS points won by rider in race
                         "uci_points" (int) number of UCI points won by rider in race
                         "url" (str) full url to race results page
     """
-    series={}
-    row_details=row.find_all("td")
-
-    # extract data
-    date=row_details[0].text
-    result=row_details[1].text
-    gc_pos=row_details[2].text
-    name=row_details[4].text
-    url="https://www.procyclingstats.com/"+row_details[4].find("a")["href"]
-    distance=row_details[5].text
-    pcs_points=row_details[6].text
-    uci_points=row_details[7].text
+    cells=extract_rider_year_results_row(row)
+    date=cells["date"]
+    result=cells["result"]
+    gc_pos=cells["gc_pos"]
+    name=cells["name"]
+    url=cells["url"]
+    distance=cells["distance"]
+    pcs_points=cells["pcs_points"]
+    uci_points=cells["uci_points"]
 
     # prepare series depending on race type
     if (row["data-main"]=="0"): # stage or final classification of a stage race
         if (date==""): # FINAL CLASSIFICATION missing date
-            series={"date":date,"type":name,"result":result,"gc_pos":np.NaN,"race_country_code":current["flag"],"race_name":current["race"],"race_class":current["race_class"],"stage_name":np.NaN,"distance":np.NaN,"pcs_points":pcs_points,"uci_points":uci_points,"url":url}
+            series={"date":date,"type":name,"result":result,"gc_pos":np.nan,"race_country_code":current["flag"],"race_name":current["race"],"race_class":current["race_class"],"stage_name":np.nan,"distance":np.nan,"pcs_points":pcs_points,"uci_points":uci_points,"url":url}
         else: # STAGE
             series={"date":date,"type":"Stage","result":result,"gc_pos":gc_pos,"race_country_code":current["flag"],"race_name":current["race"],"race_class":current["race_class"],"stage_name":name,"distance":distance,"pcs_points":pcs_points,"uci_points":uci_points,"url":url}
 
     elif (row["data-main"]=="1"): # stage race or one day
         # update details for stage results
-        race_class=re.search("\((.*)\)",name,re.IGNORECASE).group(1) # uci rating of race
+        race_class=RACE_CLASS_PATTERN.search(name).group(1) # uci rating of race
         race=name.split(" (")[0]
-        flag=row_details[4].find("span",{"class":"flag"})["class"][-1]
+        flag=cells["flag"]
 
-        if (row_details[1].text==""): # STAGE RACE missing position
+        if (result==""): # STAGE RACE missing position
             series={"race_country_code":flag,"race_name":race,"race_class":race_class}
-            return False, pd.Series(series)
+            return False, series
 
         else: # ONE DAY RACE
-            series={"date":date,"type":"One Day","result":result,"gc_pos":np.NaN,"race_country_code":flag,"race_name":race,"race_class":race_class,"stage_name":np.NaN,"distance":distance,"pcs_points":pcs_points,"uci_points":uci_points,"url":url}
+            series={"date":date,"type":"One Day","result":result,"gc_pos":np.nan,"race_country_code":flag,"race_name":race,"race_class":race_class,"stage_name":np.nan,"distance":distance,"pcs_points":pcs_points,"uci_points":uci_points,"url":url}
 
-    return True, pd.Series(series)
+    return True, series
 
 # get all results for a specific rider in a single data frame
 # e.g. https://www.procyclingstats.com/rider/caleb-ewan/
-def scrape_rider_all_results(url:str) -> pd.DataFrame:
+@memoised
+def scrape_rider_all_results(url:str,profile=None,max_workers=None) -> pd.DataFrame:
     """
     SUMMARY
     get all results for a rider, across their whole career
@@ -1205,40 +2164,318 @@ def scrape_rider_all_results(url:str) -> pd.DataFrame:
 
     PARAMETERS
     url (str): url for a rider's overview page
+    profile (dict): rider's profile, from Scraper.scrape_rider_profile (default=None, years are fetched from `url`)
+    max_workers (int): maximum number of seasons fetched at once (default=None, uses `Scraper.MAX_WORKERS`)
 
     OUTPUT
     pandas.DataFrame: fetched data includes
                         "date" (str) dates of race (`D.M` for one day, `D.M > D.M` for stage)
                         "type" (str) type of race in ["Stage","One Day","Points Classification","Mountains Classification","General Classification","Youth Classification"]
                         "result" (int) finish position of rider in race
-                        "gc_pos" (int) rider's gc position after stage (np.NaN for one day or overall classification)
+                        "gc_pos" (int) rider's gc position after stage (np.nan for one day or overall classification)
                         "race_country_code" (str) PCS code for race's host country
                         "race_name" (str) name of race (name of stage race if individual stage)
                         "race_class" (str) code for rider's class
-                        "stage_name" (str) name of stage (np.NaN for one day or overall classification)
+                        "stage_name" (str) name of stage (np.nan for one day or overall classification)
                         "distance" (int) length of stage in seconds
                         "pcs_points" (int) number of PCS points won by rider in race
                         "uci_points" (int) number of UCI points won by rider in race
                         "url" (str) full url to race results page
                         "year" (int) year of result
     """
+    all_year_results=list(iter_rider_all_results(url,profile,max_workers))
+
+    if (len(all_year_results)==0): return pd.DataFrame()
+    return pd.concat(all_year_results,ignore_index=True)
+
+def iter_rider_all_results(url:str,profile=None,max_workers=None):
+    """
+    SUMMARY
+    lazily get all results for a rider, one season at a time.
+    seasons are fetched concurrently & each is yielded as soon as it is parsed
+    USED by Scraper.scrape_rider_all_results
+    E.G. https://www.procyclingstats.com/rider/caleb-ewan/
+
+    PARAMETERS
+    url (str): url for a rider's overview page
+    profile (dict): rider's profile, from Scraper.scrape_rider_profile (default=None, years are fetched from `url`)
+    max_workers (int): maximum number of seasons fetched at once (default=None, uses `Scraper.MAX_WORKERS`)
+
+    OUTPUT
+    generator(pandas.DataFrame): results of each season, in order of `Scraper.get_rider_years` (see Scraper.scrape_rider_all_results)
+    """
+
+    # ensure formating of url
+    if (url[-1]!="/"): url+="/"
+
+    # get years for which results exist
+    years=profile["years"] if (profile is not None) else get_rider_years(url)
+
+    # fetch data for all years
+    year_urls=[url+str(year) for year in years]
+    for year,year_results in zip(years,iter_concurrent(scrape_rider_year_results,year_urls,max_workers)):
+        year_results["year"]=year # add column stating year of race
+        yield year_results
+
+"""
+ASYNC SCRAPING
+"""
+# async counterparts of the scrape functions above, sharing their parse functions.
+# pages are fetched through the shared Fetcher.AsyncFetcher, so many fetches can be in flight at once
+
+async def async_fetch_soup(url:str,page_type=None) -> BeautifulSoup:
+    """
+    SUMMARY
+    async version of Scraper.fetch_soup, fetching through the shared async fetcher
+
+    PARAMETERS
+    url (str): url of page to fetch
+    page_type (str): key of `PAGE_TYPES` for page (default=None, never render)
+
+    OUTPUT
+    bs4.BeautifulSoup: parsed page
+    """
+    fetcher=get_async_fetcher()
+
+    render=(page_type in RENDER_PAGE_TYPES)
+    soup=parse_page(await fetcher.get_html(url,render=render),page_type)
+
+    # fall back to rendering if page is incomplete
+    if (not render) and (page_type in PAGE_TYPES):
+        name,attrs=PAGE_TYPES[page_type]
+        if (soup.find(name,attrs) is None): soup=parse_page(await fetcher.get_html(url,render=True),page_type)
+
+    return soup
+
+@memoised
+async def async_get_race_editions(url:str) -> pd.DataFrame:
+    """
+    SUMMARY
+    async version of Scraper.get_race_editions
+    """
+    soup=await async_fetch_soup(url,"race_editions")
+    return parse_race_editions(soup)
+
+@memoised
+async def async_get_available_tours_for_year(year=2020) -> {str:int}:
+    """
+    SUMMARY
+    async version of Scraper.get_available_tours_for_year
+    """
+    url="https://www.procyclingstats.com/races.php?year={}".format(year)
+    soup=await async_fetch_soup(url,"tours")
+    return parse_available_tours_for_year(soup)
 
+@memoised
+async def async_scrape_tour_races_for_year(year=2020,tour_code=1) -> pd.DataFrame:
+    """
+    SUMMARY
+    async version of Scraper.scrape_tour_races_for_year
+    """
+    url="https://www.procyclingstats.com/races.php?year={}&circuit={}".format(year,tour_code)
+    soup=await async_fetch_soup(url,"races")
+    return parse_tour_races_for_year(soup)
+
+@memoised
+async def async_scrape_races_for_year(year=2020) -> pd.DataFrame:
+    """
+    SUMMARY
+    async version of Scraper.scrape_races_for_year (tours are fetched concurrently)
+    """
+    tours=await async_get_available_tours_for_year(year)
+
+    tour_dfs=await asyncio.gather(*[async_scrape_tour_races_for_year(year=year,tour_code=value) for value in tours.values()])
+    for (key,value),tour_df in zip(tours.items(),tour_dfs):
+        tour_df["tour"]=key
+        tour_df["tour_code"]=value
+
+    if (len(tour_dfs)==0): return pd.DataFrame()
+    return pd.concat(tour_dfs,ignore_index=True)
+
+@memoised
+async def async_scrape_teams_for_year(year=2020) -> pd.DataFrame:
+    """
+    SUMMARY
+    async version of Scraper.scrape_teams_for_year
+    """
+    url="https://www.procyclingstats.com/teams.php?s=worldtour&year={}".format(year)
+    soup=await async_fetch_soup(url,"teams")
+    return parse_teams_for_year(soup)
+
+@memoised
+async def async_scrape_riders_from_team(url:str) -> pd.DataFrame:
+    """
+    SUMMARY
+    async version of Scraper.scrape_riders_from_team
+    """
+    soup=await async_fetch_soup(url,"team")
+    return parse_riders_from_team(soup)
+
+@memoised
+async def async_scrape_race_startlist(url:str) -> pd.DataFrame:
+    """
+    SUMMARY
+    async version of Scraper.scrape_race_startlist
+    """
+    # ensure url is for startlist
+    if (url[-9:]!="startlist"):
+        if (url[-1]!="/"): url+="/"
+        url+="startlist"
+
+    soup=await async_fetch_soup(url,"startlist")
+    return parse_race_startlist(soup)
+
+@memoised
+async def async_scrape_race_information(url:str) -> pd.Series:
+    """
+    SUMMARY
+    async version of Scraper.scrape_race_information
+    """
+    soup=await async_fetch_soup(url,"race_information")
+    return parse_race_information(soup)
+
+@memoised
+async def async_scrape_stage_race_overview(url:str) -> dict:
+    """
+    SUMMARY
+    async version of Scraper.scrape_stage_race_overview
+    """
+    soup=await async_fetch_soup(url,"stage_race_overview")
+    return parse_stage_race_overview(soup)
+
+@memoised
+async def async_scrape_stage_race_overview_top_competitors(url:str) -> pd.DataFrame:
+    """
+    SUMMARY
+    async version of Scraper.scrape_stage_race_overview_top_competitors
+    """
+    soup=await async_fetch_soup(url,"stage_race_overview")
+    return parse_stage_race_overview_top_competitors(soup)
+
+@memoised
+async def async_scrape_stage_race_overview_competing_teams(url:str) -> pd.DataFrame:
+    """
+    SUMMARY
+    async version of Scraper.scrape_stage_race_overview_competing_teams
+    """
+    soup=await async_fetch_soup(url,"stage_race_overview")
+    return parse_stage_race_overview_competing_teams(soup)
+
+@memoised
+async def async_scrape_stage_race_overview_stages(url:str) -> pd.DataFrame:
+    """
+    SUMMARY
+    async version of Scraper.scrape_stage_race_overview_stages
+    """
+    soup=await async_fetch_soup(url,"stage_race_overview")
+    return parse_stage_race_overview_stages(soup)
+
+@memoised
+async def async_scrape_stage_race_stage_results(url:str) -> pd.DataFrame:
+    """
+    SUMMARY
+    async version of Scraper.scrape_stage_race_stage_results
+    """
+    soup=await async_fetch_soup(url,"stage_results")
+    return parse_stage_race_stage_results(soup)
+
+@memoised
+async def async_scrape_stage_race_all_stage_results(url:str,stages=None,existing=None) -> [pd.DataFrame]:
+    """
+    SUMMARY
+    async version of Scraper.scrape_stage_race_all_stage_results (stages are fetched concurrently)
+    """
+    if (stages is None): stages=(await async_scrape_stage_race_overview(url))["stages"]
+    if (existing is None): existing={}
+
+    stage_urls=get_stage_urls(stages)
+
+    # only fetch stages without stored results
+    missing_urls=[stage_url for stage_url in stage_urls if existing.get(stage_url) is None]
+    fetched=dict(zip(missing_urls,await asyncio.gather(*[async_scrape_stage_race_stage_results(stage_url) for stage_url in missing_urls])))
+
+    results=[]
+    for stage_url in stage_urls:
+        if (stage_url in fetched): results.append(fetched[stage_url])
+        else: results.append(existing[stage_url])
+
+    return results
+
+@memoised
+async def async_scrape_one_day_results(url:str) -> pd.DataFrame:
+    """
+    SUMMARY
+    async version of Scraper.scrape_one_day_results
+    """
+    soup=await async_fetch_soup(url,"one_day_results")
+    return parse_one_day_results(soup)
+
+@memoised
+async def async_scrape_rider_profile(url:str) -> dict:
+    """
+    SUMMARY
+    async version of Scraper.scrape_rider_profile
+    """
+    soup=await async_fetch_soup(url,"rider")
+    return parse_rider_profile(soup)
+
+@memoised
+async def async_get_rider_details(url:str) -> pd.Series:
+    """
+    SUMMARY
+    async version of Scraper.get_rider_details
+    """
+    soup=await async_fetch_soup(url,"rider")
+    return parse_rider_details(soup)
+
+@memoised
+async def async_get_rider_teams(url:str) -> pd.DataFrame:
+    """
+    SUMMARY
+    async version of Scraper.get_rider_teams
+    """
+    soup=await async_fetch_soup(url,"rider")
+    return parse_rider_teams(soup)
+
+@memoised
+async def async_get_rider_years(url:str) -> [int]:
+    """
+    SUMMARY
+    async version of Scraper.get_rider_years
+    """
+    soup=await async_fetch_soup(url,"rider")
+    return parse_rider_years(soup)
+
+@memoised
+async def async_scrape_rider_year_results(url:str) -> pd.DataFrame:
+    """
+    SUMMARY
+    async version of Scraper.scrape_rider_year_results
+    """
+    soup=await async_fetch_soup(url,"rider_year")
+    return parse_rider_year_results(soup)
+
+@memoised
+async def async_scrape_rider_all_results(url:str,profile=None) -> pd.DataFrame:
+    """
+    SUMMARY
+    async version of Scraper.scrape_rider_all_results (seasons are fetched concurrently)
+    """
     # ensure formating of url
     if (url[-1]!="/"): url+="/"
 
     # get years for which results exist
-    years=get_rider_years(url)
+    if (profile is None): profile=await async_scrape_rider_profile(url)
+    years=profile["years"]
 
     # fetch data for all years
-    all_results=pd.DataFrame()
-    for year in years:
-        print("{}/{}".format(year,years[-1]),end="\r")
-        new_url=url+str(year)
-        year_results=scrape_rider_year_results(new_url)
+    all_year_results=await asyncio.gather(*[async_scrape_rider_year_results(url+str(year)) for year in years])
+
+    for year,year_results in zip(years,all_year_results):
         year_results["year"]=year # add column stating year of race
-        all_results=pd.concat([all_results,year_results],ignore_index=True) # add to table of all results
 
-    return all_results
+    if (len(all_year_results)==0): return pd.DataFrame()
+    return pd.concat(all_year_results,ignore_index=True)
 
 """
 TODO
@@ -0,0 +1,265 @@
+import pandas as pd
+import argparse
+import sqlite3
+import glob
+import os
+import re
+
+import Scraper
+import Crawler
+from Export import SCHEMAS, apply_schema
+
+"""
+TABLES
+"""
+# sqlite type each schema type is stored as (durations as whole seconds, booleans as 0/1)
+SQLITE_TYPES={"int":"INTEGER","float":"REAL","category":"TEXT","str":"TEXT","bool":"INTEGER","duration":"INTEGER"}
+
+# schema, natural key & indexes of each table.
+# rows are upserted on their natural key, so loading the same data again updates rows rather than duplicating them
+TABLES={
+    "races":{
+        "schema":{**SCHEMAS["races"],"year":"int"},
+        "key":["race_url"],
+        "indexes":[["year"],["race_key"],["end_date"]]
+    },
+    "stages":{
+        "schema":{**SCHEMAS["stages"],"stage_order":"int"},
+        "key":["race_url","stage_order"], # rest days have no url
+        "indexes":[["date"]]
+    },
+    "results":{
+        "schema":{**SCHEMAS["results"],"date":"str"}, # day of stage or race (YYYY-MM-DD)
+        "key":["race_url","stage_url","bib_number"],
+        "indexes":[["stage_url"],["rider_url"],["rider_name"],["date"]]
+    },
+    "teams":{
+        "schema":{**SCHEMAS["teams"],"year":"int"},
+        "key":["team_url"],
+        "indexes":[["year"]]
+    },
+    "riders":{
+        "schema":{"rider_url":"str",**SCHEMAS["rider_details"]},
+        "key":["rider_url"],
+        "indexes":[["name"]]
+    },
+    "memberships":{
+        "schema":SCHEMAS["memberships"],
+        "key":["team_url","rider_url"],
+        "indexes":[["rider_url"],["year"]]
+    },
+    "rider_results":{
+        "schema":SCHEMAS["rider_year_results"],
+        "key":["rider_url","url"],
+        "indexes":[["url"],["year"],["date"]]
+    }
+}
+
+"""
+RESULT STORE
+"""
+
+class ResultStore:
+    """
+    SUMMARY
+    embedded sqlite database of scraped races, stages, results, teams & riders (see `TABLES`), for querying without scraping again.
+    tables are written with batched upserts keyed on each table's natural key (e.g. race, stage & rider of a result),
+    so a season can be reloaded in one transaction without duplicating rows
+
+    PARAMETERS
+    path (str): path of sqlite database (default="pcs.sqlite")
+    batch_size (int): number of rows sent to sqlite per statement (default=10000)
+    """
+
+    def __init__(self,path="pcs.sqlite",batch_size=10000):
+        self.path=path
+        self.batch_size=batch_size
+
+        if (os.path.dirname(path)!=""): os.makedirs(os.path.dirname(path),exist_ok=True)
+
+        self.connection=sqlite3.connect(path)
+        with self.connection:
+            for table,definition in TABLES.items():
+                columns=["{} {}{}".format(column,SQLITE_TYPES[column_type]," NOT NULL" if (column in definition["key"]) else "") for column,column_type in definition["schema"].items()]
+                self.connection.execute("CREATE TABLE IF NOT EXISTS {} ({}, PRIMARY KEY ({}))".format(table,", ".join(columns),",".join(definition["key"])))
+                for index in definition["indexes"]:
+                    self.connection.execute("CREATE INDEX IF NOT EXISTS {}_{} ON {} ({})".format(table,"_".join(index),table,",".join(index)))
+
+    def _upsert(self,table:str,df:pd.DataFrame) -> int:
+        # upsert rows without committing (callers commit, so several tables can be written in one transaction)
+        definition=TABLES[table]
+        schema=definition["schema"]
+        if (df is None) or (len(df)==0): return 0
+
+        # typed columns, as python values (`None` where missing)
+        df=apply_schema(df,schema)
+        columns=[df[column].to_numpy(dtype=object,na_value=None) for column in schema]
+        rows=list(zip(*columns))
+
+        updates=", ".join("{0}=excluded.{0}".format(column) for column in schema if (column not in definition["key"]))
+        query="INSERT INTO {} ({}) VALUES ({}) ON CONFLICT ({}) DO UPDATE SET {}".format(table,",".join(schema),",".join("?"*len(schema)),",".join(definition["key"]),updates)
+        for start in range(0,len(rows),self.batch_size): self.connection.executemany(query,rows[start:start+self.batch_size])
+
+        return len(rows)
+
+    def upsert(self,table:str,df:pd.DataFrame,**values) -> int:
+        """
+        SUMMARY
+        insert scraped rows into a table, updating rows with the same natural key, in one transaction
+        E.G. store.upsert("results",Scraper.scrape_stage_race_stage_results(stage_url),race_url=race_url,stage_url=stage_url)
+
+        PARAMETERS
+        table (str): table to write to (see `TABLES`)
+        df (pandas.DataFrame): scraped rows (columns outside table's schema are ignored)
+        values: values of columns missing from `df`, for every row (e.g. year=2020)
+
+        OUTPUT
+        int: number of rows written
+        """
+        if (df is not None) and (len(values)>0): df=df.assign(**values)
+
+        with self.connection: return self._upsert(table,df)
+
+    def query(self,sql:str,parameters=()) -> pd.DataFrame:
+        """
+        SUMMARY
+        run a query on stored tables
+        E.G. store.query("SELECT * FROM rider_results WHERE rider_url=? ORDER BY year",[rider_url])
+
+        PARAMETERS
+        sql (str): sqlite query
+        parameters (list): values of query's placeholders (default=())
+
+        OUTPUT
+        pandas.DataFrame: rows returned
+        """
+        return pd.read_sql_query(sql,self.connection,params=parameters)
+
+    def counts(self) -> {str:int}:
+        # number of rows in each table
+        return {table:self.connection.execute("SELECT COUNT(*) FROM {}".format(table)).fetchone()[0] for table in TABLES}
+
+    def close(self):
+        self.connection.close()
+
+"""
+DATASET LOADING
+"""
+
+def get_stage_dates(stages:pd.DataFrame,year:int) -> {str:str}:
+    # day of each stage (YYYY-MM-DD), from its day & month (e.g. "29/08")
+    dates={}
+    for stage_url,stage_date in zip(stages["stage_url"],stages["date"]):
+        match=re.fullmatch(r"([0-9]{1,2})/([0-9]{1,2})",str(stage_date).strip())
+        if (isinstance(stage_url,str)) and (match is not None): dates[stage_url]="{}-{:02d}-{:02d}".format(year,int(match.group(2)),int(match.group(1)))
+
+    return dates
+
+def load_season(store:ResultStore,year=2020,output_dir="pcs_data") -> {str:int}:
+    """
+    SUMMARY
+    load season dataset crawled by Crawler.crawl_season into store's "races", "stages" & "results" tables, in one transaction.
+    results are dated by their stage (one day races by their race's end date)
+    E.G. load_season(ResultStore("pcs.sqlite"),2020,"pcs_data")
+
+    PARAMETERS
+    store (Storage.ResultStore): store to load into
+    year (int): season to load (default=2020)
+    output_dir (str): directory season was crawled to (default="pcs_data")
+
+    OUTPUT
+    dict: number of rows written to each table
+    """
+    season_dir=os.path.join(output_dir,str(year))
+    written={"races":0,"stages":0,"results":0}
+
+    with store.connection:
+        races=Crawler.read_csv(os.path.join(season_dir,"races.csv"),Scraper.RACES_DTYPES)
+        written["races"]+=store._upsert("races",races.assign(year=year))
+
+        for race in races.to_dict("records"):
+            stage_dates={}
+            stages_path=os.path.join(season_dir,"stages",race["race_key"]+".csv")
+            if (os.path.exists(stages_path)):
+                stages=Crawler.read_csv(stages_path,Scraper.STAGES_DTYPES)
+                written["stages"]+=store._upsert("stages",stages.assign(stage_order=range(1,len(stages)+1)))
+                stage_dates=get_stage_dates(stages,year)
+
+            results_path=Crawler.get_results_path(season_dir,race["race_key"])
+            if (os.path.exists(results_path)):
+                results=Crawler.read_csv(results_path,Scraper.STAGE_RESULTS_DTYPES if (race["stage_race"]) else Scraper.ONE_DAY_RESULTS_DTYPES)
+                if (race["stage_race"]): results["date"]=results["stage_url"].map(stage_dates)
+                else: results["date"]=race["end_date"]
+                written["results"]+=store._upsert("results",results)
+
+    return written
+
+def load_riders(store:ResultStore,output_dir="pcs_data") -> {str:int}:
+    """
+    SUMMARY
+    load rider dataset crawled by Crawler.crawl_riders into store's "teams", "riders", "memberships" & "rider_results" tables, in one transaction
+    E.G. load_riders(ResultStore("pcs.sqlite"),"pcs_data")
+
+    PARAMETERS
+    store (Storage.ResultStore): store to load into
+    output_dir (str): directory riders were crawled to (default="pcs_data")
+
+    OUTPUT
+    dict: number of rows written to each table
+    """
+    written={"teams":0,"riders":0,"memberships":0,"rider_results":0}
+
+    with store.connection:
+        for teams_path in sorted(glob.glob(os.path.join(output_dir,"teams","*.csv"))):
+            written["teams"]+=store._upsert("teams",Crawler.read_csv(teams_path,Scraper.TEAMS_DTYPES))
+
+        for table,file_name in [("riders","riders.csv"),("memberships","memberships.csv")]:
+            path=os.path.join(output_dir,file_name)
+            if (os.path.exists(path)) and (os.path.getsize(path)>1): written[table]+=store._upsert(table,pd.read_csv(path,dtype=str))
+
+        for results_path in sorted(glob.glob(os.path.join(output_dir,"riders","*.csv"))):
+            results=Crawler.read_csv(results_path,Scraper.RIDER_YEAR_RESULTS_DTYPES)
+            written["rider_results"]+=store._upsert("rider_results",results)
+
+    return written
+
+"""
+COMMAND LINE
+"""
+
+def main(args=None):
+    """
+    SUMMARY
+    command line interface to result store
+    E.G. python Storage.py load-season pcs.sqlite 2020 pcs_data
+    E.G. python Storage.py load-riders pcs.sqlite pcs_data
+    E.G. python Storage.py counts pcs.sqlite
+
+    PARAMETERS
+    args (list(str)): command line arguments (default=None, uses sys.argv)
+    """
+    parser=argparse.ArgumentParser(description="Load crawled PCS datasets into an sqlite database")
+    commands=parser.add_subparsers(dest="command",required=True)
+
+    season_parser=commands.add_parser("load-season",help="load a season crawled by Crawler.crawl_season")
+    season_parser.add_argument("database")
+    season_parser.add_argument("year",type=int)
+    season_parser.add_argument("output_dir")
+
+    riders_parser=commands.add_parser("load-riders",help="load riders crawled by Crawler.crawl_riders")
+    riders_parser.add_argument("database")
+    riders_parser.add_argument("output_dir")
+
+    counts_parser=commands.add_parser("counts",help="number of rows in each table")
+    counts_parser.add_argument("database")
+
+    args=parser.parse_args(args)
+
+    store=ResultStore(args.database)
+    if (args.command=="load-season"): print(load_season(store,args.year,args.output_dir))
+    elif (args.command=="load-riders"): print(load_riders(store,args.output_dir))
+    else: print(store.counts())
+    store.close()
+
+if __name__=="__main__":
+    main()
@@ -0,0 +1,151 @@
+import unittest
+import tempfile
+import shutil
+import sys
+import os
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Fetcher
+import Crawler
+
+FIXTURE_DIR=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),"fixtures")
+RACE_URL="https://www.procyclingstats.com/race/tour-de-france/2020"
+STAGES=21 # stages of race in fixtures/overview.html
+
+# stage page before the stage is raced (no results table)
+UNRACED_STAGE="<html><body><div class=\"res-right\">Date: 31st August 2020</div></body></html>"
+
+class PageFetcher(Fetcher.Fetcher):
+    # fetcher serving pages from a dict, recording the urls fetched
+    def __init__(self,pages:{str:str}):
+        super().__init__()
+        self.pages=pages
+        self.fetched=[]
+
+    def get_html(self,url:str,render=False) -> str:
+        self.fetched.append(url)
+        return self.pages[url]
+
+def read_fixture(name:str) -> str:
+    with open(os.path.join(FIXTURE_DIR,name+".html"),encoding="utf-8") as f: return f.read()
+
+class TestIncrementalRaceCrawl(unittest.TestCase):
+
+    def setUp(self):
+        self.output_dir=tempfile.mkdtemp()
+        self.frontier=Crawler.Frontier(os.path.join(self.output_dir,"frontier.sqlite"))
+        self.race={"race_url":RACE_URL,"race_key":"tour-de-france","stage_race":True,"end_date":"2999-09-20"}
+
+        # race is live: only first stage has been raced
+        self.pages={RACE_URL+"/overview":read_fixture("overview"),RACE_URL+"/stage-1":read_fixture("stage")}
+        for stage in range(2,STAGES+1): self.pages[RACE_URL+"/stage-{}".format(stage)]=UNRACED_STAGE
+        self.previous=Fetcher.set_fetcher(PageFetcher(self.pages))
+
+    def tearDown(self):
+        Fetcher.set_fetcher(self.previous)
+        self.frontier.close()
+        shutil.rmtree(self.output_dir)
+
+    def crawl(self):
+        fetcher=PageFetcher(self.pages)
+        Fetcher.set_fetcher(fetcher)
+        return Crawler.crawl_race(self.race,self.output_dir,self.frontier),fetcher.fetched
+
+    def test_partial_race_is_stored_then_completed(self):
+        results_path,fetched=self.crawl()
+
+        # raced stage is stored, & race is left to be crawled again
+        self.assertIsNotNone(results_path)
+        results=Crawler.read_csv(results_path)
+        self.assertEqual(results["stage_url"].unique().tolist(),[RACE_URL+"/stage-1"])
+        self.assertFalse(Crawler.is_final(self.frontier,RACE_URL))
+
+        # remaining stages are raced
+        for stage in range(2,STAGES+1): self.pages[RACE_URL+"/stage-{}".format(stage)]=read_fixture("stage")
+        results_path,fetched=self.crawl()
+
+        # stored stage isn't fetched again
+        self.assertNotIn(RACE_URL+"/stage-1",fetched)
+        self.assertIn(RACE_URL+"/stage-2",fetched)
+
+        results=Crawler.read_csv(results_path)
+        self.assertEqual(results["stage_url"].unique().tolist(),[RACE_URL+"/stage-{}".format(stage) for stage in range(1,STAGES+1)])
+        self.assertEqual(len(results),STAGES*176)
+
+    def test_race_without_results_is_not_failed(self):
+        self.pages[RACE_URL+"/stage-1"]=UNRACED_STAGE
+        results_path,fetched=self.crawl()
+
+        self.assertIsNone(results_path)
+        self.assertFalse(os.path.exists(Crawler.get_results_path(self.output_dir,"tour-de-france")))
+
+    def test_one_day_race_without_results_is_not_failed(self):
+        race_url="https://www.procyclingstats.com/race/gp-samyn/2020"
+        self.race={"race_url":race_url,"race_key":"gp-samyn","stage_race":False,"end_date":"2999-03-03"}
+        self.pages[race_url+"/result"]=UNRACED_STAGE
+        results_path,fetched=self.crawl()
+        self.assertIsNone(results_path)
+
+        self.pages[race_url+"/result"]=read_fixture("one_day")
+        results_path,fetched=self.crawl()
+        self.assertEqual(len(Crawler.read_csv(results_path)),175)
+
+class TestRiderCrawl(unittest.TestCase):
+
+    def setUp(self):
+        self.output_dir=tempfile.mkdtemp()
+        self.frontier=Crawler.Frontier(os.path.join(self.output_dir,"frontier.sqlite"))
+
+        # a past season's team, with one rider who has no results (profile lists no seasons)
+        site="https://www.procyclingstats.com/"
+        self.rider_url=site+"rider/new-rider"
+        self.pages={
+            site+"teams.php?s=worldtour&year=2020":'<div class="statDivLeft"><h3>UCI WorldTeams</h3><div class="teamsOverview"><ul><li><span class="flag fr"></span> <a href="team/new-team-2020">New Team</a></li></ul></div><h3>UCI ProTeams</h3><div class="teamsOverview"><ul></ul></div></div>',
+            site+"team/new-team-2020":'<h1>New Team (WT)</h1><ul class="list riderlist"><li data-nation="fr" data-pnts="0" data-age="19" data-name="rider"><span class="flag fr"></span> <a href="rider/new-rider">RIDER New</a></li></ul>',
+            self.rider_url:'<div class="page-title"><h1>New  Rider</h1></div><div class="rdr-info-cont">Date of birth: 1st May 2003 (19)<br/>Nationality: <span class="flag fr"></span> FranceWeight: 60 kg Height: 1.75 m<br/>Place of birth: ParisPoints per specialty<ul class="pps"><li class="classic"><span class="title">One day races</span><span>0</span></li><li class="gc"><span class="title">GC</span><span>0</span></li><li class="tt"><span class="title">Time trial</span><span>0</span></li><li class="sprint"><span class="title">Sprint</span><span>0</span></li><li class="climber"><span class="title">Climber</span><span>0</span></li></ul></div><ul class="list rdr-teams"></ul><ul class="rdrSeasonNav"></ul>'
+        }
+        self.previous=Fetcher.set_fetcher(PageFetcher(self.pages))
+
+    def tearDown(self):
+        Fetcher.set_fetcher(self.previous)
+        self.frontier.close()
+        shutil.rmtree(self.output_dir)
+
+    def crawl(self):
+        Fetcher.set_fetcher(PageFetcher(self.pages))
+        return Crawler.crawl_riders([2020],self.output_dir,frontier=self.frontier,update=True)
+
+    def test_rider_without_results_is_refreshed(self):
+        self.assertEqual(self.crawl(),{"done":1})
+
+        # empty results are written with every column, & rider is crawled again without failing
+        results_path=os.path.join(self.output_dir,"riders","new-rider.csv")
+        self.assertIn("year",Crawler.read_csv(results_path).columns)
+        self.assertEqual(self.crawl(),{"done":1})
+        self.assertEqual(len(Crawler.read_csv(results_path)),0)
+
+class TestRunFrontier(unittest.TestCase):
+
+    def setUp(self):
+        self.output_dir=tempfile.mkdtemp()
+        self.frontier=Crawler.Frontier(os.path.join(self.output_dir,"frontier.sqlite"),backoff=0.01)
+
+    def tearDown(self):
+        self.frontier.close()
+        shutil.rmtree(self.output_dir)
+
+    def test_only_given_urls_are_crawled(self):
+        # race of another season (or since cancelled) is left pending in a shared frontier, & a failed one waits for its retry
+        self.frontier.add([RACE_URL,RACE_URL.replace("2020","2019"),RACE_URL.replace("2020","2018")],kind="race")
+        self.frontier.mark_failed(RACE_URL.replace("2020","2018"),"error")
+
+        records={RACE_URL:"output"}
+        counts=Crawler.run_frontier(self.frontier,lambda url:records[url],kind="race",wait=True,only=records.keys())
+
+        self.assertEqual(counts,{"done":1,"pending":1,"failed":1})
+        self.assertTrue(self.frontier.is_done(RACE_URL))
+        self.assertEqual(self.frontier.get(RACE_URL.replace("2020","2018"))["attempts"],1)
+
+if __name__=="__main__":
+    unittest.main()
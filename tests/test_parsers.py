@@ -0,0 +1,61 @@
+import unittest
+import datetime
+import sys
+import os
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Benchmark
+import Scraper
+
+R="https://www.procyclingstats.com/"
+
+class TestExpectedOutput(unittest.TestCase):
+
+    def test_outputs_match_expected(self):
+        # every benchmarked function, against output recorded in fixtures/expected.json
+        mismatches=Benchmark.check_outputs()
+        self.assertEqual(mismatches,[],"\n".join(mismatches))
+
+class TestParsers(unittest.TestCase):
+
+    def setUp(self):
+        self.fixtures=Benchmark.serving_fixtures()
+        self.fixtures.__enter__()
+
+    def tearDown(self):
+        self.fixtures.__exit__(None,None,None)
+
+    def test_stage_results(self):
+        results=Scraper.scrape_stage_race_stage_results(R+"race/tour-de-france/2020/stage-5")
+
+        # 170 finishers & 6 riders who didn't finish, from the first table only (later tables are other classifications)
+        self.assertEqual(len(results),176)
+        self.assertEqual(results["stage_pos"].notna().sum(),170)
+        self.assertEqual(results["finish_time"].iloc[0],datetime.timedelta(hours=4,minutes=32,seconds=28))
+        self.assertTrue(results["finish_time"].iloc[170:].isna().all())
+        self.assertFalse(results["rider_name"].str.contains("Pro Cycling|Team|Soudal").any()) # team is removed from rider's cell
+
+    def test_one_day_results(self):
+        results=Scraper.scrape_one_day_results(R+"race/gp-samyn/2020/result")
+
+        self.assertEqual(len(results),175)
+        self.assertEqual(results["finish_pos"].notna().sum(),150)
+        self.assertEqual(results["finish_time"].iloc[0],datetime.timedelta(hours=4,minutes=17,seconds=30))
+        self.assertEqual(results["uci_points"].iloc[0],125)
+
+    def test_stage_race_overview(self):
+        overview=Scraper.scrape_stage_race_overview(R+"race/tour-de-france/2020/overview")
+
+        self.assertEqual(overview["stages"]["stage_url"].notna().sum(),21) # & 2 rest days
+        self.assertEqual(len(overview["competing_teams"]),22)
+        self.assertEqual(overview["information"]["date"],"29th August 2020")
+
+    def test_startlist(self):
+        startlist=Scraper.scrape_race_startlist(R+"race/tour-de-france/2020/startlist")
+
+        self.assertEqual(len(startlist),22*8)
+        self.assertEqual(startlist.groupby("team_name").size().unique().tolist(),[8])
+
+if __name__=="__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import pandas as pd
+import unittest
+import tempfile
+import shutil
+import sys
+import os
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Benchmark
+import Crawler
+import Scraper
+import Storage
+
+R="https://www.procyclingstats.com/"
+
+class TestLoading(unittest.TestCase):
+
+    def setUp(self):
+        self.output_dir=tempfile.mkdtemp()
+        self.store=Storage.ResultStore(os.path.join(self.output_dir,"pcs.sqlite"))
+
+        # season of a stage race (first stage only) & a one day race, & teams of season, as written by Crawler
+        season_dir=os.path.join(self.output_dir,"2020")
+        with Benchmark.serving_fixtures():
+            stages=Scraper.scrape_stage_race_overview_stages(R+"race/tour-de-france/2020/overview").assign(race_url=R+"race/tour-de-france/2020")
+            stage_url=stages["stage_url"].dropna().iloc[0]
+            stage_results=Scraper.scrape_stage_race_stage_results(stage_url).assign(race_url=R+"race/tour-de-france/2020",stage_url=stage_url)
+            one_day_results=Scraper.scrape_one_day_results(R+"race/gp-samyn/2020/result").assign(race_url=R+"race/gp-samyn/2020",stage_url=R+"race/gp-samyn/2020/result")
+            teams=Scraper.scrape_teams_for_year(2020)
+
+        races=pd.DataFrame([
+            {"race_dates":"08.29 - 09.20","race_name":"Tour de France","stage_race":True,"race_url":R+"race/tour-de-france/2020","race_key":"tour-de-france","end_date":"2020-09-20"},
+            {"race_dates":"03.03","race_name":"Le Samyn","stage_race":False,"race_url":R+"race/gp-samyn/2020","race_key":"gp-samyn","end_date":"2020-03-03"}
+        ])
+        Crawler.write_csv(races,os.path.join(season_dir,"races.csv"))
+        Crawler.write_csv(stages,os.path.join(season_dir,"stages","tour-de-france.csv"))
+        Crawler.write_csv(stage_results,Crawler.get_results_path(season_dir,"tour-de-france"))
+        Crawler.write_csv(one_day_results,Crawler.get_results_path(season_dir,"gp-samyn"))
+        Crawler.write_csv(teams.assign(year=2020),os.path.join(self.output_dir,"teams","2020.csv"))
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.output_dir)
+
+    def test_results_are_dated_with_rider_urls(self):
+        written=Storage.load_season(self.store,2020,self.output_dir)
+        self.assertEqual(written["results"],176+175)
+
+        dates=self.store.query("SELECT race_url,date,COUNT(*) AS results FROM results GROUP BY race_url,date ORDER BY date")
+        self.assertEqual(dates["date"].tolist(),["2020-03-03","2020-08-29"])
+        self.assertEqual(self.store.query("SELECT COUNT(*) AS missing FROM results WHERE rider_url IS NULL")["missing"].iloc[0],0)
+
+        # a rider's results are found through the rider index
+        plan=self.store.query("EXPLAIN QUERY PLAN SELECT * FROM results WHERE rider_url=? AND date>=?",["x","2020-01-01"])
+        self.assertIn("results_rider_url",plan["detail"].iloc[0])
+
+    def test_teams_are_loaded(self):
+        written=Storage.load_riders(self.store,self.output_dir)
+        self.assertEqual(written["teams"],38)
+        self.assertEqual(self.store.counts()["teams"],38)
+
+        # loading again updates teams rather than duplicating them
+        Storage.load_riders(self.store,self.output_dir)
+        self.assertEqual(self.store.query("SELECT DISTINCT year FROM teams")["year"].tolist(),[2020])
+        self.assertEqual(self.store.counts()["teams"],38)
+
+if __name__=="__main__":
+    unittest.main()